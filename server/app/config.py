@@ -4,6 +4,38 @@ import os
 class AppConfig:
     SECRET_KEY = os.environ.get("FLASK_SECRET_KEY", "change-me")
     DEBUG = os.environ.get("FLASK_DEBUG", "false").lower() == "true"
+    # Assets executados via PREPARE/EXECUTE quando SQL_PREPARED_STATEMENTS=true
+    SQL_PREPARED_STATEMENTS = os.environ.get("SQL_PREPARED_STATEMENTS", "false").lower() == "true"
+    SQL_PREPARED_ASSETS = tuple(
+        asset.strip()
+        for asset in os.environ.get(
+            "SQL_PREPARED_ASSETS",
+            "queries/auth/login_user.sql,"
+            "queries/auth/get_user_roles.sql,"
+            "queries/auth/get_user_role_bits.sql,"
+            "queries/internal/atividades_disponiveis.sql,"
+            "queries/internal/atividades_inscritas.sql,"
+            "queries/internal/instalacoes_disponiveis.sql,"
+            "queries/internal/equipamentos_disponiveis.sql",
+        ).split(",")
+        if asset.strip()
+    )
+    REPORT_CACHE_TTL = float(os.environ.get("REPORT_CACHE_TTL", "300"))
+    # Seções do /reports/overview calculadas em paralelo (1 = serial na conexão da requisição);
+    # só usa conexões extras que estiverem livres no pool, sem esperar por elas
+    REPORT_CONCURRENCY = int(os.environ.get("REPORT_CONCURRENCY", "4"))
+    # Catálogo de /internal/activities em memória, invalidado por LISTEN/NOTIFY
+    ACTIVITY_CATALOG_CACHE = os.environ.get("ACTIVITY_CATALOG_CACHE", "true").lower() == "true"
+    ACTIVITY_CATALOG_TTL = float(os.environ.get("ACTIVITY_CATALOG_TTL", "600"))
+    ACTIVITY_CATALOG_MAX_ENTRIES = int(os.environ.get("ACTIVITY_CATALOG_MAX_ENTRIES", "256"))
+    # Auditoria de login gravada em lote por uma thread (contadores de bloqueio seguem síncronos)
+    LOGIN_AUDIT_ASYNC = os.environ.get("LOGIN_AUDIT_ASYNC", "false").lower() == "true"
+    LOGIN_AUDIT_QUEUE_SIZE = int(os.environ.get("LOGIN_AUDIT_QUEUE_SIZE", "10000"))
+    LOGIN_AUDIT_BATCH_SIZE = int(os.environ.get("LOGIN_AUDIT_BATCH_SIZE", "500"))
+    LOGIN_AUDIT_FLUSH_INTERVAL = float(os.environ.get("LOGIN_AUDIT_FLUSH_INTERVAL", "1.0"))
+    # Segundos que os papéis atuais de um CPF ficam em cache ao revalidar a sessão (0 = sempre consulta)
+    ROLE_CACHE_TTL = float(os.environ.get("ROLE_CACHE_TTL", "30"))
+    SQL_HOT_RELOAD = os.environ.get("SQL_HOT_RELOAD", os.environ.get("FLASK_DEBUG", "false")).lower() == "true"
     FLASK_RUN_PORT = int(os.environ.get("FLASK_RUN_PORT", "5050"))
     FLASK_RUN_HOST = os.environ.get("FLASK_RUN_HOST", "0.0.0.0")
 
@@ -13,3 +45,10 @@ class AppConfig:
     DB_USER = os.environ.get("DB_USER", "postgres")
     DB_PASSWORD = os.environ.get("DB_PASSWORD", "password")
     DB_SCHEMA = os.environ.get("DB_SCHEMA")
+    DB_SCHEMA_BOOTSTRAPPED = os.environ.get("DB_SCHEMA_BOOTSTRAPPED", "false").lower() == "true"
+
+    DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "1"))
+    DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get("DB_POOL_HEALTH_CHECK_INTERVAL", "30"))
+    DB_POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600"))
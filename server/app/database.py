@@ -1,9 +1,285 @@
+import io
 import os
-from typing import Any, Mapping
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, Mapping, Sequence
 
 import psycopg2
+from psycopg2 import extensions as pg_extensions
 from psycopg2 import sql
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+
+# Linhas por buffer enviado num COPY e por página do execute_values
+COPY_BATCH_ROWS = 50_000
+VALUES_PAGE_SIZE = 1_000
+
+
+def _connection_params(
+    host: str | None = None,
+    port: int | str | None = None,
+    database: str | None = None,
+    user: str | None = None,
+    password: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "host": host or os.environ.get("DB_HOST", "localhost"),
+        "port": int(port or os.environ.get("DB_PORT", "5432")),
+        "database": database or os.environ.get("DB_NAME", "public"),
+        "user": user or os.environ.get("DB_USER", "postgres"),
+        "password": password or os.environ.get("DB_PASSWORD", "password"),
+    }
+
+
+def _csv_field(value: Any) -> str:
+    # Tudo entre aspas, exceto NULL: no CSV do COPY, campo vazio sem aspas é NULL
+    # e "" é texto vazio
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _connect(schema: str | None, params: Mapping[str, Any]):
+    connection = psycopg2.connect(**params)
+    if schema:
+        try:
+            with connection.cursor() as cur:
+                cur.execute(sql.SQL("SET search_path TO {};").format(sql.Identifier(schema)))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+    return connection
+
+
+class PoolTimeoutError(RuntimeError):
+    """Levantada quando nenhuma conexão do pool fica livre dentro do timeout."""
+
+
+class ConnectionPool:
+    """Pool de conexões psycopg2 compartilhado pelo processo.
+
+    O search_path é aplicado uma única vez por conexão física. Conexões ociosas
+    há mais de ``health_check_interval`` segundos são validadas com ``SELECT 1``
+    antes de serem entregues, e conexões mais velhas que ``max_lifetime`` são
+    recicladas.
+    """
+
+    def __init__(
+        self,
+        schema: str | None = None,
+        *,
+        host: str | None = None,
+        port: int | str | None = None,
+        database: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        max_lifetime: float | None = None,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Configuração de pool inválida: 0 <= min_size <= max_size e max_size >= 1")
+
+        self.schema = schema
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+        self._params = _connection_params(host, port, database, user, password)
+
+        self._cond = threading.Condition()
+        self._idle: list[tuple[Any, float]] = []
+        self._created_at: dict[int, float] = {}
+        self._size = 0
+        self._in_use = 0
+        self._filled = False
+        self._closed = False
+
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def getconn(self, *, wait: bool = True):
+        """Retira uma conexão do pool, bloqueando até ``timeout`` segundos.
+
+        Com ``wait=False`` não espera: se nenhuma conexão estiver livre nem
+        puder ser aberta agora, levanta ``PoolTimeoutError`` na hora.
+        """
+        if not self._filled:
+            self._fill()
+
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise psycopg2.InterfaceError("Pool de conexões fechado")
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # Reserva a vaga antes de conectar fora do lock
+                    self._size += 1
+                    connection, last_used = None, None
+                    break
+                if not wait:
+                    raise PoolTimeoutError(f"Nenhuma conexão livre (max_size={self.max_size})")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Nenhuma conexão disponível após {self.timeout:.1f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            waited = time.monotonic() - started
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._checkouts += 1
+            self._in_use += 1
+
+        try:
+            if connection is None:
+                connection = self._open()
+            elif not self._is_healthy(connection, last_used):
+                self._close_quietly(connection)
+                with self._cond:
+                    self._recycled += 1
+                connection = self._open()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return connection
+
+    def putconn(self, connection, *, discard: bool = False) -> None:
+        """Devolve uma conexão ao pool, descartando-a se estiver quebrada."""
+        if not discard:
+            discard = self._closed or not self._reset(connection)
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+                self._recycled += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close_quietly(connection)
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def dedicated_connection(self):
+        """Abre uma conexão fora do pool (ex.: LISTEN), com os mesmos parâmetros e search_path.
+
+        O chamador é responsável por fechá-la; ela não conta no tamanho do pool.
+        """
+        return _connect(self.schema, self._params)
+
+    def stats(self) -> dict[str, Any]:
+        """Métricas do pool para observabilidade."""
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "timeouts": self._timeouts,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "wait_avg_ms": round(self._wait_total * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+            }
+
+    def _fill(self) -> None:
+        with self._cond:
+            if self._filled:
+                return
+            self._filled = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._open())
+        finally:
+            now = time.monotonic()
+            with self._cond:
+                self._size -= missing - len(opened)
+                if len(opened) < missing:
+                    # Banco indisponível: tentar completar o mínimo no próximo checkout
+                    self._filled = False
+                self._idle.extend((connection, now) for connection in opened)
+                self._cond.notify_all()
+
+    def _open(self):
+        connection = _connect(self.schema, self._params)
+        with self._cond:
+            self._created += 1
+            self._created_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _is_healthy(self, connection, last_used: float) -> bool:
+        if connection.closed:
+            return False
+        now = time.monotonic()
+        created_at = self._created_at.get(id(connection), now)
+        if self.max_lifetime is not None and now - created_at > self.max_lifetime:
+            return False
+        if now - last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reset(self, connection) -> bool:
+        if connection.closed:
+            return False
+        try:
+            status = connection.get_transaction_status()
+            if status == pg_extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != pg_extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close_quietly(self, connection) -> None:
+        with self._cond:
+            self._created_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
 
 class DBSession:
     def __init__(
@@ -15,28 +291,52 @@ class DBSession:
         database: str | None = None,
         user: str | None = None,
         password: str | None = None,
+        pool: ConnectionPool | None = None,
+        wait: bool = True,
     ):
-        connection_host = host or os.environ.get("DB_HOST", "localhost")
-        connection_port = port or os.environ.get("DB_PORT", "5432")
-        connection_database = database or os.environ.get("DB_NAME", "public")
-        connection_user = user or os.environ.get("DB_USER", "postgres")
-        connection_password = password or os.environ.get("DB_PASSWORD", "password")
-
-        self.connection = psycopg2.connect(
-            host=connection_host,
-            port=int(connection_port),
-            database=connection_database,
-            user=connection_user,
-            password=connection_password,
-        )
+        self._pool = pool
+        self._released = False
+        self._transaction_depth = 0
+        if pool is not None:
+            # Conexão emprestada do pool já vem com o search_path aplicado
+            self.schema = pool.schema
+            self.connection = pool.getconn(wait=wait)
+            return
+
         self.schema = schema
-        if self.schema:
-            try:
-                with self.connection.cursor() as cur:
-                    cur.execute(sql.SQL("SET search_path TO {};").format(sql.Identifier(self.schema)))
-                self.connection.commit()
-            except Exception:
+        self.connection = _connect(
+            self.schema,
+            _connection_params(host, port, database, user, password),
+        )
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa as escritas do bloco numa única transação.
+
+        Dentro do bloco, ``execute``, ``executemany``, ``copy_rows`` e
+        ``insert_values`` não confirmam nem revertem: tudo é confirmado ao sair
+        do bloco, ou revertido se ele terminar com erro. Blocos aninhados fazem
+        parte do mais externo.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
                 self.connection.rollback()
+            raise
+        self._transaction_depth -= 1
+        if not self._transaction_depth:
+            self.connection.commit()
+
+    def _commit(self) -> None:
+        if not self._transaction_depth:
+            self.connection.commit()
+
+    def _rollback(self) -> None:
+        if not self._transaction_depth:
+            self.connection.rollback()
 
     def run_sql_file(self, path: str) -> None:
         try:
@@ -74,7 +374,7 @@ class DBSession:
     ) -> None:
         with self.connection.cursor() as cursor:
             cursor.execute(query, params or {})
-        self.connection.commit()
+        self._commit()
 
     def executemany(
         self,
@@ -83,10 +383,86 @@ class DBSession:
     ) -> None:
         with self.connection.cursor() as cursor:
             cursor.executemany(query, params_list)
-        self.connection.commit()
+        self._commit()
+
+    def copy_rows(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        *,
+        batch_size: int = COPY_BATCH_ROWS,
+    ) -> int:
+        """Carrega linhas com ``COPY ... FROM STDIN`` a partir de um buffer CSV em memória.
+
+        Cada ``batch_size`` linhas viram um único COPY; tudo é confirmado numa
+        transação ao final (ou com o bloco ``transaction`` em que estiver).
+        ``None`` vira NULL (defaults das colunas omitidas continuam valendo, os
+        das colunas listadas não). Triggers de linha e de
+        instrução disparam normalmente. Retorna o número de linhas carregadas.
+        """
+        copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+            sql.Identifier(table.lower()),
+            sql.SQL(", ").join(sql.Identifier(column.lower()) for column in columns),
+        ).as_string(self.connection)
+
+        total = 0
+        try:
+            with self.connection.cursor() as cursor:
+                buffer = io.StringIO()
+                pending = 0
+                for row in rows:
+                    buffer.write(",".join(map(_csv_field, row)))
+                    buffer.write("\n")
+                    pending += 1
+                    if pending >= batch_size:
+                        total += self._flush_copy(cursor, copy_query, buffer)
+                        pending = 0
+                if pending:
+                    total += self._flush_copy(cursor, copy_query, buffer)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return total
+
+    def insert_values(
+        self,
+        query: str,
+        rows: Sequence[Sequence[Any]],
+        *,
+        page_size: int = VALUES_PAGE_SIZE,
+    ) -> None:
+        """``INSERT ... VALUES %s`` com várias linhas por comando (``execute_values``).
+
+        Para cargas que precisam de ``ON CONFLICT`` ou ``RETURNING``, que o COPY
+        não suporta; uma ida ao banco por página em vez de uma por linha.
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                execute_values(cursor, query, rows, page_size=page_size)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+
+    @staticmethod
+    def _flush_copy(cursor, copy_query: str, buffer: io.StringIO) -> int:
+        buffer.seek(0)
+        cursor.copy_expert(copy_query, buffer)
+        loaded = cursor.rowcount
+        buffer.seek(0)
+        buffer.truncate()
+        return loaded
 
     def close(self):
-        self.connection.close()
+        if self._pool is None:
+            self.connection.close()
+            return
+        # Devolver ao pool apenas uma vez, mesmo se close() for chamado de novo
+        if not self._released:
+            self._released = True
+            self._pool.putconn(self.connection)
 
     def __enter__(self):
         return self
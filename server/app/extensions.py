@@ -1,8 +1,22 @@
+from pathlib import Path
+
+import click
 from flask import Flask, g
 from flask_cors import CORS
 
-from app.database import DBSession
-from app.services.database.bootstrap import ensure_schema_populated
+from app.database import ConnectionPool, DBSession
+from app.services.database import executor
+from app.services.database.plan_check import DEFAULT_MIN_ROWS, check_query_plans
+from app.services.database.prepared import PreparedStatementCache
+from app.services.database.registry import SQLAssetRegistry, collect_asset_references
+from app.services.activity_catalog import get_activity_catalog
+from app.services.auth.roles import get_role_cache
+from app.services.reports import get_report_cache
+from app.services.database.bootstrap import (
+    ensure_schema_populated,
+    is_schema_verified,
+    mark_schema_verified,
+)
 
 
 def register_extensions(app: Flask) -> None:
@@ -20,24 +34,84 @@ def register_extensions(app: Flask) -> None:
         cors_origins = ['http://nextjs_app:3000']
 
     CORS(app, supports_credentials=True, origins=cors_origins)
+    _register_sql_registry(app)
     _register_db_session(app)
+    _register_report_cache(app)
+    _register_activity_catalog(app)
+    _register_role_cache(app)
+    _register_cli(app)
+
+
+def _register_sql_registry(app: Flask) -> None:
+    sql_root = Path(app.config.get("SQL_ROOT_PATH") or executor.DEFAULT_SQL_ROOT)
+    registry = SQLAssetRegistry(
+        sql_root,
+        hot_reload=app.config.get("SQL_HOT_RELOAD", app.debug),
+    )
+    # Falhar na criação da app se algum asset usado pelas rotas estiver ausente
+    registry.load()
+    registry.require(collect_asset_references(Path(app.root_path)))
+    app.extensions["sql_registry"] = registry
+    app.logger.info("%d assets SQL carregados de %s", len(registry), sql_root)
+
+    if app.config.get("SQL_PREPARED_STATEMENTS"):
+        prepared_assets = app.config.get("SQL_PREPARED_ASSETS", ())
+        registry.require(prepared_assets)
+        app.extensions["sql_prepared"] = PreparedStatementCache(prepared_assets)
+
+
+def _register_report_cache(app: Flask) -> None:
+    report_cache = get_report_cache(app)
+    executor.add_write_listener(app, report_cache.invalidate_for_asset)
+
+
+def _register_activity_catalog(app: Flask) -> None:
+    catalog = get_activity_catalog(app)
+    # Escritas deste processo invalidam na hora; as dos demais chegam via NOTIFY
+    executor.add_write_listener(app, catalog.invalidate_for_asset)
+
+
+def _register_role_cache(app: Flask) -> None:
+    role_cache = get_role_cache(app)
+    executor.add_write_listener(app, role_cache.invalidate_for_asset)
+
+
+def get_db_pool(app: Flask) -> ConnectionPool:
+    """Retorna o pool de conexões do processo, criando-o na primeira chamada."""
+    pool = app.extensions.get("db_pool")
+    if pool is None:
+        pool = ConnectionPool(
+            schema=app.config.get("DB_SCHEMA"),
+            host=app.config.get("DB_HOST"),
+            port=app.config.get("DB_PORT"),
+            database=app.config.get("DB_NAME"),
+            user=app.config.get("DB_USER"),
+            password=app.config.get("DB_PASSWORD"),
+            min_size=app.config.get("DB_POOL_MIN_SIZE", 1),
+            max_size=app.config.get("DB_POOL_MAX_SIZE", 10),
+            timeout=app.config.get("DB_POOL_TIMEOUT", 30.0),
+            health_check_interval=app.config.get("DB_POOL_HEALTH_CHECK_INTERVAL", 30.0),
+            max_lifetime=app.config.get("DB_POOL_MAX_LIFETIME"),
+        )
+        app.extensions["db_pool"] = pool
+    return pool
 
 
 def _register_db_session(app: Flask) -> None:
+    # Conexões são abertas sob demanda, então criar o pool aqui não exige banco disponível
+    get_db_pool(app)
+
+    # O entrypoint já rodou o bootstrap antes de iniciar o servidor
+    if app.config.get("DB_SCHEMA_BOOTSTRAPPED"):
+        mark_schema_verified()
+
     @app.before_request
     def _create_db_session() -> None:
         from flask import request
         # Pular bootstrap para rotas de debug para evitar loop infinito
         if request.endpoint and request.endpoint.startswith('debug.'):
             try:
-                g.db_session = DBSession(
-                    schema=app.config.get("DB_SCHEMA"),
-                    host=app.config.get("DB_HOST"),
-                    port=app.config.get("DB_PORT"),
-                    database=app.config.get("DB_NAME"),
-                    user=app.config.get("DB_USER"),
-                    password=app.config.get("DB_PASSWORD"),
-                )
+                g.db_session = DBSession(pool=get_db_pool(app))
             except Exception as exc:
                 app.logger.error(f"Failed to create database session: {exc}")
                 if 'db_session' not in g:
@@ -45,18 +119,10 @@ def _register_db_session(app: Flask) -> None:
             return
 
         try:
-            g.db_session = DBSession(
-                schema=app.config.get("DB_SCHEMA"),
-                host=app.config.get("DB_HOST"),
-                port=app.config.get("DB_PORT"),
-                database=app.config.get("DB_NAME"),
-                user=app.config.get("DB_USER"),
-                password=app.config.get("DB_PASSWORD"),
-            )
-            # Sempre garantir que o schema existe antes de processar a requisição
-            app.logger.info("Chamando ensure_schema_populated...")
-            ensure_schema_populated(g.db_session)
-            app.logger.info("ensure_schema_populated concluído")
+            g.db_session = DBSession(pool=get_db_pool(app))
+            # Bootstrap roda uma vez por processo; depois disso nenhuma consulta ao catálogo
+            if not is_schema_verified():
+                ensure_schema_populated(g.db_session)
         except Exception as exc:  # pragma: no cover - database might be unavailable locally
             app.logger.error(
                 "Failed to create database session or populate schema: %s", exc, exc_info=exc
@@ -71,3 +137,52 @@ def _register_db_session(app: Flask) -> None:
         db_session: DBSession | None = g.pop("db_session", None)
         if db_session is not None:
             db_session.close()
+
+
+def _register_cli(app: Flask) -> None:
+    @app.cli.command("bootstrap-db")
+    def _bootstrap_db() -> None:
+        """Cria/verifica o schema e aplica funções, índices e views."""
+        with DBSession(pool=get_db_pool(app)) as db_session:
+            ensure_schema_populated(db_session, force=True)
+        print("Schema verificado e assets aplicados.")
+
+    @app.cli.command("refresh-report-summaries")
+    def _refresh_report_summaries() -> None:
+        """Reconstrói as tabelas de resumo usadas pelos relatórios."""
+        with DBSession(pool=get_db_pool(app)) as db_session:
+            db_session.execute("SELECT recalcular_resumos_relatorios()")
+        get_report_cache(app).invalidate()
+        print("Tabelas de resumo dos relatórios reconstruídas.")
+
+    @app.cli.command("reconcile-activity-counters")
+    def _reconcile_activity_counters() -> None:
+        """Corrige atividade.vagas_ocupadas divergente da contagem real de inscrições."""
+        with DBSession(pool=get_db_pool(app)) as db_session:
+            rows = db_session.fetch_all("SELECT * FROM reconciliar_vagas_ocupadas()")
+            db_session.connection.commit()
+        for row in rows:
+            print(
+                f"Atividade {row['id_atividade_corrigida']}: "
+                f"{row['vagas_ocupadas_anterior']} -> {row['vagas_ocupadas_real']}"
+            )
+        if rows:
+            get_report_cache(app).invalidate({"atividade"})
+        print(f"{len(rows)} contador(es) de vagas corrigido(s).")
+
+    @app.cli.command("check-query-plans")
+    @click.option("--min-rows", default=DEFAULT_MIN_ROWS, show_default=True,
+                  help="Tabelas com menos linhas estimadas são ignoradas.")
+    @click.option("--analyze", is_flag=True, help="Roda ANALYZE nas tabelas antes do EXPLAIN.")
+    def _check_query_plans(min_rows: int, analyze: bool) -> None:
+        """Falha se algum asset crítico fizer Seq Scan em tabela grande."""
+        with DBSession(pool=get_db_pool(app)) as db_session:
+            results = check_query_plans(db_session, min_rows=min_rows, analyze=analyze)
+        failed = False
+        for result in results:
+            detail = ", ".join(result.get("tables") or []) or result.get("message", "")
+            print(f"[{result['status']}] {result['asset']} {detail}".rstrip())
+            failed = failed or result["status"] in ("regressao", "erro")
+        if failed:
+            raise SystemExit(1)
+        print("Planos verificados: nenhum Seq Scan em tabela grande.")
@@ -1,19 +1,31 @@
-from flask import jsonify
+from datetime import date, time
+
+from flask import jsonify, request
 
 from app.routes.admin import admin_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_role
+from app.services.pagination import PaginationError, keyset_page, keyset_params
+
+RESERVATIONS_PAGE_KEYS = {"data_reserva": date, "horario_inicio": time, "id_reserva": int}
 
 
 @admin_blueprint.get("/reservations", endpoint="list_reservations")
 @require_role("admin")
 def list_reservations():
-    """List all reservations."""
+    """List reservations, optionally paginated with ``limit`` and ``after``."""
+    try:
+        params = keyset_params(request.args, RESERVATIONS_PAGE_KEYS)
+    except PaginationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
     try:
-        reservations = sql_queries.fetch_all("queries/admin/listar_reservas.sql")
+        reservations = sql_queries.fetch_all("queries/admin/listar_reservas.sql", params)
+        reservations, next_cursor = keyset_page(reservations, params, RESERVATIONS_PAGE_KEYS)
         return jsonify({
             "success": True,
             "reservations": reservations,
+            "next": next_cursor,
         })
     except Exception as e:
         return jsonify({"success": False, "message": f"Erro ao listar reservas: {str(e)}"}), 500
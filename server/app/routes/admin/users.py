@@ -3,17 +3,27 @@ from flask import jsonify, request, current_app
 from app.routes.admin import admin_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_role
+from app.services.pagination import PaginationError, keyset_page, keyset_params
+
+USERS_PAGE_KEYS = {"nome": str, "cpf": str}
 
 
 @admin_blueprint.get("/users", endpoint="list_users")
 @require_role("admin")
 def list_users():
-    """List all users."""
+    """List users, optionally paginated with ``limit`` and ``after``."""
+    try:
+        params = keyset_params(request.args, USERS_PAGE_KEYS)
+    except PaginationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
     try:
-        users = sql_queries.fetch_all("queries/admin/listar_usuarios.sql")
+        users = sql_queries.fetch_all("queries/admin/listar_usuarios.sql", params)
+        users, next_cursor = keyset_page(users, params, USERS_PAGE_KEYS)
         return jsonify({
             "success": True,
             "users": users,
+            "next": next_cursor,
         })
     except Exception as e:
         return jsonify({"success": False, "message": f"Erro ao listar usuários: {str(e)}"}), 500
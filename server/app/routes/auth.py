@@ -2,7 +2,9 @@ from flask import Blueprint, g, jsonify, request, session
 import logging
 from pathlib import Path
 
+from app.services.auth.roles import current_profile_access
 from app.services.database import executor as sql_queries
+from app.services.login_audit import authenticate
 
 logger = logging.getLogger(__name__)
 
@@ -32,20 +34,11 @@ def login_post():
     if not email or not password:
         return jsonify({"success": False, "message": "E-mail e senha são obrigatórios"}), 400
 
-    result = sql_queries.fetch_one(
-        "queries/auth/login_user.sql",
-        {
-            "email_or_cpf": email,
-            "password": password,
-            "ip_origin": ip_origin,
-        },
-    )
+    auth_data = authenticate(email, password, ip_origin)
 
-    if not result or not result.get("result"):
+    if not auth_data:
         return jsonify({"success": False, "message": "Credenciais inválidas"}), 401
 
-    auth_data = result["result"]
-
     if not auth_data.get("success"):
         return jsonify({"success": False, "message": auth_data.get("message", "Credenciais inválidas")}), 401
 
@@ -184,8 +177,8 @@ def pending_registrations():
     if not session.get("user_id"):
         return jsonify({"success": False, "message": "Autenticação necessária"}), 401
 
-    # Check if user is admin (simple check via session)
-    profile_access = session.get("profile_access", {})
+    # Check if user is admin (session roles revalidated against USUARIO_SENHA.PAPEIS)
+    profile_access = current_profile_access()
     if not profile_access.get("admin"):
         return jsonify({"success": False, "message": "Acesso de administrador necessário"}), 403
 
@@ -203,8 +196,8 @@ def approved_registrations():
     if not session.get("user_id"):
         return jsonify({"success": False, "message": "Autenticação necessária"}), 401
 
-    # Check if user is admin (simple check via session)
-    profile_access = session.get("profile_access", {})
+    # Check if user is admin (session roles revalidated against USUARIO_SENHA.PAPEIS)
+    profile_access = current_profile_access()
     if not profile_access.get("admin"):
         return jsonify({"success": False, "message": "Acesso de administrador necessário"}), 403
 
@@ -221,8 +214,8 @@ def rejected_registrations():
     if not session.get("user_id"):
         return jsonify({"success": False, "message": "Autenticação necessária"}), 401
 
-    # Check if user is admin (simple check via session)
-    profile_access = session.get("profile_access", {})
+    # Check if user is admin (session roles revalidated against USUARIO_SENHA.PAPEIS)
+    profile_access = current_profile_access()
     if not profile_access.get("admin"):
         return jsonify({"success": False, "message": "Acesso de administrador necessário"}), 403
 
@@ -239,7 +232,7 @@ def approve_registration():
     if not session.get("user_id"):
         return jsonify({"success": False, "message": "Autenticação necessária"}), 401
 
-    profile_access = session.get("profile_access", {})
+    profile_access = current_profile_access()
     if not profile_access.get("admin"):
         return jsonify({"success": False, "message": "Acesso de administrador necessário"}), 403
 
@@ -281,7 +274,7 @@ def reject_registration():
     if not session.get("user_id"):
         return jsonify({"success": False, "message": "Autenticação necessária"}), 401
 
-    profile_access = session.get("profile_access", {})
+    profile_access = current_profile_access()
     if not profile_access.get("admin"):
         return jsonify({"success": False, "message": "Acesso de administrador necessário"}), 403
 
@@ -598,17 +591,14 @@ def update_password():
 
     cpf_pessoa = session.get("user_id")
 
-    # Verificar senha atual
+    # Verificar senha atual sem passar pelo login: erro aqui não conta
+    # tentativa, não bloqueia a conta e não gera auditoria
     verify_result = sql_queries.fetch_one(
-        "queries/auth/login_user.sql",
-        {
-            "email_or_cpf": cpf_pessoa,
-            "password": current_password,
-            "ip_origin": request.remote_addr,
-        },
+        "queries/auth/verify_current_password.sql",
+        {"cpf": cpf_pessoa, "password": current_password},
     )
 
-    if not verify_result or not verify_result.get("result") or not verify_result["result"].get("success"):
+    if not verify_result or not verify_result.get("valid"):
         return jsonify({"success": False, "message": "Senha atual incorreta"}), 401
 
     # Fazer hash da nova senha usando função SQL
@@ -1,11 +1,12 @@
 from pathlib import Path
 
-from flask import jsonify
+from flask import current_app, jsonify
 
 from app.routes.debug import debug_blueprint
 from app.database import DBSession
 from app.services.migrations import SchemaMigration
 from data_generators.populate import populate_db
+from app.services.database.bootstrap import invalidate_schema_cache
 from app.services.database.downgrade import downgrade_database
 from data_generators.check_populated import is_db_populated
 
@@ -28,6 +29,33 @@ def check_database_status():
         }), 500
 
 
+@debug_blueprint.get("/pool-stats")
+def pool_stats():
+    """Retorna as métricas do pool de conexões do processo."""
+    from app.extensions import get_db_pool
+
+    return jsonify(get_db_pool(current_app).stats())
+
+
+@debug_blueprint.get("/login-audit-stats")
+def login_audit_stats():
+    """Retorna as métricas da fila de auditoria de login (vazio se o modo assíncrono estiver desligado)."""
+    from app.services.login_audit import get_login_audit_writer
+
+    writer = get_login_audit_writer(current_app)
+    return jsonify({"async": writer is not None, **(writer.stats() if writer else {})})
+
+
+@debug_blueprint.post("/invalidate-schema-cache")
+def invalidate_schema():
+    """Força a verificação do schema (e reaplicação de funções/views) na próxima requisição."""
+    invalidate_schema_cache()
+    return jsonify({
+        "success": True,
+        "message": "Cache de schema invalidado. O bootstrap rodará na próxima requisição."
+    })
+
+
 @debug_blueprint.post("/populate-db")
 def populate_database():
     """Popula o banco de dados com dados sintéticos usando o sistema unificado."""
@@ -84,8 +112,7 @@ def clear_database():
     dbsession = None
     try:
         # Resetar flag do bootstrap para forçar recriação
-        import app.services.database.bootstrap as bootstrap_module
-        bootstrap_module._schema_ready = False
+        invalidate_schema_cache()
 
         # Criar sessão própria (não usar g.db_session para evitar conflitos)
         dbsession = DBSession()
@@ -3,6 +3,7 @@ from flask import g, jsonify, request, session
 from app.routes.external import external_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_external_auth
+from app.services.reports import invalidate_reports
 
 
 @external_blueprint.get("/dashboard", endpoint="dashboard")
@@ -104,6 +105,7 @@ def accept_invite():
     # Commit the transaction after executing the function that modifies the database
     if hasattr(g, 'db_session') and g.db_session:
         g.db_session.connection.commit()
+        invalidate_reports({"participacao_atividade"})
 
     # Get updated invite status from database to ensure it's current
     updated_invite = sql_queries.fetch_one(
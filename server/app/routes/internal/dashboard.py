@@ -1,10 +1,32 @@
 import secrets
+from datetime import date, time
 from flask import current_app, jsonify, request, session, g
 from psycopg2.extras import RealDictCursor
 
 from app.routes.internal import internal_blueprint
 from app.services.database import executor as sql_queries
+from app.services.activity_catalog import get_activity_catalog
 from app.services.auth.decorators import require_role
+from app.services.enrollments import MAX_BATCH_ENROLLMENTS, enroll_batch
+from app.services.error_handler import reservation_conflict, simplify_database_error
+from app.services.reservations import BulkReservationError, parse_slots, reserve_bulk
+
+# Limite de horários por chamada de /internal/equipment/availability
+MAX_AVAILABILITY_SLOTS = 50
+
+
+def _invalid_time_range(day, start, end) -> str | None:
+    """Motivo para recusar uma consulta de disponibilidade, ou None se válida."""
+    try:
+        date.fromisoformat(str(day))
+        inicio = time.fromisoformat(str(start))
+        fim = time.fromisoformat(str(end))
+    except ValueError:
+        return "Data ou horário inválido"
+    # Com fim == início o intervalo é vazio e nenhuma reserva conflitaria
+    if fim <= inicio:
+        return "O horário de fim deve ser maior que o horário de início"
+    return None
 
 
 @internal_blueprint.get("/", endpoint="dashboard")
@@ -30,6 +52,9 @@ def dashboard():
     available_installs: list[dict[str, str]] = []
     available_equipment: list[dict[str, str]] = []
     if date_param and start_param and end_param:
+        invalid = _invalid_time_range(date_param, start_param, end_param)
+        if invalid:
+            return jsonify({"success": False, "message": invalid}), 400
         available_installs = sql_queries.fetch_all(
             "queries/internal/instalacoes_disponiveis.sql",
             {
@@ -69,14 +94,11 @@ def list_activities():
     modality = request.args.get("modality") or None
     cpf_participante = session.get("user_id") or None
 
-    activities = sql_queries.fetch_all(
-        "queries/internal/atividades_disponiveis.sql",
-        {
-            "weekday": weekday,
-            "group_name": group_name,
-            "modality": modality,
-            "cpf_participante": cpf_participante,
-        },
+    activities = get_activity_catalog(current_app).activities(
+        weekday,
+        group_name,
+        modality,
+        cpf_participante,
     )
 
     return jsonify({
@@ -123,6 +145,44 @@ def enroll_activity():
         return jsonify({"success": False, "message": f"Erro ao inscrever: {error_message}"}), 500
 
 
+@internal_blueprint.post("/activities/enroll/bulk", endpoint="enroll_activities_bulk")
+@require_role("internal", "staff", "admin")
+def enroll_activities_bulk():
+    """Enroll the current user in several activities in a single transaction."""
+    cpf_participante = session.get("user_id")
+    if not cpf_participante:
+        return jsonify({"success": False, "message": "Usuário não autenticado"}), 401
+
+    data = request.get_json(silent=True) or {}
+    ids_atividades = data.get("ids_atividades")
+    if not isinstance(ids_atividades, list) or not ids_atividades:
+        return jsonify({"success": False, "message": "Informe a lista de atividades em 'ids_atividades'"}), 400
+    if len(ids_atividades) > MAX_BATCH_ENROLLMENTS:
+        return jsonify({
+            "success": False,
+            "message": f"Máximo de {MAX_BATCH_ENROLLMENTS} atividades por lote",
+        }), 400
+    try:
+        ids_atividades = [int(id_atividade) for id_atividade in ids_atividades]
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "IDs de atividade devem ser inteiros"}), 400
+
+    try:
+        outcome = enroll_batch(
+            "queries/internal/inscrever_em_atividades_lote.sql",
+            {"cpf_participante": cpf_participante, "ids_atividades": ids_atividades},
+        )
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Erro ao inscrever: {str(e)}"}), 500
+
+    return jsonify({
+        "success": True,
+        "message": f"Inscrição realizada em {outcome['enrolled']} de {len(ids_atividades)} atividade(s)",
+        "enrolled": outcome["enrolled"],
+        "results": outcome["results"],
+    })
+
+
 @internal_blueprint.post("/reservations/installation", endpoint="reserve_installation")
 @require_role("internal", "staff", "admin")
 def reserve_installation():
@@ -162,6 +222,13 @@ def reserve_installation():
             "message": "Reserva realizada com sucesso",
         })
     except Exception as e:
+        conflict = reservation_conflict(e)
+        if conflict:
+            return jsonify({
+                "success": False,
+                "message": simplify_database_error(str(e)),
+                "conflict": conflict,
+            }), 409
         return jsonify({"success": False, "message": f"Erro ao reservar instalação: {str(e)}"}), 500
 
 
@@ -205,6 +272,13 @@ def reserve_equipment():
         })
     except Exception as e:
         error_message = str(e)
+        conflict = reservation_conflict(e)
+        if conflict:
+            return jsonify({
+                "success": False,
+                "message": simplify_database_error(error_message),
+                "conflict": conflict,
+            }), 409
         if "não é reservável" in error_message.lower():
             return jsonify({"success": False, "message": "Este equipamento não é reservável"}), 400
         if "horário de fim deve ser maior" in error_message.lower() or "ck_reserva_equip_horario" in error_message.lower():
@@ -212,6 +286,63 @@ def reserve_equipment():
         return jsonify({"success": False, "message": f"Erro ao reservar equipamento: {error_message}"}), 500
 
 
+def _bulk_reservation(resource: str, id_field: str):
+    cpf_responsavel = session.get("user_id")
+    if not cpf_responsavel:
+        return jsonify({"success": False, "message": "Usuário não autenticado"}), 401
+
+    data = request.get_json(silent=True) or {}
+    resource_id = data.get(id_field)
+    if not resource_id:
+        return jsonify({"success": False, "message": f"O campo {id_field} é obrigatório"}), 400
+    mode = data.get("mode") or "all_or_nothing"
+
+    if resource == "instalacao":
+        try:
+            resource_id = int(resource_id)
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "message": f"O campo {id_field} deve ser um inteiro"}), 400
+
+    try:
+        slots = parse_slots(data)
+        outcome = reserve_bulk(resource, resource_id, cpf_responsavel, slots, mode)
+    except BulkReservationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": simplify_database_error(str(e))}), 500
+
+    failed = outcome["failed"]
+    status = 409 if failed and not outcome["committed"] else 200
+    if not failed:
+        message = f"{outcome['reserved']} horário(s) reservado(s) com sucesso"
+    elif outcome["committed"]:
+        message = f"{outcome['reserved']} horário(s) reservado(s); {failed} com falha"
+    else:
+        message = "Nenhum horário foi reservado"
+    return jsonify({
+        "success": not failed or outcome["committed"],
+        "message": message,
+        "mode": mode,
+        "reserved": outcome["reserved"],
+        "failed": failed,
+        "results": outcome["results"],
+    }), status
+
+
+@internal_blueprint.post("/reservations/installation/bulk", endpoint="reserve_installation_bulk")
+@require_role("internal", "staff", "admin")
+def reserve_installation_bulk():
+    """Reserve several slots (or a weekly recurrence) of an installation in one transaction."""
+    return _bulk_reservation("instalacao", "id_instalacao")
+
+
+@internal_blueprint.post("/reservations/equipment/bulk", endpoint="reserve_equipment_bulk")
+@require_role("internal", "staff", "admin")
+def reserve_equipment_bulk():
+    """Reserve several slots (or a weekly recurrence) of an equipment in one transaction."""
+    return _bulk_reservation("equipamento", "id_equipamento")
+
+
 @internal_blueprint.get("/equipment", endpoint="list_equipment")
 @require_role("internal", "staff", "admin")
 def list_equipment():
@@ -226,6 +357,54 @@ def list_equipment():
     })
 
 
+@internal_blueprint.post("/equipment/availability", endpoint="equipment_availability")
+@require_role("internal", "staff", "admin")
+def equipment_availability():
+    """List available equipment for several time slots in a single query."""
+    data = request.get_json(silent=True) or {}
+    slots = data.get("slots")
+    if not isinstance(slots, list) or not slots:
+        return jsonify({"success": False, "message": "Informe ao menos um horário em 'slots'"}), 400
+    if len(slots) > MAX_AVAILABILITY_SLOTS:
+        return jsonify({
+            "success": False,
+            "message": f"Máximo de {MAX_AVAILABILITY_SLOTS} horários por consulta",
+        }), 400
+    if not all(isinstance(slot, dict) and slot.get("date") and slot.get("start") and slot.get("end") for slot in slots):
+        return jsonify({"success": False, "message": "Cada horário precisa de date, start e end"}), 400
+    for index, slot in enumerate(slots):
+        invalid = _invalid_time_range(slot["date"], slot["start"], slot["end"])
+        if invalid:
+            return jsonify({"success": False, "message": f"slots[{index}]: {invalid}"}), 400
+
+    rows = sql_queries.fetch_all(
+        "queries/internal/equipamentos_disponiveis_lote.sql",
+        {
+            "dates": [slot["date"] for slot in slots],
+            "starts": [slot["start"] for slot in slots],
+            "ends": [slot["end"] for slot in slots],
+        },
+    )
+
+    available: list[list[dict]] = [[] for _ in slots]
+    for row in rows:
+        position = row.pop("slot")
+        available[position - 1].append(row)
+
+    return jsonify({
+        "success": True,
+        "slots": [
+            {
+                "date": slot["date"],
+                "start": slot["start"],
+                "end": slot["end"],
+                "available_equipment": equipment,
+            }
+            for slot, equipment in zip(slots, available)
+        ],
+    })
+
+
 @internal_blueprint.get("/invites", endpoint="list_invites")
 @require_role("internal", "staff", "admin")
 def list_invites():
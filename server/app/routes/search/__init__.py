@@ -0,0 +1,7 @@
+from flask import Blueprint
+
+search_blueprint = Blueprint("search", __name__, url_prefix="/search")
+
+
+def init_app() -> None:
+    from . import api  # noqa: F401
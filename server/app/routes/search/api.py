@@ -0,0 +1,74 @@
+from flask import jsonify, request, session
+
+from app.routes.search import search_blueprint
+from app.services.auth.decorators import require_role
+from app.services.database import executor as sql_queries
+
+SEARCH_TYPES = ("pessoa", "atividade", "grupo_extensao")
+# Pessoas (nome, email, NUSP) só aparecem para administradores
+RESTRICTED_SEARCH_TYPES = {"pessoa": "admin"}
+MIN_QUERY_LENGTH = 2
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@search_blueprint.get("", endpoint="search")
+@require_role("internal", "staff", "admin")
+def search():
+    """Search people, activities and extension groups ranked by similarity.
+
+    Query string: ``q`` (term), ``types`` (comma separated, optional) and ``limit``.
+    """
+    term = (request.args.get("q") or "").strip()
+    if len(term) < MIN_QUERY_LENGTH:
+        return jsonify({
+            "success": False,
+            "message": f"Informe ao menos {MIN_QUERY_LENGTH} caracteres em 'q'",
+        }), 400
+
+    profile_access = session.get("profile_access", {})
+    allowed = [
+        search_type for search_type in SEARCH_TYPES
+        if search_type not in RESTRICTED_SEARCH_TYPES
+        or profile_access.get(RESTRICTED_SEARCH_TYPES[search_type])
+    ]
+    requested = [value.strip() for value in (request.args.get("types") or "").split(",") if value.strip()]
+    if requested:
+        invalid = [value for value in requested if value not in SEARCH_TYPES]
+        if invalid:
+            return jsonify({"success": False, "message": f"Tipo de busca inválido: {', '.join(invalid)}"}), 400
+        if any(value not in allowed for value in requested):
+            return jsonify({"success": False, "message": "Permissões insuficientes"}), 403
+        types = requested
+    else:
+        types = allowed
+
+    try:
+        limit = int(request.args.get("limit") or DEFAULT_SEARCH_LIMIT)
+    except ValueError:
+        return jsonify({"success": False, "message": "Parâmetro limit deve ser um inteiro"}), 400
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    try:
+        results = sql_queries.fetch_all(
+            "queries/search/buscar.sql",
+            {
+                "q": term,
+                "q_like": _escape_like(term),
+                "types": types,
+                "limit": limit,
+            },
+        )
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Erro na busca: {str(e)}"}), 500
+
+    return jsonify({
+        "success": True,
+        "query": term,
+        "types": types,
+        "results": results,
+    })
@@ -3,6 +3,7 @@ from flask import jsonify, request
 from app.routes.staff import staff_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_role
+from app.services.enrollments import MAX_BATCH_ENROLLMENTS, enroll_batch
 
 
 @staff_blueprint.get("/activities/<int:activity_id>/participants", endpoint="list_activity_participants")
@@ -56,6 +57,40 @@ def add_activity_participant(activity_id: int):
         return jsonify({"success": False, "message": f"Erro ao inscrever participante: {error_message}"}), 500
 
 
+@staff_blueprint.post("/activities/<int:activity_id>/participants/bulk", endpoint="add_activity_participants_bulk")
+@require_role("staff", "admin")
+def add_activity_participants_bulk(activity_id: int):
+    """Add several participants to an activity in a single transaction."""
+    data = request.get_json(silent=True) or {}
+    cpfs = data.get("cpfs")
+    if not isinstance(cpfs, list) or not cpfs:
+        return jsonify({"success": False, "message": "Informe a lista de CPFs em 'cpfs'"}), 400
+    if len(cpfs) > MAX_BATCH_ENROLLMENTS:
+        return jsonify({
+            "success": False,
+            "message": f"Máximo de {MAX_BATCH_ENROLLMENTS} CPFs por lote",
+        }), 400
+    cpfs = [str(cpf).strip() for cpf in cpfs]
+
+    try:
+        outcome = enroll_batch(
+            "queries/staff/inscrever_participantes_lote.sql",
+            {"id_atividade": activity_id, "cpfs": cpfs},
+        )
+    except Exception as e:
+        error_message = str(e)
+        if "não existe" in error_message.lower():
+            return jsonify({"success": False, "message": "A atividade informada não existe"}), 404
+        return jsonify({"success": False, "message": f"Erro ao inscrever participantes: {error_message}"}), 500
+
+    return jsonify({
+        "success": True,
+        "message": f"{outcome['enrolled']} de {len(cpfs)} participante(s) inscrito(s)",
+        "enrolled": outcome["enrolled"],
+        "results": outcome["results"],
+    })
+
+
 @staff_blueprint.delete("/activities/<int:activity_id>/participants/<cpf>", endpoint="remove_activity_participant")
 @require_role("staff", "admin")
 def remove_activity_participant(activity_id: int, cpf: str):
@@ -1,8 +1,13 @@
+from datetime import date, time
+
 from flask import jsonify, request
 
 from app.routes.staff import staff_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_role
+from app.services.pagination import PaginationError, keyset_page, keyset_params
+
+RESERVATIONS_PAGE_KEYS = {"data_reserva": date, "horario_inicio": time, "id_reserva": int}
 
 
 @staff_blueprint.get("/installations/reservations", endpoint="list_installation_reservations")
@@ -16,15 +21,22 @@ def list_installation_reservations():
         "cpf_responsavel": request.args.get("cpf_responsavel") or None,
     }
 
+    try:
+        page_params = keyset_params(request.args, RESERVATIONS_PAGE_KEYS)
+    except PaginationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
     try:
         reservations = sql_queries.fetch_all(
             "queries/staff/listar_reservas_instalacoes.sql",
-            filters,
+            {**filters, **page_params},
         )
+        reservations, next_cursor = keyset_page(reservations, page_params, RESERVATIONS_PAGE_KEYS)
         return jsonify({
             "success": True,
             "reservations": reservations,
             "filters": filters,
+            "next": next_cursor,
         })
     except Exception as e:
         return jsonify({"success": False, "message": f"Erro ao listar reservas: {str(e)}"}), 500
@@ -1,19 +1,51 @@
-from flask import jsonify
+from datetime import date, time
+
+from flask import jsonify, request
 
 from app.routes.views import views_blueprint
 from app.services.database import executor as sql_queries
 from app.services.auth.decorators import require_auth
+from app.services.export import ExportFormatError, export_response
+from app.services.pagination import PaginationError, keyset_page, keyset_params
+
+RESERVAS_PAGE_KEYS = {"data_reserva": date, "horario_inicio": time, "id_reserva": int}
+
+
+def _export(relative_path: str, filename: str, params=None):
+    """Resposta em streaming quando ``?format=ndjson|csv`` é informado; None caso contrário."""
+    export_format = request.args.get("format")
+    if not export_format:
+        return None
+    try:
+        return export_response(relative_path, export_format, filename, params)
+    except ExportFormatError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
 
 @views_blueprint.get("/reservas-completas", endpoint="reservas_completas")
 @require_auth
 def reservas_completas():
-    """Retorna dados da view de reservas completas"""
+    """Retorna dados da view de reservas completas (paginável com limit/after, exportável com format)"""
+    exported = _export(
+        "queries/views/reservas_completas.sql",
+        "reservas_completas",
+        keyset_params({}, RESERVAS_PAGE_KEYS),
+    )
+    if exported is not None:
+        return exported
+
     try:
-        data = sql_queries.fetch_all("queries/views/reservas_completas.sql")
+        params = keyset_params(request.args, RESERVAS_PAGE_KEYS)
+    except PaginationError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    try:
+        data = sql_queries.fetch_all("queries/views/reservas_completas.sql", params)
+        data, next_cursor = keyset_page(data, params, RESERVAS_PAGE_KEYS)
         return jsonify({
             "success": True,
             "data": data,
+            "next": next_cursor,
         })
     except Exception as e:
         return jsonify({
@@ -26,6 +58,10 @@ def reservas_completas():
 @require_auth
 def atividades_completas():
     """Retorna dados da view de atividades completas"""
+    exported = _export("queries/views/atividades_completas.sql", "atividades_completas")
+    if exported is not None:
+        return exported
+
     try:
         data = sql_queries.fetch_all("queries/views/atividades_completas.sql")
         return jsonify({
@@ -43,6 +79,10 @@ def atividades_completas():
 @require_auth
 def equipamentos_disponiveis():
     """Retorna dados da view de equipamentos disponíveis"""
+    exported = _export("queries/views/equipamentos_disponiveis.sql", "equipamentos_disponiveis")
+    if exported is not None:
+        return exported
+
     try:
         data = sql_queries.fetch_all("queries/views/equipamentos_disponiveis.sql")
         return jsonify({
@@ -60,6 +100,10 @@ def equipamentos_disponiveis():
 @require_auth
 def instalacoes_ocupacao():
     """Retorna dados da view de instalações com ocupação"""
+    exported = _export("queries/views/instalacoes_ocupacao.sql", "instalacoes_ocupacao")
+    if exported is not None:
+        return exported
+
     try:
         data = sql_queries.fetch_all("queries/views/instalacoes_ocupacao.sql")
         return jsonify({
@@ -77,6 +121,10 @@ def instalacoes_ocupacao():
 @require_auth
 def reservas_equipamentos_completas():
     """Retorna dados da view de reservas de equipamentos completas"""
+    exported = _export("queries/views/reservas_equipamentos_completas.sql", "reservas_equipamentos_completas")
+    if exported is not None:
+        return exported
+
     try:
         data = sql_queries.fetch_all("queries/views/reservas_equipamentos_completas.sql")
         return jsonify({
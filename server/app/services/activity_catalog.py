@@ -0,0 +1,194 @@
+"""
+Cache do catálogo de atividades de /internal/activities.
+
+O catálogo base (``listar_atividades`` com os filtros da requisição) é o mesmo
+para todos os usuários e muda pouco, então fica em memória por tupla de
+filtros. A marcação ``is_enrolled`` de cada usuário vem de uma consulta
+pequena (ids das atividades em que ele está inscrito) feita a cada requisição.
+
+A invalidação é dirigida por mudanças: triggers em ``atividade``,
+``ocorrencia_semanal``, ``participacao_atividade``, ``grupo_extensao`` e
+``atividade_grupo_extensao`` emitem ``NOTIFY`` no canal
+``catalogo_atividades`` (``sql/functions/common_triggers.sql``) e uma thread
+por processo escuta o canal numa conexão dedicada. Enquanto o ``LISTEN`` não
+está ativo (banco fora do ar, reconexão) o cache não é usado, já que
+notificações podem ter sido perdidas. O TTL é só uma rede de segurança.
+"""
+import select
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from flask import Flask, current_app, g
+from psycopg2 import extensions as pg_extensions
+
+from app.services.database import executor as sql_queries
+
+CATALOG_CHANNEL = "catalogo_atividades"
+# Assets que alteram o catálogo (atividades, ocorrências, grupos ou o contador
+# de vagas) via execute_statement, para invalidar na hora as escritas deste
+# processo; as inscrições em lote e as dos demais processos chegam pelo NOTIFY
+CATALOG_WRITE_ASSETS = frozenset({
+    "queries/staff/criar_atividade.sql",
+    "queries/staff/atualizar_atividade.sql",
+    "queries/staff/deletar_atividade.sql",
+    "queries/internal/inscrever_em_atividade.sql",
+    "queries/staff/remover_participante_atividade.sql",
+    "queries/extension_group/atualizar_grupo_extensao.sql",
+    "queries/extension_group/deletar_grupo_extensao.sql",
+    "queries/admin/deletar_instalacao.sql",
+    "queries/admin/deletar_pessoa.sql",
+})
+
+# Intervalo do SELECT 1 na conexão de LISTEN ociosa e espera entre reconexões
+LISTEN_KEEPALIVE = 30.0
+LISTEN_RETRY_DELAY = 5.0
+
+
+@dataclass
+class _CachedCatalog:
+    rows: list[dict[str, Any]]
+    expires_at: float
+
+
+class ActivityCatalog:
+    """Catálogo base por tupla de filtros, invalidado por LISTEN/NOTIFY."""
+
+    def __init__(self, ttl: float, max_entries: int = 256, enabled: bool = True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: dict[Hashable, _CachedCatalog] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._listening = threading.Event()
+        self._stop = threading.Event()
+        self._listener: threading.Thread | None = None
+
+    def activities(
+        self,
+        weekday: str | None,
+        group_name: str | None,
+        modality: str | None,
+        cpf_participante: str | None,
+    ) -> list[dict[str, Any]]:
+        """Catálogo filtrado com ``is_enrolled`` calculado para ``cpf_participante``."""
+        filters = {"weekday": weekday, "group_name": group_name, "modality": modality}
+        if not self.enabled:
+            return sql_queries.fetch_all(
+                "queries/internal/atividades_disponiveis.sql",
+                {**filters, "cpf_participante": cpf_participante},
+            )
+
+        base = self._base(filters)
+        enrolled: set[int] = set()
+        if cpf_participante:
+            enrolled = {
+                row["id_atividade"]
+                for row in sql_queries.fetch_all(
+                    "queries/internal/atividades_inscritas.sql",
+                    {"cpf_participante": cpf_participante},
+                )
+            }
+        return [{**row, "is_enrolled": row["id_atividade"] in enrolled} for row in base]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def invalidate_for_asset(self, relative_path: str) -> None:
+        if relative_path in CATALOG_WRITE_ASSETS:
+            self.invalidate()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=LISTEN_RETRY_DELAY)
+
+    def _base(self, filters: dict[str, Any]) -> list[dict[str, Any]]:
+        if not self._listening.is_set():
+            self._start_listener(current_app._get_current_object())
+            return sql_queries.fetch_all("queries/internal/catalogo_atividades.sql", filters)
+
+        key = (filters["weekday"], filters["group_name"], filters["modality"])
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry is not None and entry.expires_at > now:
+            return entry.rows
+
+        rows = sql_queries.fetch_all("queries/internal/catalogo_atividades.sql", filters)
+        if g.get("db_session") is None:
+            # Banco indisponível: resultado vazio não deve ser guardado
+            return rows
+        with self._lock:
+            # Uma notificação durante a consulta invalida o resultado: serve, mas não guarda
+            if generation == self._generation and self._listening.is_set():
+                self._entries.pop(key, None)
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = _CachedCatalog(rows, time.monotonic() + self.ttl)
+        return rows
+
+    def _start_listener(self, app: Flask) -> None:
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen,
+                args=(app,),
+                name="activity-catalog-listener",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen(self, app: Flask) -> None:
+        from app.extensions import get_db_pool
+
+        pool = get_db_pool(app)
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = pool.dedicated_connection()
+                connection.set_isolation_level(pg_extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CATALOG_CHANNEL}")
+                # Entradas calculadas antes do LISTEN podem ter perdido notificações
+                self.invalidate()
+                self._listening.set()
+                self._wait_notifications(connection)
+            except Exception as exc:
+                app.logger.warning("LISTEN %s interrompido: %s", CATALOG_CHANNEL, exc)
+            finally:
+                self._listening.clear()
+                self.invalidate()
+                if connection is not None and not connection.closed:
+                    connection.close()
+            self._stop.wait(LISTEN_RETRY_DELAY)
+
+    def _wait_notifications(self, connection) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([connection], [], [], LISTEN_KEEPALIVE)
+            if not readable:
+                # Detecta conexão perdida mesmo sem tráfego
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            connection.poll()
+            if connection.notifies:
+                connection.notifies.clear()
+                self.invalidate()
+
+
+def get_activity_catalog(app: Flask) -> ActivityCatalog:
+    catalog = app.extensions.get("activity_catalog")
+    if catalog is None:
+        catalog = ActivityCatalog(
+            ttl=app.config.get("ACTIVITY_CATALOG_TTL", 600.0),
+            max_entries=app.config.get("ACTIVITY_CATALOG_MAX_ENTRIES", 256),
+            enabled=app.config.get("ACTIVITY_CATALOG_CACHE", True),
+        )
+        app.extensions["activity_catalog"] = catalog
+    return catalog
@@ -2,6 +2,8 @@ from functools import wraps
 
 from flask import jsonify, session
 
+from app.services.auth.roles import current_profile_access
+
 
 def require_auth(f):
     """Decorator to require user authentication."""
@@ -27,7 +29,8 @@ def require_role(*allowed_roles):
         def decorated_function(*args, **kwargs):
             # Check for regular user authentication
             if session.get("user_id"):
-                profile_access = session.get("profile_access", {})
+                # Papéis revogados depois do login deixam de valer
+                profile_access = current_profile_access()
                 has_role = any(profile_access.get(role) for role in allowed_roles)
 
                 if not has_role:
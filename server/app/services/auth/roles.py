@@ -0,0 +1,112 @@
+"""
+Revalidação dos papéis guardados na sessão.
+
+O login grava ``profile_access`` na sessão, que antes valia até o logout mesmo
+se o papel fosse revogado. ``USUARIO_SENHA.PAPEIS`` guarda o bitmap de papéis
+de cada conta, mantido pelos triggers de ``sql/functions/common_triggers.sql``,
+então conferir os papéis atuais é uma leitura por chave primária. O resultado
+fica num cache por processo com TTL (``ROLE_CACHE_TTL`` segundos), que é o
+atraso máximo para uma revogação feita por outro processo valer; escritas de
+papéis feitas por este processo limpam o cache na hora.
+"""
+import threading
+import time
+from typing import Any
+
+from flask import Flask, current_app, g, session
+from psycopg2 import Error as DatabaseError
+
+from app.services.database import executor as sql_queries
+
+ROLE_BITS = {"admin": 1, "staff": 2, "internal": 4, "external": 8}
+
+# Assets que alteram papéis (triggers recalculam PAPEIS)
+ROLE_WRITE_ASSETS = frozenset({
+    "queries/admin/atualizar_pessoa.sql",
+    "queries/admin/adicionar_interno.sql",
+    "queries/admin/remover_interno.sql",
+    "queries/admin/adicionar_funcionario.sql",
+    "queries/admin/remover_funcionario.sql",
+    "queries/admin/adicionar_educador.sql",
+    "queries/admin/remover_educador.sql",
+    "queries/admin/adicionar_atribuicao.sql",
+    "queries/admin/remover_todas_atribuicoes.sql",
+    "queries/admin/deletar_pessoa.sql",
+})
+
+
+def roles_from_bits(bits: int) -> dict[str, bool]:
+    """Converte o bitmap no formato de ``profile_access``."""
+    return {role: True for role, bit in ROLE_BITS.items() if bits & bit}
+
+
+class RoleCache:
+    """Papéis atuais por CPF, válidos por ``ttl`` segundos."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[dict[str, bool], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cpf: str) -> dict[str, bool] | None:
+        """Papéis atuais do CPF, ou None se o banco não estiver disponível."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cpf)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        db_session = g.get("db_session")
+        if db_session is None:
+            return None
+        try:
+            row = sql_queries.fetch_one("queries/auth/get_user_role_bits.sql", {"cpf": cpf})
+        except DatabaseError as exc:
+            # Não derrubar a requisição por causa da revalidação
+            db_session.connection.rollback()
+            current_app.logger.warning("Falha ao revalidar papéis de %s: %s", cpf, exc)
+            return None
+        # Conta removida: nenhum papel
+        roles = roles_from_bits(row["papeis"]) if row else {}
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[cpf] = (roles, time.monotonic() + self.ttl)
+        return roles
+
+    def invalidate(self, cpf: str | None = None) -> None:
+        with self._lock:
+            if cpf is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(cpf, None)
+
+    def invalidate_for_asset(self, relative_path: str) -> None:
+        if relative_path in ROLE_WRITE_ASSETS:
+            self.invalidate()
+
+
+def get_role_cache(app: Flask) -> RoleCache:
+    cache = app.extensions.get("role_cache")
+    if cache is None:
+        cache = RoleCache(ttl=app.config.get("ROLE_CACHE_TTL", 30.0))
+        app.extensions["role_cache"] = cache
+    return cache
+
+
+def current_profile_access() -> dict[str, Any]:
+    """``profile_access`` da sessão, revalidado contra os papéis atuais.
+
+    Se os papéis mudaram desde o login a sessão é atualizada; sem banco
+    disponível vale o que está na sessão.
+    """
+    profile_access = session.get("profile_access", {})
+    cpf = session.get("user_id")
+    if not cpf:
+        return profile_access
+
+    roles = get_role_cache(current_app).get(cpf)
+    if roles is None:
+        return profile_access
+    if roles != profile_access:
+        session["profile_access"] = roles
+    return roles
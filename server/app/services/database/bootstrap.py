@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 
 from flask import current_app
@@ -12,19 +13,56 @@ SQL_ROOT = PROJECT_ROOT / "sql"
 SCHEMA_FILE = SQL_ROOT / "upgrade_schema.sql"
 FUNCTIONS_DIR = SQL_ROOT / "functions"
 TRIGGERS_FILE = FUNCTIONS_DIR / "common_triggers.sql"
+REPORT_SUMMARIES_FILE = FUNCTIONS_DIR / "report_summaries.sql"
 INDEXES_FILE = SQL_ROOT / "indexes.sql"
 VIEWS_FILE = SQL_ROOT / "views.sql"
 
 _schema_ready = False
+_bootstrap_lock = threading.Lock()
 
 
-def ensure_schema_populated(db_session) -> None:
+def is_schema_verified() -> bool:
+    """Indica se o schema já foi verificado/aplicado neste processo."""
+    return _schema_ready
+
+
+def mark_schema_verified() -> None:
+    """Marca o schema como verificado sem consultar o catálogo.
+
+    Usado quando o bootstrap já rodou na inicialização (entrypoint ou
+    ``flask bootstrap-db``) antes de o processo começar a atender requisições.
+    """
+    global _schema_ready
+    _schema_ready = True
+
+
+def invalidate_schema_cache() -> None:
+    """Força uma nova verificação do schema na próxima requisição."""
+    global _schema_ready
+    _schema_ready = False
+
+
+def ensure_schema_populated(db_session, *, force: bool = False) -> None:
     global _schema_ready
 
-    current_app.logger.info("ensure_schema_populated chamado")
+    # Caminho rápido: depois de verificado, nenhuma consulta ao catálogo
+    if _schema_ready and not force:
+        return
+
+    with _bootstrap_lock:
+        if _schema_ready and not force:
+            return
+        if force:
+            _schema_ready = False
+        _bootstrap_schema(db_session)
+
+
+def _bootstrap_schema(db_session) -> None:
+    global _schema_ready
 
-    # Sempre verificar se o schema existe, mesmo se _schema_ready for True
-    # Isso garante que se o banco foi limpo, o schema será recriado
+    current_app.logger.info("Verificando schema do banco de dados...")
+
+    # Uma verificação por processo (ou após invalidate_schema_cache), nunca por requisição
     try:
         table_count = _count_tables(db_session)
         current_app.logger.info(f"Contagem de tabelas: {table_count}")
@@ -217,6 +255,14 @@ def _apply_plpgsql_assets(db_session) -> None:
         except Exception as e:
             current_app.logger.error(f"Erro ao aplicar triggers: {e}")
 
+    # Tabelas de resumo dos relatórios (mantidas por triggers)
+    if REPORT_SUMMARIES_FILE.exists():
+        current_app.logger.info("Applying report summaries from %s", REPORT_SUMMARIES_FILE)
+        try:
+            db_session.run_sql_file(str(REPORT_SUMMARIES_FILE))
+        except Exception as e:
+            current_app.logger.error(f"Erro ao aplicar tabelas de resumo: {e}")
+
 
 def _apply_indexes_and_views(db_session) -> None:
     """Aplica índices e views SQL ao banco de dados."""
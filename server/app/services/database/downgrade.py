@@ -28,6 +28,7 @@ def _table_exists(dbsession: DBSession, table_name: str) -> bool:
 def downgrade_database(dbsession: DBSession):
     """Remove todos os dados do banco (mantém o schema)."""
     tables = [
+        'populacao_etapa', 'populacao_execucao',
         'solicitacao_cadastro', 'metrica_acesso_diaria', 'auditoria_login',
         'atividade_grupo_extensao', 'grupo_extensao', 'supervisao_evento', 'evento',
         'participacao_atividade', 'conduz_atividade', 'ocorrencia_semanal', 'atividade',
@@ -1,41 +1,67 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time
+import uuid
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Iterator, Mapping
 
 from flask import current_app, g
-from psycopg2.extras import RealDictCursor
+from psycopg2 import extensions as pg_extensions
 
 
 DEFAULT_SQL_ROOT = Path(__file__).resolve().parents[3] / "sql"
+DEFAULT_STREAM_ITERSIZE = 2000
+
+
+# timestamptz[] não tem typecaster nomeado em psycopg2.extensions
+_TIMESTAMPTZ_ARRAY_OIDS = (1185,)
 
 
 class SQLExecutionError(RuntimeError):
     """Raised when a SQL asset cannot be executed."""
 
 
-def _make_json_serializable(obj: Any) -> Any:
-    """Convert non-JSON-serializable objects to strings."""
-    from flask import current_app
-
-    if isinstance(obj, (time, date, datetime)):
-        return obj.isoformat()
-    if isinstance(obj, dict):
-        return {k: _make_json_serializable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_make_json_serializable(item) for item in obj]
-    # Handle psycopg2 array types and other sequence-like objects
-    try:
-        if hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
-            current_app.logger.debug(f"[_make_json_serializable] Convertendo objeto iterável: {type(obj)}")
-            result = [_make_json_serializable(item) for item in obj]
-            current_app.logger.debug(f"[_make_json_serializable] Convertido para lista com {len(result)} itens")
-            return result
-    except (TypeError, ValueError) as e:
-        current_app.logger.warning(f"[_make_json_serializable] Erro ao converter objeto iterável {type(obj)}: {e}")
-        pass
-    return obj
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+def _isoformat_array(values: Any) -> Any:
+    if values is None:
+        return None
+    return [_isoformat_array(item) if isinstance(item, list) else _isoformat(item) for item in values]
+
+
+# Conversores por OID do tipo da coluna: só colunas de data/hora passam por Python,
+# o resto vai do cursor para o JSON sem percorrer os valores
+_COLUMN_ENCODERS = {
+    **dict.fromkeys(pg_extensions.PYDATE.values, _isoformat),
+    **dict.fromkeys(pg_extensions.PYTIME.values, _isoformat),
+    **dict.fromkeys(pg_extensions.PYDATETIME.values, _isoformat),
+    **dict.fromkeys(pg_extensions.PYDATETIMETZ.values, _isoformat),
+    **dict.fromkeys(pg_extensions.DATEARRAY.values, _isoformat_array),
+    **dict.fromkeys(pg_extensions.TIMEARRAY.values, _isoformat_array),
+    **dict.fromkeys(pg_extensions.DATETIMEARRAY.values, _isoformat_array),
+    **dict.fromkeys(_TIMESTAMPTZ_ARRAY_OIDS, _isoformat_array),
+}
+
+
+def _row_encoder(description) -> Callable[[tuple], dict[str, Any]]:
+    """Monta, a partir do cursor.description, a função que converte uma linha em dict."""
+    columns = [column.name for column in description]
+    encoders = [
+        (index, _COLUMN_ENCODERS[column.type_code])
+        for index, column in enumerate(description)
+        if column.type_code in _COLUMN_ENCODERS
+    ]
+    if not encoders:
+        return lambda row: dict(zip(columns, row))
+
+    def encode(row: tuple) -> dict[str, Any]:
+        values = list(row)
+        for index, encoder in encoders:
+            values[index] = encoder(values[index])
+        return dict(zip(columns, values))
+
+    return encode
 
 
 def _get_sql_root() -> Path:
@@ -45,7 +71,12 @@ def _get_sql_root() -> Path:
     return DEFAULT_SQL_ROOT
 
 
-def _load_sql(relative_path: str) -> str:
+def load_sql(relative_path: str) -> str:
+    """Texto do asset SQL (do registro em memória, se houver, ou do disco)."""
+    registry = current_app.extensions.get("sql_registry")
+    if registry is not None:
+        return registry.get(relative_path)
+
     sql_root = _get_sql_root()
     sql_path = sql_root / relative_path
     if not sql_path.exists():
@@ -54,6 +85,21 @@ def _load_sql(relative_path: str) -> str:
     return sql_path.read_text(encoding="utf-8")
 
 
+def add_write_listener(app, listener: Callable[[str], None]) -> None:
+    """Registra um callback chamado com o caminho do asset após cada ``execute_statement``."""
+    app.extensions.setdefault("sql_write_listeners", []).append(listener)
+
+
+def _execute(cursor, relative_path: str, query: str, params: Mapping[str, Any] | None) -> None:
+    prepared = current_app.extensions.get("sql_prepared")
+    if prepared is not None and prepared.execute(cursor, relative_path, query, params):
+        return
+    if params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
 def _get_connection():
     db_session = g.get("db_session")
     if db_session is None:
@@ -69,88 +115,84 @@ def fetch_all(
     if connection is None:
         return []
 
-    query = _load_sql(relative_path)
-    with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        results = cursor.fetchall()
-        # Convert to list of dicts and make JSON serializable
-        return [_make_json_serializable(dict(row)) for row in results]
+    query = load_sql(relative_path)
+    with connection.cursor() as cursor:
+        _execute(cursor, relative_path, query, params)
+        if cursor.description is None:
+            return []
+        encode = _row_encoder(cursor.description)
+        return [encode(row) for row in cursor.fetchall()]
 
 
 def fetch_one(
     relative_path: str,
     params: Mapping[str, Any] | None = None,
 ) -> dict[str, Any] | None:
-    from flask import current_app
-
     connection = _get_connection()
     if connection is None:
         current_app.logger.warning("[fetch_one] Conexão com banco não disponível")
         return None
 
-    query = _load_sql(relative_path)
-    current_app.logger.debug(f"[fetch_one] Executando query: {relative_path} com params: {params}")
-    current_app.logger.debug(f"[fetch_one] Tipo de params: {type(params)}")
+    query = load_sql(relative_path)
+    current_app.logger.debug("[fetch_one] Executando query: %s", relative_path)
 
-    # Preparar parâmetros - usar None se não houver params, ou dict se houver
     execute_params = params if params else None
     if execute_params is not None and not isinstance(execute_params, dict):
-        current_app.logger.warning(f"[fetch_one] Params não é dict, convertendo. Tipo: {type(execute_params)}")
         execute_params = dict(execute_params) if hasattr(execute_params, 'items') else {}
 
-    current_app.logger.debug(f"[fetch_one] Execute params final: {execute_params}")
-
-    with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-        if execute_params:
-            cursor.execute(query, execute_params)
-        else:
-            cursor.execute(query)
+    with connection.cursor() as cursor:
+        _execute(cursor, relative_path, query, execute_params)
+        if cursor.description is None:
+            return None
         result = cursor.fetchone()
-
         if result is None:
-            current_app.logger.debug(f"[fetch_one] Nenhum resultado encontrado para query: {relative_path}")
             return None
+        return _row_encoder(cursor.description)(result)
 
-        current_app.logger.debug(f"[fetch_one] Tipo do result: {type(result)}")
-        current_app.logger.debug(f"[fetch_one] Result keys: {list(result.keys()) if hasattr(result, 'keys') else 'N/A'}")
 
-        # RealDictRow is already dict-like, but convert to regular dict
-        # to ensure proper serialization of arrays and other types
-        try:
-            result_dict = dict(result)
-            current_app.logger.debug(f"[fetch_one] Result dict criado com sucesso, keys: {list(result_dict.keys())}")
+def execute_statement(
+    relative_path: str,
+    params: Mapping[str, Any] | None = None,
+) -> None:
+    connection = _get_connection()
+    if connection is None:
+        return
 
-            # Log valores especiais antes da serialização
-            for key, value in result_dict.items():
-                if not isinstance(value, (str, int, float, bool, type(None))):
-                    current_app.logger.debug(f"[fetch_one] Key '{key}' tem tipo especial: {type(value)}, valor: {value}")
+    query = load_sql(relative_path)
+    with connection.cursor() as cursor:
+        _execute(cursor, relative_path, query, params)
+    connection.commit()
 
-            # Make JSON serializable
-            serialized = _make_json_serializable(result_dict)
-            current_app.logger.debug(f"[fetch_one] Result serializado com sucesso")
-            return serialized
-        except Exception as e:
-            current_app.logger.error(f"[fetch_one] Erro ao processar result: {e}")
-            import traceback
-            current_app.logger.error(f"[fetch_one] Traceback: {traceback.format_exc()}")
-            raise
+    for listener in current_app.extensions.get("sql_write_listeners", ()):
+        listener(relative_path)
 
 
-def execute_statement(
+def iter_rows(
     relative_path: str,
     params: Mapping[str, Any] | None = None,
-) -> None:
+    *,
+    itersize: int = DEFAULT_STREAM_ITERSIZE,
+) -> Iterator[dict[str, Any]]:
+    """Itera sobre o resultado com um cursor nomeado (server-side).
+
+    Só ``itersize`` linhas ficam em memória por vez, independente do tamanho
+    do resultado. Deve ser consumido dentro do contexto da requisição
+    (``stream_with_context``), pois usa a conexão de ``g.db_session``.
+    """
     connection = _get_connection()
     if connection is None:
         return
 
-    query = _load_sql(relative_path)
-    with connection.cursor() as cursor:
+    query = load_sql(relative_path)
+    with connection.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+        cursor.itersize = itersize
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
-    connection.commit()
+        encode = None
+        for row in cursor:
+            if encode is None:
+                # Em cursores nomeados a description só existe após o primeiro FETCH
+                encode = _row_encoder(cursor.description)
+            yield encode(row)
@@ -0,0 +1,182 @@
+"""
+Checagem de regressão de planos dos assets SQL mais usados.
+
+Cada entrada de ``PLAN_CHECKS`` diz quais tabelas o asset nunca deve varrer por
+inteiro (Seq Scan) e como obter parâmetros reais do banco. O plano é obtido com
+``EXPLAIN (FORMAT JSON)`` sem executar a consulta. Tabelas com menos de
+``min_rows`` linhas estimadas são ignoradas, porque nelas o Seq Scan é a
+escolha certa do planner; rode sobre uma base populada em escala
+(``populate_db``) para que a checagem tenha efeito.
+
+Uso: ``flask check-query-plans [--min-rows N] [--analyze]`` (sai com código 1
+se houver regressão). ``tests/test_query_plans.py`` roda a mesma checagem
+sobre uma base populada com semente e escala fixas.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping
+
+from psycopg2.extras import RealDictCursor
+
+from app.database import DBSession
+from app.services.database.executor import load_sql
+
+DEFAULT_MIN_ROWS = 10_000
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    asset: str
+    # Tabelas que não podem aparecer em Seq Scan no plano do asset
+    tables: tuple[str, ...]
+    # Consulta que devolve uma linha com os parâmetros do asset (valores reais)
+    sample: str | None = None
+    # Parâmetros fixos, sobrescritos pelos da amostra
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+PLAN_CHECKS: tuple[PlanCheck, ...] = (
+    PlanCheck(
+        "queries/internal/convites_por_interno.sql",
+        ("convite_externo",),
+        "SELECT cpf_convidante FROM convite_externo LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/internal/verificar_convite_externo.sql",
+        ("convite_externo",),
+        "SELECT id_convite, cpf_convidante FROM convite_externo LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/external/get_invite_by_token.sql",
+        ("convite_externo",),
+        "SELECT token FROM convite_externo LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/external/get_invite_participation.sql",
+        ("convite_externo", "participacao_atividade"),
+        "SELECT id_convite AS invite_id FROM convite_externo WHERE id_atividade IS NOT NULL LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/staff/listar_participantes_atividade.sql",
+        ("participacao_atividade",),
+        "SELECT id_atividade FROM participacao_atividade LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/internal/atividades_inscritas.sql",
+        ("participacao_atividade",),
+        "SELECT cpf_participante FROM participacao_atividade LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/internal/reservas_equipamentos_por_interno.sql",
+        ("reserva_equipamento",),
+        "SELECT cpf_responsavel_interno AS cpf FROM reserva_equipamento LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/staff/listar_reservas_instalacoes.sql",
+        ("reserva",),
+        params={
+            "data_inicio": None,
+            "data_fim": None,
+            "id_instalacao": None,
+            "cpf_responsavel": None,
+            "after_data_reserva": None,
+            "after_horario_inicio": None,
+            "after_id_reserva": None,
+            "limit": 51,
+        },
+    ),
+    PlanCheck(
+        "queries/admin/upcoming_reservations.sql",
+        ("reserva",),
+    ),
+    PlanCheck(
+        "queries/admin/listar_usuarios.sql",
+        ("pessoa",),
+        params={"after_nome": None, "after_cpf": None, "limit": 51},
+    ),
+    PlanCheck(
+        "queries/auth/list_pending_registrations.sql",
+        ("solicitacao_cadastro",),
+    ),
+    PlanCheck(
+        "queries/auth/check_registration_request_exists.sql",
+        ("solicitacao_cadastro",),
+        "SELECT cpf_pessoa, nusp FROM solicitacao_cadastro LIMIT 1",
+    ),
+    PlanCheck(
+        "queries/search/buscar.sql",
+        ("pessoa", "atividade"),
+        "SELECT split_part(nome, ' ', 1) AS q, split_part(nome, ' ', 1) AS q_like FROM pessoa LIMIT 1",
+        params={"types": ["pessoa", "atividade", "grupo_extensao"], "limit": 20},
+    ),
+)
+
+
+def _seq_scans(plan: Mapping[str, Any]) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from _seq_scans(child)
+
+
+def _table_sizes(db_session: DBSession, tables: set[str]) -> dict[str, float]:
+    rows = db_session.fetch_all(
+        """
+        SELECT c.relname, c.reltuples
+        FROM pg_class c
+        WHERE c.relkind = 'r'
+          AND c.relname = ANY(%(tables)s)
+          AND pg_table_is_visible(c.oid)
+        """,
+        {"tables": sorted(tables)},
+    )
+    return {row["relname"]: max(float(row["reltuples"]), 0.0) for row in rows}
+
+
+def _explain(db_session: DBSession, check: PlanCheck) -> dict[str, Any]:
+    params = dict(check.params)
+    with db_session.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        if check.sample:
+            cursor.execute(check.sample)
+            sample = cursor.fetchone()
+            if sample:
+                params.update(sample)
+        cursor.execute("EXPLAIN (FORMAT JSON) " + load_sql(check.asset), params)
+        return cursor.fetchone()["QUERY PLAN"][0]["Plan"]
+
+
+def check_query_plans(
+    db_session: DBSession,
+    min_rows: int = DEFAULT_MIN_ROWS,
+    analyze: bool = False,
+) -> list[dict[str, Any]]:
+    """Retorna um resultado por asset: ``status`` ok, regressao, ignorado ou erro."""
+    tables = {table for check in PLAN_CHECKS for table in check.tables}
+    if analyze:
+        with db_session.connection.cursor() as cursor:
+            for table in sorted(tables):
+                cursor.execute(f"ANALYZE {table}")
+        db_session.connection.commit()
+    sizes = _table_sizes(db_session, tables)
+
+    results: list[dict[str, Any]] = []
+    for check in PLAN_CHECKS:
+        large = [table for table in check.tables if sizes.get(table, 0) >= min_rows]
+        if not large:
+            results.append({"asset": check.asset, "status": "ignorado", "tables": []})
+            continue
+        try:
+            plan = _explain(db_session, check)
+        except Exception as exc:
+            results.append({"asset": check.asset, "status": "erro", "message": str(exc)})
+            continue
+        finally:
+            # EXPLAIN não escreve nada; não deixar transação aberta entre assets
+            db_session.connection.rollback()
+        scanned = sorted(set(_seq_scans(plan)) & set(large))
+        results.append({
+            "asset": check.asset,
+            "status": "regressao" if scanned else "ok",
+            "tables": scanned,
+            "cost": plan.get("Total Cost"),
+        })
+    return results
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+import psycopg2
+from flask import current_app
+
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s")
+
+
+@dataclass(frozen=True)
+class PreparedAsset:
+    """Asset convertido para ``PREPARE``: placeholders nomeados viram ``$n``."""
+
+    name: str
+    statement: str
+    param_names: tuple[str, ...]
+
+    @property
+    def execute_sql(self) -> str:
+        if not self.param_names:
+            return f"EXECUTE {self.name}"
+        args = ", ".join(f"%({param})s" for param in self.param_names)
+        return f"EXECUTE {self.name} ({args})"
+
+
+def compile_asset(relative_path: str, query: str) -> PreparedAsset:
+    """Converte ``%(nome)s`` em parâmetros posicionais, ignorando comentários e literais."""
+    param_names: list[str] = []
+    positions: dict[str, int] = {}
+    out: list[str] = []
+    i = 0
+    length = len(query)
+    while i < length:
+        char = query[i]
+        if char == "-" and query.startswith("--", i):
+            # Comentários de linha podem citar placeholders (documentação dos parâmetros)
+            end = query.find("\n", i)
+            i = length if end == -1 else end
+            continue
+        if char == "'":
+            end = i + 1
+            while end < length:
+                if query[end] == "'":
+                    if end + 1 < length and query[end + 1] == "'":
+                        end += 2
+                        continue
+                    break
+                end += 1
+            out.append(query[i:end + 1])
+            i = end + 1
+            continue
+        if char == "%":
+            if query.startswith("%%", i):
+                out.append("%")
+                i += 2
+                continue
+            match = _PLACEHOLDER.match(query, i)
+            if match:
+                param = match.group(1)
+                if param not in positions:
+                    param_names.append(param)
+                    positions[param] = len(param_names)
+                out.append(f"${positions[param]}")
+                i = match.end()
+                continue
+        out.append(char)
+        i += 1
+
+    statement = "".join(out).strip().rstrip(";").strip()
+    stem = re.sub(r"\W+", "_", relative_path.removesuffix(".sql"))[-40:].strip("_")
+    digest = hashlib.sha1(statement.encode("utf-8")).hexdigest()[:10]
+    return PreparedAsset(
+        name=f"ps_{stem}_{digest}".lower(),
+        statement=statement,
+        param_names=tuple(param_names),
+    )
+
+
+class PreparedStatementCache:
+    """Executa assets registrados via ``PREPARE``/``EXECUTE``.
+
+    Cada conexão física (normalmente vinda do pool) recebe o ``PREPARE`` uma
+    única vez. Se o ``PREPARE`` falhar (por exemplo, tipo de parâmetro que o
+    Postgres não consegue inferir) o asset é desativado e passa a ser executado
+    como texto puro.
+    """
+
+    def __init__(self, assets: Iterable[str]):
+        self.assets = frozenset(assets)
+        self._compiled: dict[str, PreparedAsset] = {}
+        self._compiled_from: dict[str, str] = {}
+        self._disabled: set[str] = set()
+        self._prepared: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def is_enabled(self, relative_path: str) -> bool:
+        return relative_path in self.assets and relative_path not in self._disabled
+
+    def disable(self, relative_path: str) -> None:
+        self._disabled.add(relative_path)
+
+    def execute(
+        self,
+        cursor,
+        relative_path: str,
+        query: str,
+        params: Mapping[str, Any] | None,
+    ) -> bool:
+        """Executa o asset preparado; retorna False quando deve cair no modo texto."""
+        if not self.is_enabled(relative_path):
+            return False
+
+        asset = self._compile(relative_path, query)
+        connection = cursor.connection
+        with self._lock:
+            prepared = self._prepared.setdefault(connection, set())
+
+        if asset.name not in prepared:
+            if not self._prepare(cursor, relative_path, asset):
+                return False
+            prepared.add(asset.name)
+
+        cursor.execute(asset.execute_sql, params or {})
+        return True
+
+    def _compile(self, relative_path: str, query: str) -> PreparedAsset:
+        asset = self._compiled.get(relative_path)
+        # Com hot reload o texto pode mudar; o nome inclui o hash do statement
+        if asset is None or self._compiled_from.get(relative_path) != query:
+            asset = compile_asset(relative_path, query)
+            with self._lock:
+                self._compiled[relative_path] = asset
+                self._compiled_from[relative_path] = query
+        return asset
+
+    def _prepare(self, cursor, relative_path: str, asset: PreparedAsset) -> bool:
+        # Savepoint para que uma falha no PREPARE não aborte a transação da requisição
+        cursor.execute("SAVEPOINT prepare_asset")
+        try:
+            cursor.execute(f"PREPARE {asset.name} AS {asset.statement}")
+        except psycopg2.Error as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT prepare_asset")
+            cursor.execute("RELEASE SAVEPOINT prepare_asset")
+            current_app.logger.warning(
+                "PREPARE falhou para %s, usando execução simples: %s", relative_path, exc
+            )
+            self.disable(relative_path)
+            return False
+        cursor.execute("RELEASE SAVEPOINT prepare_asset")
+        return True
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from app.services.database.executor import SQLExecutionError
+
+
+ASSET_DIRS = ("queries",)
+_ASSET_REFERENCE = re.compile(r"[\"']((?:%s)/[\w/]+\.sql)[\"']" % "|".join(ASSET_DIRS))
+
+
+class SQLAssetRegistry:
+    """Assets SQL carregados uma única vez, indexados pelo caminho relativo.
+
+    Com ``hot_reload`` habilitado (modo debug) o arquivo é relido quando o
+    mtime muda, permitindo editar queries sem reiniciar o servidor.
+    """
+
+    def __init__(self, root: Path, *, hot_reload: bool = False):
+        self.root = Path(root)
+        self.hot_reload = hot_reload
+        self._assets: dict[str, str] = {}
+        self._mtimes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Lê e valida todos os arquivos ``.sql`` dos diretórios de assets."""
+        assets: dict[str, str] = {}
+        mtimes: dict[str, float] = {}
+        empty: list[str] = []
+        for directory in ASSET_DIRS:
+            base = self.root / directory
+            if not base.is_dir():
+                raise SQLExecutionError(f"SQL asset directory not found: {base}")
+            for sql_path in sorted(base.rglob("*.sql")):
+                relative_path = sql_path.relative_to(self.root).as_posix()
+                text = sql_path.read_text(encoding="utf-8")
+                if not text.strip():
+                    empty.append(relative_path)
+                assets[relative_path] = text
+                mtimes[relative_path] = sql_path.stat().st_mtime
+
+        if empty:
+            raise SQLExecutionError(f"Empty SQL assets: {', '.join(empty)}")
+
+        with self._lock:
+            self._assets = assets
+            self._mtimes = mtimes
+
+    def require(self, relative_paths: Iterable[str]) -> None:
+        """Falha se algum asset referenciado pelo código não foi carregado."""
+        missing = sorted(path for path in set(relative_paths) if path not in self._assets)
+        if missing:
+            raise SQLExecutionError(f"SQL assets not found under {self.root}: {', '.join(missing)}")
+
+    def get(self, relative_path: str) -> str:
+        if self.hot_reload:
+            return self._reload_if_changed(relative_path)
+        try:
+            return self._assets[relative_path]
+        except KeyError:
+            raise SQLExecutionError(f"SQL asset not found: {self.root / relative_path}") from None
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self._assets
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def _reload_if_changed(self, relative_path: str) -> str:
+        sql_path = self.root / relative_path
+        try:
+            mtime = sql_path.stat().st_mtime
+        except FileNotFoundError:
+            raise SQLExecutionError(f"SQL asset not found: {sql_path}") from None
+
+        with self._lock:
+            if self._mtimes.get(relative_path) != mtime:
+                self._assets[relative_path] = sql_path.read_text(encoding="utf-8")
+                self._mtimes[relative_path] = mtime
+            return self._assets[relative_path]
+
+
+def collect_asset_references(source_root: Path) -> set[str]:
+    """Encontra os caminhos de assets SQL citados literalmente no código Python."""
+    references: set[str] = set()
+    for source_path in Path(source_root).rglob("*.py"):
+        references.update(_ASSET_REFERENCE.findall(source_path.read_text(encoding="utf-8")))
+    return references
@@ -0,0 +1,46 @@
+"""
+Inscrições em lote em atividades.
+
+Os assets chamam funções PL/pgSQL que travam a(s) linha(s) de ``atividade``,
+calculam as vagas uma única vez e inserem todas as inscrições num único
+``INSERT``. Aqui só são feitos o commit e o resumo por item.
+"""
+from typing import Any, Mapping
+
+from flask import g
+
+from app.services.database import executor as sql_queries
+from app.services.reports import invalidate_reports
+
+MAX_BATCH_ENROLLMENTS = 500
+
+ENROLLMENT_MESSAGES = {
+    "inscrito": "Inscrição realizada com sucesso",
+    "ja_inscrito": "Já inscrito nesta atividade",
+    "sem_vagas": "As vagas para esta atividade estão esgotadas",
+    "pessoa_inexistente": "O CPF informado não está cadastrado",
+    "atividade_inexistente": "A atividade informada não existe",
+    "duplicado": "Item repetido no lote",
+}
+
+
+def enroll_batch(relative_path: str, params: Mapping[str, Any]) -> dict[str, Any]:
+    """Executa o asset de inscrição em lote e grava o resultado numa única transação.
+
+    Retorna ``enrolled`` (quantidade de inscrições novas) e ``results`` (um
+    item por entrada pedida, na ordem recebida, com ``resultado`` e ``message``).
+    """
+    rows = sql_queries.fetch_all(relative_path, params)
+    enrolled = sum(1 for row in rows if row["resultado"] == "inscrito")
+
+    db_session = g.get("db_session")
+    if db_session is not None:
+        if enrolled:
+            db_session.connection.commit()
+            invalidate_reports({"participacao_atividade"})
+        else:
+            db_session.connection.rollback()
+
+    for row in rows:
+        row["message"] = ENROLLMENT_MESSAGES.get(row["resultado"], row["resultado"])
+    return {"enrolled": enrolled, "results": rows}
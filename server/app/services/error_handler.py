@@ -1,5 +1,14 @@
 import re
-from typing import Optional
+from typing import Any, Optional
+
+# Constraints que indicam reserva sobreposta -> recurso reservado
+RESERVATION_CONFLICT_CONSTRAINTS = {
+    "ex_reserva_sobreposicao": "instalacao",
+    "un_reserva": "instalacao",
+    "ex_reserva_equip_sobreposicao": "equipamento",
+}
+
+_CONFLICT_DETAIL = re.compile(r"(\w+)=([^;]*)")
 
 
 def simplify_database_error(error_message: str) -> str:
@@ -56,6 +65,10 @@ def simplify_database_error(error_message: str) -> str:
             return f"O campo {field} é obrigatório"
         return "Um campo obrigatório não foi preenchido"
 
+    # Reservation conflicts (exclusion constraints em reserva/reserva_equipamento)
+    if "conflito de reserva" in error_lower or "exclusion constraint" in error_lower:
+        return "Já existe uma reserva nesse horário"
+
     # Check constraint violations
     if "check constraint" in error_lower:
         return "Os dados informados não atendem às regras de validação"
@@ -82,3 +95,28 @@ def simplify_database_error(error_message: str) -> str:
             cleaned = cleaned[:197] + "..."
 
     return cleaned if cleaned else "Erro ao processar a operação"
+
+
+def reservation_conflict(error: BaseException) -> Optional[dict[str, Any]]:
+    """
+    Extrai os dados estruturados de um conflito de reserva.
+
+    Args:
+        error: Exceção levantada pelo psycopg2 ao reservar
+
+    Returns:
+        Dicionário com recurso, constraint e reserva conflitante (quando
+        disponível), ou None se o erro não for um conflito de reserva
+    """
+    diag = getattr(error, "diag", None)
+    constraint = getattr(diag, "constraint_name", None)
+    resource = RESERVATION_CONFLICT_CONSTRAINTS.get((constraint or "").lower())
+    if resource is None:
+        return None
+
+    conflict: dict[str, Any] = {"resource": resource, "constraint": constraint}
+    detail = getattr(diag, "message_detail", None) or ""
+    # DETAIL gerado pelos procedures: id_reserva=...;data=...;horario_inicio=...;horario_fim=...
+    for key, value in _CONFLICT_DETAIL.findall(detail):
+        conflict[key] = int(value) if key == "id_reserva" and value.isdigit() else value
+    return conflict
@@ -0,0 +1,76 @@
+"""
+Exportação em streaming (NDJSON/CSV) de assets SQL.
+
+As linhas vêm de um cursor server-side (``executor.iter_rows``) e são escritas
+na resposta em blocos, então o uso de memória do worker fica constante
+independente do número de linhas exportadas.
+"""
+import csv
+import io
+import json
+from typing import Any, Iterable, Iterator, Mapping
+
+from flask import Response, stream_with_context
+
+from app.services.database import executor as sql_queries
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+CHUNK_ROWS = 500
+
+
+class ExportFormatError(ValueError):
+    """Formato de exportação não suportado."""
+
+
+def _ndjson_chunks(rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    buffer: list[str] = []
+    for row in rows:
+        buffer.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(buffer) >= CHUNK_ROWS:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def _csv_chunks(rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    output = io.StringIO()
+    writer = None
+    pending = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(output, fieldnames=list(row.keys()))
+            writer.writeheader()
+        writer.writerow(row)
+        pending += 1
+        if pending >= CHUNK_ROWS:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+    if output.tell():
+        yield output.getvalue()
+
+
+def export_response(
+    relative_path: str,
+    export_format: str,
+    filename: str,
+    params: Mapping[str, Any] | None = None,
+) -> Response:
+    """Resposta em streaming com o resultado completo do asset no formato pedido."""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportFormatError(
+            f"Formato de exportação inválido: {export_format}. Use: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    rows = sql_queries.iter_rows(relative_path, params)
+    chunks = _ndjson_chunks(rows) if export_format == "ndjson" else _csv_chunks(rows)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
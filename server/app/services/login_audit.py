@@ -0,0 +1,196 @@
+"""
+Gravação assíncrona e em lote da auditoria de login (AUDITORIA_LOGIN).
+
+Com ``LOGIN_AUDIT_ASYNC`` ativo, ``authenticate_user`` é chamada com
+``write_audit = FALSE``: contadores de tentativas e bloqueio continuam sendo
+atualizados na transação do login, mas a linha de auditoria volta no JSON e é
+entregue a uma fila em memória. Uma thread por processo grava a fila em lotes
+(um único ``INSERT ... VALUES`` com várias linhas) a cada
+``LOGIN_AUDIT_FLUSH_INTERVAL`` segundos ou ``LOGIN_AUDIT_BATCH_SIZE`` eventos.
+
+A fila é limitada (``LOGIN_AUDIT_QUEUE_SIZE``): cheia, o evento é gravado de
+forma síncrona na própria requisição, então nada é descartado por pressão.
+O que estiver na fila é gravado no encerramento do processo (``atexit``).
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any, Mapping
+
+from flask import Flask, current_app, g
+from psycopg2.extras import execute_values
+
+from app.database import DBSession
+from app.services.database import executor as sql_queries
+from app.services.database.executor import load_sql
+
+AUDIT_COLUMNS = ("cpf", "timestamp_evento", "email_usuario", "ip_origem", "status", "mensagem")
+INSERT_AUDIT_ASSET = "queries/auth/insert_login_audit.sql"
+# Tentativas de gravar um lote antes de desistir dele (banco indisponível)
+FLUSH_ATTEMPTS = 3
+
+
+def _audit_row(event: Mapping[str, Any]) -> tuple:
+    return tuple(event.get(column) for column in AUDIT_COLUMNS)
+
+
+class LoginAuditWriter:
+    """Fila limitada de eventos de login gravada em lotes por uma thread."""
+
+    def __init__(self, app: Flask, max_queue: int, batch_size: int, flush_interval: float):
+        self.app = app
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[tuple] = queue.Queue(maxsize=max(max_queue, 1))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._written = 0
+        self._batches = 0
+        self._sync_fallbacks = 0
+        self._dropped = 0
+
+    def submit(self, event: Mapping[str, Any]) -> bool:
+        """Enfileira o evento; retorna False se a fila estiver cheia ou encerrada."""
+        if self._stop.is_set():
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(_audit_row(event))
+        except queue.Full:
+            with self._lock:
+                self._sync_fallbacks += 1
+            return False
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Para a thread e grava o que restou na fila."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        # Thread não iniciada (ou travada): gravar o restante daqui mesmo
+        self._flush(self._drain())
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "written": self._written,
+                "batches": self._batches,
+                "sync_fallbacks": self._sync_fallbacks,
+                "dropped": self._dropped,
+            }
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            # Processos filhos (fork) não herdam a thread: iniciar uma por processo
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name="login-audit-writer", daemon=True)
+            self._thread.start()
+
+    def _drain(self) -> list[tuple]:
+        rows: list[tuple] = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch: list[tuple] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, rows: list[tuple]) -> None:
+        from app.extensions import get_db_pool
+
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            for attempt in range(1, FLUSH_ATTEMPTS + 1):
+                try:
+                    with self.app.app_context():
+                        with DBSession(pool=get_db_pool(self.app)) as db_session:
+                            with db_session.connection.cursor() as cursor:
+                                execute_values(cursor, load_sql(INSERT_AUDIT_ASSET), batch, page_size=len(batch))
+                            db_session.connection.commit()
+                    with self._lock:
+                        self._written += len(batch)
+                        self._batches += 1
+                    break
+                except Exception as exc:
+                    self.app.logger.warning(
+                        "Falha ao gravar %d eventos de auditoria de login (tentativa %d): %s",
+                        len(batch), attempt, exc,
+                    )
+                    if attempt < FLUSH_ATTEMPTS:
+                        time.sleep(min(attempt, 5))
+            else:
+                with self._lock:
+                    self._dropped += len(batch)
+                self.app.logger.error("%d eventos de auditoria de login descartados", len(batch))
+
+
+def get_login_audit_writer(app: Flask) -> LoginAuditWriter | None:
+    """Writer do processo, ou None quando ``LOGIN_AUDIT_ASYNC`` está desligado."""
+    if not app.config.get("LOGIN_AUDIT_ASYNC"):
+        return None
+    writer = app.extensions.get("login_audit_writer")
+    if writer is None:
+        writer = LoginAuditWriter(
+            app,
+            max_queue=app.config.get("LOGIN_AUDIT_QUEUE_SIZE", 10000),
+            batch_size=app.config.get("LOGIN_AUDIT_BATCH_SIZE", 500),
+            flush_interval=app.config.get("LOGIN_AUDIT_FLUSH_INTERVAL", 1.0),
+        )
+        app.extensions["login_audit_writer"] = writer
+        atexit.register(writer.close)
+    return writer
+
+
+def authenticate(email_or_cpf: str, password: str, ip_origin: str | None) -> dict[str, Any] | None:
+    """Chama ``authenticate_user`` e confirma a transação do login.
+
+    Contadores de tentativas e bloqueio são gravados aqui (commit da requisição);
+    a auditoria vai para a fila quando o modo assíncrono está ativo, ou é gravada
+    na mesma transação quando não está ou a fila está cheia.
+    """
+    writer = get_login_audit_writer(current_app)
+    result = sql_queries.fetch_one(
+        "queries/auth/login_user.sql",
+        {
+            "email_or_cpf": email_or_cpf,
+            "password": password,
+            "ip_origin": ip_origin,
+            "write_audit": writer is None,
+        },
+    )
+    auth_data = result.get("result") if result else None
+
+    db_session = g.get("db_session")
+    if db_session is None:
+        return auth_data
+
+    audit = (auth_data or {}).get("audit")
+    if writer is not None and audit and not writer.submit(audit):
+        with db_session.connection.cursor() as cursor:
+            execute_values(cursor, load_sql(INSERT_AUDIT_ASSET), [_audit_row(audit)])
+    db_session.connection.commit()
+    return auth_data
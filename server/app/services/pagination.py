@@ -0,0 +1,92 @@
+"""
+Paginação por keyset (cursor) para endpoints de listagem.
+
+O cursor ``after`` é opaco para o cliente: codifica os valores das colunas de
+ordenação da última linha da página. Os assets SQL recebem esses valores como
+``%(after_<coluna>)s`` e ``%(limit)s`` e filtram com comparação de tuplas, o que
+permite ao Postgres percorrer apenas um intervalo do índice composto.
+
+As rotas declaram as colunas de ordenação com seus tipos (``str``, ``int``,
+``date`` ou ``time``); um cursor com valores de outro tipo é recusado aqui, com
+400, em vez de chegar ao banco.
+"""
+import base64
+import json
+from datetime import date, time
+from typing import Any, Mapping, Sequence
+
+MAX_PAGE_SIZE = 500
+
+
+class PaginationError(ValueError):
+    """Parâmetros de paginação inválidos (limit ou cursor)."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _cursor_value(value: Any, kind: type) -> Any:
+    # date/time chegam como texto ISO (encode_cursor usa str); bool não é int
+    if kind in (date, time):
+        if isinstance(value, str):
+            try:
+                return kind.fromisoformat(value)
+            except ValueError:
+                pass
+    elif isinstance(value, kind) and not isinstance(value, bool):
+        return value
+    raise PaginationError("Cursor de paginação inválido")
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> list[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise PaginationError("Cursor de paginação inválido") from exc
+    if not isinstance(values, list) or len(values) != len(types):
+        raise PaginationError("Cursor de paginação inválido")
+    return [_cursor_value(value, kind) for value, kind in zip(values, types)]
+
+
+def keyset_params(args: Mapping[str, str], keys: Mapping[str, type]) -> dict[str, Any]:
+    """Monta os parâmetros ``limit``/``after_<coluna>`` a partir da query string.
+
+    ``keys`` associa cada coluna de ordenação, em ordem, ao seu tipo.
+
+    Sem ``limit`` a listagem continua completa (``LIMIT NULL``), preservando o
+    comportamento dos clientes existentes. Uma linha extra é pedida para saber
+    se existe próxima página.
+    """
+    raw_limit = args.get("limit")
+    limit = None
+    if raw_limit:
+        try:
+            limit = int(raw_limit)
+        except ValueError as exc:
+            raise PaginationError("Parâmetro limit deve ser um inteiro") from exc
+        if limit < 1:
+            raise PaginationError("Parâmetro limit deve ser maior que zero")
+        limit = min(limit, MAX_PAGE_SIZE)
+
+    after = args.get("after")
+    values = decode_cursor(after, list(keys.values())) if after else [None] * len(keys)
+
+    params: dict[str, Any] = {"limit": limit + 1 if limit else None}
+    params.update({f"after_{key}": value for key, value in zip(keys, values)})
+    return params
+
+
+def keyset_page(
+    rows: list[dict[str, Any]],
+    params: Mapping[str, Any],
+    keys: Sequence[str],
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Corta a linha extra e gera o cursor ``next`` (None na última página)."""
+    fetch_limit = params.get("limit")
+    if fetch_limit is None or len(rows) < fetch_limit:
+        return rows, None
+    page = rows[:fetch_limit - 1]
+    return page, encode_cursor([page[-1][key] for key in keys])
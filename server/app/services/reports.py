@@ -0,0 +1,277 @@
+"""
+Cache do relatório /reports/overview.
+
+Cada seção do relatório é um asset SQL analítico. O resultado de cada seção
+fica em memória por ``REPORT_CACHE_TTL`` segundos e é invalidado antes disso
+quando um asset de escrita altera uma das tabelas da qual a seção depende.
+Seções expiradas podem ser recalculadas em paralelo: a conexão da própria
+requisição calcula uma parte e as demais são divididas entre as conexões que
+estiverem livres no pool naquele momento. Nunca se espera por uma conexão
+extra, porque as requisições paradas no ``_refresh_lock`` já seguram as suas e
+esperar poderia esgotar o pool; sem conexões livres o cálculo é sequencial.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from flask import Flask, current_app, g
+from psycopg2 import Error as DatabaseError
+
+from app.database import DBSession, PoolTimeoutError
+from app.services.database import executor as sql_queries
+
+
+# Seção do relatório -> (asset SQL, tabelas lidas pelo asset)
+REPORT_SECTIONS: dict[str, tuple[str, frozenset[str]]] = {
+    "reservation_rollup": (
+        "queries/reports/reservations_rollup.sql",
+        frozenset({"reserva", "instalacao"}),
+    ),
+    "activities_cube": (
+        "queries/reports/activities_cube.sql",
+        frozenset({
+            "atividade", "conduz_atividade", "educador_fisico", "funcionario",
+            "interno_usp", "atividade_grupo_extensao", "grupo_extensao",
+        }),
+    ),
+    "participants_totals": (
+        "queries/reports/participants_totals.sql",
+        frozenset({"atividade", "participacao_atividade"}),
+    ),
+    "installation_ranking": (
+        "queries/reports/installation_ranking.sql",
+        frozenset({"reserva", "instalacao"}),
+    ),
+    "activity_occurrences": (
+        "queries/reports/activity_occurrences.sql",
+        frozenset({"atividade", "ocorrencia_semanal", "instalacao", "conduz_atividade", "educador_fisico", "pessoa"}),
+    ),
+    "installations_most_reserved": (
+        "queries/reports/installations_most_reserved.sql",
+        frozenset({"reserva", "instalacao"}),
+    ),
+    "reservations_row_number": (
+        "queries/reports/reservations_row_number.sql",
+        frozenset({"reserva", "instalacao", "interno_usp", "pessoa"}),
+    ),
+    "activities_dense_rank": (
+        "queries/reports/activities_dense_rank.sql",
+        frozenset({"atividade", "participacao_atividade"}),
+    ),
+    "reservations_monthly_growth": (
+        "queries/reports/reservations_monthly_growth.sql",
+        frozenset({"reserva"}),
+    ),
+    "reservations_cumulative": (
+        "queries/reports/reservations_cumulative.sql",
+        frozenset({"reserva"}),
+    ),
+    "activities_moving_average": (
+        "queries/reports/activities_moving_average.sql",
+        frozenset({"atividade", "participacao_atividade"}),
+    ),
+    "educator_activities_count": (
+        "queries/reports/educator_activities_count.sql",
+        frozenset({"atividade", "conduz_atividade", "educador_fisico", "funcionario", "interno_usp", "pessoa"}),
+    ),
+}
+
+# Assets de escrita -> tabelas alteradas, incluindo as atingidas por ON DELETE/
+# ON UPDATE CASCADE (usado pela invalidação automática)
+WRITE_ASSET_TABLES: dict[str, frozenset[str]] = {
+    "queries/internal/reservar_instalacao.sql": frozenset({"reserva"}),
+    "queries/staff/cancelar_reserva_instalacao.sql": frozenset({"reserva"}),
+    "queries/internal/inscrever_em_atividade.sql": frozenset({"participacao_atividade"}),
+    "queries/staff/remover_participante_atividade.sql": frozenset({"participacao_atividade"}),
+    "queries/staff/criar_atividade.sql": frozenset({"atividade", "ocorrencia_semanal", "conduz_atividade"}),
+    "queries/staff/atualizar_atividade.sql": frozenset({"atividade", "ocorrencia_semanal", "conduz_atividade"}),
+    "queries/staff/deletar_atividade.sql": frozenset({"atividade", "ocorrencia_semanal", "conduz_atividade", "participacao_atividade"}),
+    "queries/admin/criar_instalacao.sql": frozenset({"instalacao"}),
+    "queries/admin/atualizar_instalacao.sql": frozenset({"instalacao"}),
+    "queries/admin/deletar_instalacao.sql": frozenset({"instalacao", "reserva"}),
+    "queries/admin/atualizar_pessoa.sql": frozenset({"pessoa"}),
+    "queries/admin/deletar_pessoa.sql": frozenset({
+        "pessoa", "interno_usp", "funcionario", "educador_fisico", "conduz_atividade",
+        "reserva", "participacao_atividade",
+    }),
+    "queries/admin/remover_interno.sql": frozenset({
+        "interno_usp", "funcionario", "educador_fisico", "conduz_atividade",
+        "reserva", "participacao_atividade",
+    }),
+    "queries/admin/remover_funcionario.sql": frozenset({"funcionario", "educador_fisico", "conduz_atividade"}),
+    "queries/admin/remover_educador.sql": frozenset({"educador_fisico", "conduz_atividade"}),
+    "queries/admin/atualizar_educador.sql": frozenset({"educador_fisico"}),
+    "queries/extension_group/criar_grupo_extensao.sql": frozenset({"grupo_extensao"}),
+    "queries/extension_group/atualizar_grupo_extensao.sql": frozenset({"grupo_extensao", "atividade_grupo_extensao"}),
+    "queries/extension_group/deletar_grupo_extensao.sql": frozenset({"grupo_extensao", "atividade_grupo_extensao"}),
+}
+
+
+@dataclass
+class _CachedSection:
+    rows: list[dict[str, Any]]
+    computed_at: datetime
+    expires_at: float
+
+
+class ReportCache:
+    """Cache por seção com TTL, invalidação por tabela e cálculo concorrente."""
+
+    def __init__(self, ttl: float, max_workers: int = 1):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._sections: dict[str, _CachedSection] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        # Evita que vários acessos simultâneos recalculem as mesmas seções
+        self._refresh_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> None:
+        """Descarta as seções que leem alguma das tabelas (todas se ``tables`` for None)."""
+        with self._lock:
+            self._generation += 1
+            if tables is None:
+                self._sections.clear()
+                return
+            changed = set(tables)
+            for name, (_, section_tables) in REPORT_SECTIONS.items():
+                if section_tables & changed:
+                    self._sections.pop(name, None)
+
+    def invalidate_for_asset(self, relative_path: str) -> None:
+        tables = WRITE_ASSET_TABLES.get(relative_path)
+        if tables:
+            self.invalidate(tables)
+
+    def overview(self) -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
+        """Retorna (dados por seção, metadados de frescor por seção)."""
+        sections = self._fresh_sections()
+        refreshed: set[str] = set()
+        if len(sections) < len(REPORT_SECTIONS):
+            with self._refresh_lock:
+                # Outra requisição pode ter calculado enquanto esperávamos o lock
+                sections = self._fresh_sections()
+                missing = [name for name in REPORT_SECTIONS if name not in sections]
+                if missing:
+                    with self._lock:
+                        generation = self._generation
+                    if g.get("db_session") is None:
+                        # Banco indisponível: resultado vazio não deve ser guardado
+                        generation = -1
+                    sections.update(self._store(self._compute(missing), generation))
+                    refreshed = set(missing)
+
+        now = datetime.now(timezone.utc)
+        data: dict[str, list[dict[str, Any]]] = {}
+        meta: dict[str, dict[str, Any]] = {}
+        for name in REPORT_SECTIONS:
+            section = sections[name]
+            data[name] = section.rows
+            meta[name] = {
+                "computed_at": section.computed_at.isoformat(),
+                "age_seconds": round((now - section.computed_at).total_seconds(), 3),
+                "cached": name not in refreshed,
+                "ttl_seconds": self.ttl,
+            }
+        return data, meta
+
+    def _fresh_sections(self) -> dict[str, _CachedSection]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: section for name, section in self._sections.items()
+                if section.expires_at > now
+            }
+
+    def _store(
+        self,
+        results: dict[str, list[dict[str, Any]]],
+        generation: int,
+    ) -> dict[str, _CachedSection]:
+        computed_at = datetime.now(timezone.utc)
+        expires_at = time.monotonic() + self.ttl
+        sections = {
+            name: _CachedSection(rows, computed_at, expires_at)
+            for name, rows in results.items()
+        }
+        with self._lock:
+            # Uma escrita durante o cálculo invalida o resultado: serve, mas não guarda
+            if generation == self._generation:
+                self._sections.update(sections)
+        return sections
+
+    def _compute(self, names: list[str]) -> dict[str, list[dict[str, Any]]]:
+        if self.max_workers <= 1 or len(names) == 1 or g.get("db_session") is None:
+            return _compute_sections(names)
+
+        app = current_app._get_current_object()
+        extra_sessions = _idle_sessions(app, min(self.max_workers, len(names)) - 1)
+        if not extra_sessions:
+            return _compute_sections(names)
+
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="report-section",
+                )
+            # Seções divididas entre a conexão da requisição (grupo 0) e as extras
+            groups = [names[index::len(extra_sessions) + 1] for index in range(len(extra_sessions) + 1)]
+            futures = [
+                self._executor.submit(_compute_in_context, app, session, group)
+                for session, group in zip(extra_sessions, groups[1:])
+            ]
+            results = _compute_sections(groups[0])
+            for future in futures:
+                results.update(future.result())
+            return results
+        finally:
+            for session in extra_sessions:
+                session.close()
+
+
+def _idle_sessions(app: Flask, limit: int) -> list[DBSession]:
+    """Até ``limit`` sessões com conexões livres agora no pool, sem esperar."""
+    from app.extensions import get_db_pool
+
+    sessions: list[DBSession] = []
+    while len(sessions) < limit:
+        try:
+            sessions.append(DBSession(pool=get_db_pool(app), wait=False))
+        except (PoolTimeoutError, DatabaseError):
+            break
+    return sessions
+
+
+def _compute_sections(names: list[str]) -> dict[str, list[dict[str, Any]]]:
+    return {name: sql_queries.fetch_all(REPORT_SECTIONS[name][0]) for name in names}
+
+
+def _compute_in_context(app: Flask, session: DBSession, names: list[str]) -> dict[str, list[dict[str, Any]]]:
+    with app.app_context():
+        g.db_session = session
+        try:
+            return _compute_sections(names)
+        finally:
+            # Quem emprestou a sessão a devolve; o teardown do app context não a fecha
+            g.pop("db_session", None)
+
+
+def get_report_cache(app: Flask) -> ReportCache:
+    cache = app.extensions.get("report_cache")
+    if cache is None:
+        cache = ReportCache(
+            ttl=app.config.get("REPORT_CACHE_TTL", 300.0),
+            max_workers=app.config.get("REPORT_CONCURRENCY", 1),
+        )
+        app.extensions["report_cache"] = cache
+    return cache
+
+
+def invalidate_reports(tables: Iterable[str] | None = None) -> None:
+    """Invalida explicitamente as seções do relatório afetadas por ``tables``."""
+    get_report_cache(current_app).invalidate(tables)
@@ -0,0 +1,227 @@
+"""
+Reservas em lote (vários horários ou regra de recorrência) de instalações e
+equipamentos.
+
+Os horários são validados e expandidos aqui e inseridos por um único asset SQL
+(``INSERT ... SELECT FROM unnest(...) ON CONFLICT DO NOTHING``), numa única
+transação. Horários em conflito são reportados individualmente; no modo
+``all_or_nothing`` qualquer falha desfaz o lote inteiro, no modo
+``best_effort`` os horários livres são mantidos.
+"""
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from typing import Any, Mapping
+
+from flask import g
+
+from app.services.database import executor as sql_queries
+from app.services.reports import invalidate_reports
+
+MAX_BULK_SLOTS = 200
+BULK_MODES = ("all_or_nothing", "best_effort")
+OPENING_TIME = time(6, 0)
+CLOSING_TIME = time(22, 0)
+
+WEEKDAYS = {
+    "SEGUNDA": 0,
+    "TERCA": 1,
+    "QUARTA": 2,
+    "QUINTA": 3,
+    "SEXTA": 4,
+    "SABADO": 5,
+    "DOMINGO": 6,
+}
+
+# Tipo de recurso -> (asset de inserção em lote, tabela alterada)
+BULK_ASSETS = {
+    "instalacao": ("queries/internal/reservar_instalacao_lote.sql", "reserva"),
+    "equipamento": ("queries/internal/reservar_equipamento_lote.sql", "reserva_equipamento"),
+}
+
+
+class BulkReservationError(ValueError):
+    """Pedido de reserva em lote inválido (horários, recorrência ou modo)."""
+
+
+@dataclass(frozen=True)
+class Slot:
+    data: date
+    hora_inicio: time
+    hora_fim: time
+
+    def to_dict(self) -> dict[str, str]:
+        return {
+            "data": self.data.isoformat(),
+            "hora_inicio": self.hora_inicio.strftime("%H:%M"),
+            "hora_fim": self.hora_fim.strftime("%H:%M"),
+        }
+
+
+def _parse_date(value: Any, field: str) -> date:
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError as exc:
+        raise BulkReservationError(f"Data inválida em {field}: {value!r}") from exc
+
+
+def _parse_time(value: Any, field: str) -> time:
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError as exc:
+        raise BulkReservationError(f"Horário inválido em {field}: {value!r}") from exc
+
+
+def _expand_recurrence(rule: Mapping[str, Any]) -> list[Slot]:
+    weekdays = rule.get("dias_semana") or ([rule["dia_semana"]] if rule.get("dia_semana") else [])
+    if not weekdays:
+        raise BulkReservationError("Informe dia_semana ou dias_semana na recorrência")
+    try:
+        wanted = {WEEKDAYS[str(day).upper()] for day in weekdays}
+    except KeyError as exc:
+        raise BulkReservationError(f"Dia da semana inválido: {exc.args[0]}") from exc
+
+    start = _parse_date(rule.get("data_inicio"), "data_inicio")
+    end = _parse_date(rule.get("data_fim"), "data_fim")
+    if end < start:
+        raise BulkReservationError("data_fim deve ser posterior a data_inicio")
+    hora_inicio = _parse_time(rule.get("hora_inicio"), "hora_inicio")
+    hora_fim = _parse_time(rule.get("hora_fim"), "hora_fim")
+
+    slots: list[Slot] = []
+    current = start
+    while current <= end:
+        if current.weekday() in wanted:
+            slots.append(Slot(current, hora_inicio, hora_fim))
+            if len(slots) > MAX_BULK_SLOTS:
+                raise BulkReservationError(f"A recorrência gera mais de {MAX_BULK_SLOTS} horários")
+        current += timedelta(days=1)
+    return slots
+
+
+def parse_slots(payload: Mapping[str, Any]) -> list[Slot]:
+    """Lê os horários do corpo da requisição: lista ``slots`` ou regra ``recorrencia``."""
+    if payload.get("recorrencia"):
+        rule = payload["recorrencia"]
+        if not isinstance(rule, Mapping):
+            raise BulkReservationError("recorrencia deve ser um objeto")
+        slots = _expand_recurrence(rule)
+    else:
+        raw_slots = payload.get("slots")
+        if not isinstance(raw_slots, list):
+            raise BulkReservationError("Informe a lista slots ou a regra recorrencia")
+        if len(raw_slots) > MAX_BULK_SLOTS:
+            raise BulkReservationError(f"Máximo de {MAX_BULK_SLOTS} horários por lote")
+        slots = []
+        for index, raw in enumerate(raw_slots):
+            if not isinstance(raw, Mapping):
+                raise BulkReservationError(f"slots[{index}] deve ser um objeto")
+            slots.append(Slot(
+                _parse_date(raw.get("data"), f"slots[{index}].data"),
+                _parse_time(raw.get("hora_inicio"), f"slots[{index}].hora_inicio"),
+                _parse_time(raw.get("hora_fim"), f"slots[{index}].hora_fim"),
+            ))
+
+    if not slots:
+        raise BulkReservationError("Nenhum horário para reservar")
+    return slots
+
+
+def _invalid_reason(slot: Slot) -> str | None:
+    # Mesmas regras de validar_horario_reserva, para não abortar o INSERT do lote
+    if slot.hora_fim <= slot.hora_inicio:
+        return "O horário de fim deve ser maior que o horário de início"
+    if slot.hora_inicio < OPENING_TIME or slot.hora_fim > CLOSING_TIME:
+        return "Horário de reserva inválido (permitido: 06h–22h)"
+    return None
+
+
+def _rollback() -> None:
+    if g.get("db_session") is not None:
+        g.db_session.connection.rollback()
+
+
+def reserve_bulk(
+    resource: str,
+    resource_id: Any,
+    cpf_responsavel: str,
+    slots: list[Slot],
+    mode: str,
+) -> dict[str, Any]:
+    """Reserva os horários numa única transação e retorna o resultado por horário.
+
+    O resultado tem ``committed`` (se algo foi gravado), ``reserved`` e
+    ``results`` (um item por horário, na ordem recebida, com ``status`` entre
+    reservado, conflito, invalido, duplicado e nao_reservado).
+    """
+    if mode not in BULK_MODES:
+        raise BulkReservationError(f"Modo inválido: {mode!r} (use {' ou '.join(BULK_MODES)})")
+    asset, table = BULK_ASSETS[resource]
+
+    results: list[dict[str, Any]] = [slot.to_dict() for slot in slots]
+    pending: list[int] = []
+    seen: set[Slot] = set()
+    for index, slot in enumerate(slots):
+        reason = _invalid_reason(slot)
+        if reason:
+            results[index].update(status="invalido", message=reason)
+        elif slot in seen:
+            results[index].update(status="duplicado", message="Horário repetido no lote")
+        else:
+            seen.add(slot)
+            pending.append(index)
+
+    rows: list[dict[str, Any]] = []
+    if pending:
+        rows = sql_queries.fetch_all(
+            asset,
+            {
+                f"id_{resource}": resource_id,
+                "cpf_responsavel": cpf_responsavel,
+                "datas": [slots[index].data for index in pending],
+                "inicios": [slots[index].hora_inicio for index in pending],
+                "fins": [slots[index].hora_fim for index in pending],
+            },
+        )
+
+    if rows and resource == "equipamento" and rows[0].get("eh_reservavel") != "S":
+        _rollback()
+        if rows[0].get("eh_reservavel") is None:
+            raise BulkReservationError("O equipamento informado não existe")
+        raise BulkReservationError("Este equipamento não é reservável")
+
+    reserved = 0
+    for row in rows:
+        result = results[pending[row["slot"] - 1]]
+        if row["id_reserva"] is not None:
+            reserved += 1
+            result.update(status="reservado", id_reserva=row["id_reserva"])
+            continue
+        result.update(status="conflito", message="Já existe uma reserva nesse horário")
+        if row["conflito_id_reserva"] is not None:
+            result["conflito"] = {
+                "id_reserva": row["conflito_id_reserva"],
+                "horario_inicio": row["conflito_horario_inicio"],
+                "horario_fim": row["conflito_horario_fim"],
+            }
+        else:
+            result["conflito"] = {"lote": True}
+
+    for index in pending:
+        # Sem linha de retorno (banco indisponível): nada foi gravado
+        results[index].setdefault("status", "nao_reservado")
+
+    failed = len(slots) - reserved
+    if mode == "all_or_nothing" and failed:
+        _rollback()
+        for result in results:
+            if result.get("status") == "reservado":
+                result.pop("id_reserva", None)
+                result.update(status="nao_reservado", message="Lote desfeito: há horários com falha")
+        reserved = 0
+    elif reserved:
+        g.db_session.connection.commit()
+        invalidate_reports({table})
+    else:
+        _rollback()
+
+    return {"committed": reserved > 0, "reserved": reserved, "failed": failed, "results": results}
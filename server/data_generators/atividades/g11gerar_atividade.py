@@ -1,13 +1,13 @@
-import random
 import sys
 from datetime import datetime, timedelta
-from faker import Faker
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import novo_faker, random
+from data_generators.scale import replicar
 
-fake = Faker('pt_BR')
+fake = novo_faker()
 
 # Lista de nomes mais descritivos e organizados
 NOMES_ATIVIDADES = [
@@ -18,11 +18,12 @@ NOMES_ATIVIDADES = [
     'Karatê (Extensão)', 'Kung Fu (Extensão)', 'Tai Chi Chuan (Extensão)', 'Capoeira (Extensão)'
 ]
 
-def gerar_atividades(dbsession, quantidade):
+def gerar_atividades(dbsession, quantidade, anos=1):
     """
     Gera dados fictícios e consistentes para a tabela ATIVIDADE.
-    - As datas são geradas de forma coerente.
-    - Nomes são únicos e controlados pela lista NOMES_ATIVIDADES.
+    - As datas são geradas de forma coerente, nos últimos ``anos`` anos.
+    - Nomes são únicos e controlados pela lista NOMES_ATIVIDADES; além dela,
+      turmas numeradas ("Hidroginástica - Turma 2").
     - Insere diretamente no banco.
     """
 
@@ -31,16 +32,11 @@ def gerar_atividades(dbsession, quantidade):
     atividades_data = []
     atividades_set = set()
 
-    # Limita a quantidade ao número de nomes únicos disponíveis
-    if quantidade > len(NOMES_ATIVIDADES):
-        print(f"Aviso: Reduzindo número de atividades para {len(NOMES_ATIVIDADES)} (máximo de nomes únicos).")
-        quantidade = len(NOMES_ATIVIDADES)
-
-    nomes_selecionados = random.sample(NOMES_ATIVIDADES, quantidade)
+    nomes_selecionados = replicar(NOMES_ATIVIDADES, quantidade, lambda nome, turma: f"{nome} - Turma {turma}")
 
     for id_atividade, nome in enumerate(nomes_selecionados, start=1):
-        # Gera data de início aleatória em 2023
-        data_inicio = fake.date_between(start_date='-1y', end_date='today')
+        # Gera data de início aleatória no período do histórico
+        data_inicio = fake.date_between(start_date=f'-{anos}y', end_date='today')
 
         # Garante que o mesmo nome não terá a mesma data
         key = (nome, data_inicio)
@@ -56,13 +52,10 @@ def gerar_atividades(dbsession, quantidade):
         atividades_data.append((nome, vagas_limite, data_inicio, data_fim))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO ATIVIDADE (NOME, VAGAS_LIMITE, DATA_INICIO_PERIODO, DATA_FIM_PERIODO)
-        VALUES (%s, %s, %s, %s)
-    """
+    colunas = ("NOME", "VAGAS_LIMITE", "DATA_INICIO_PERIODO", "DATA_FIM_PERIODO")
 
     print(f"Inserindo {len(atividades_data)} atividades no banco...")
-    dbsession.executemany(query, atividades_data)
+    dbsession.copy_rows("ATIVIDADE", colunas, atividades_data)
     print(f"✅ {len(atividades_data)} atividades inseridas com sucesso!")
     print(f"Total de atividades geradas: {len(atividades_data)}")
 
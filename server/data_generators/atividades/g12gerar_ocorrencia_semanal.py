@@ -1,39 +1,26 @@
-import random
 import sys
-from datetime import time, timedelta, datetime
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.synth import horarios, novo_rng
 
-# Função para gerar um horário aleatório de início
-# (somente horas cheias ou meia hora, entre 08:00 e 18:00)
-def gerar_horario_inicio():
-    hora = random.randint(8, 18)  # Entre 08:00 e 18:00
-    minuto = random.choice([0, 30])  # Apenas :00 ou :30
-    return time(hora, minuto)
-
-# Função para gerar um horário de fim (mínimo 1h e máximo 2h depois do início)
-def gerar_horario_fim(horario_inicio):
-    # Duração entre 60 e 120 minutos
-    duracao_minutos = random.randint(60, 120)
-
-    inicio_dt = datetime.combine(datetime.today(), horario_inicio)
-    fim_dt = inicio_dt + timedelta(minutes=duracao_minutos)
+DIAS_SEMANA = np.array(['SEGUNDA', 'TERCA', 'QUARTA', 'QUINTA', 'SEXTA', 'SABADO', 'DOMINGO'])
+OCORRENCIAS_POR_ATIVIDADE = 3
 
-    # Se ultrapassar 22h, ajusta para 22:00
-    if fim_dt.hour >= 22:
-        fim_dt = datetime.combine(datetime.today(), time(22, 0))
-
-    return fim_dt.time()
-
-# Função para gerar um dia da semana aleatório
-def gerar_dia_semana():
-    dias = ['SEGUNDA', 'TERCA', 'QUARTA', 'QUINTA', 'SEXTA', 'SABADO', 'DOMINGO']
-    return random.choice(dias)
+# Horários de início (somente horas cheias ou meia hora, entre 08:00 e 18:30)
+# e de fim (mínimo 1h e máximo 2h depois do início, sem passar das 22h)
+def gerar_horarios(rng, quantidade):
+    inicios = 60 * rng.integers(8, 19, size=quantidade) + rng.choice([0, 30], size=quantidade)
+    fins = np.minimum(inicios + rng.integers(60, 121, size=quantidade), 22 * 60)
+    return horarios(inicios), horarios(fins)
 
 # Função para popular a tabela OCORRENCIA_SEMANAL
 def popular_ocorrencias(dbsession):
+    rng = novo_rng()
+
     # Buscar atividades do banco
     atividades_result = dbsession.fetch_all("SELECT ID_ATIVIDADE FROM ATIVIDADE ORDER BY ID_ATIVIDADE")
     ids_atividades = [row['id_atividade'] for row in atividades_result]
@@ -45,25 +32,20 @@ def popular_ocorrencias(dbsession):
     if not ids_instalacoes:
         raise ValueError("Nenhuma instalação encontrada no banco!")
 
-    # Gerar ocorrências semanais
-    ocorrencias_data = []
-    for id_atividade in ids_atividades:
-        for _ in range(3):  # 3 ocorrências por atividade
-            id_instalacao = random.choice(ids_instalacoes)
-            dia_semana = gerar_dia_semana()
-            horario_inicio = gerar_horario_inicio()
-            horario_fim = gerar_horario_fim(horario_inicio)
+    # Gerar ocorrências semanais (3 por atividade), uma coluna por vez
+    quantidade = len(ids_atividades) * OCORRENCIAS_POR_ATIVIDADE
+    atividades = np.repeat(ids_atividades, OCORRENCIAS_POR_ATIVIDADE).tolist()
+    instalacoes = rng.choice(ids_instalacoes, size=quantidade).tolist()
+    dias_semana = rng.choice(DIAS_SEMANA, size=quantidade).tolist()
+    horarios_inicio, horarios_fim = gerar_horarios(rng, quantidade)
 
-            ocorrencias_data.append((id_atividade, id_instalacao, dia_semana, horario_inicio, horario_fim))
+    ocorrencias_data = list(zip(atividades, instalacoes, dias_semana, horarios_inicio, horarios_fim))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO OCORRENCIA_SEMANAL (ID_ATIVIDADE, ID_INSTALACAO, DIA_SEMANA, HORARIO_INICIO, HORARIO_FIM)
-        VALUES (%s, %s, %s, %s, %s)
-    """
+    colunas = ("ID_ATIVIDADE", "ID_INSTALACAO", "DIA_SEMANA", "HORARIO_INICIO", "HORARIO_FIM")
 
     print(f"Inserindo {len(ocorrencias_data)} ocorrências semanais no banco...")
-    dbsession.executemany(query, ocorrencias_data)
+    dbsession.copy_rows("OCORRENCIA_SEMANAL", colunas, ocorrencias_data)
     print(f"✅ {len(ocorrencias_data)} ocorrências semanais inseridas com sucesso!")
 
 if __name__ == "__main__":
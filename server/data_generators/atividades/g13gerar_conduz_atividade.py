@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Gerar CONDUZ_ATIVIDADE a partir do banco
 def gerar_conduz_atividade(dbsession):
@@ -24,13 +24,10 @@ def gerar_conduz_atividade(dbsession):
             conduzir_data.append((educador, atividade_id))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO CONDUZ_ATIVIDADE (CPF_EDUCADOR_FISICO, ID_ATIVIDADE)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_EDUCADOR_FISICO", "ID_ATIVIDADE")
 
     print(f"Inserindo {len(conduzir_data)} registros de CONDUZ_ATIVIDADE no banco...")
-    dbsession.executemany(query, conduzir_data)
+    dbsession.copy_rows("CONDUZ_ATIVIDADE", colunas, conduzir_data)
     print(f"✅ {len(conduzir_data)} registros inseridos com sucesso!")
 
 if __name__ == "__main__":
@@ -1,21 +1,19 @@
-import random
 import sys
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
+from data_generators.scale import data_aleatoria
 
-# Função para gerar uma data de inscrição aleatória
-def gerar_data_inscricao():
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    return (start_date + timedelta(days=random_days)).date()
+# Função para gerar uma data de inscrição aleatória nos últimos `anos` anos
+def gerar_data_inscricao(anos=1):
+    hoje = date.today()
+    return data_aleatoria(hoje - timedelta(days=365 * anos), hoje)
 
 # Função principal para gerar os dados de PARTICIPACAO_ATIVIDADE
-def gerar_participacao_atividade(dbsession):
+def gerar_participacao_atividade(dbsession, anos=1):
     # Buscar CPFs das pessoas restantes (participantes) - pessoas que não são internas
     participantes_result = dbsession.fetch_all("""
         SELECT CPF FROM PESSOA
@@ -42,34 +40,18 @@ def gerar_participacao_atividade(dbsession):
         for id_atividade in atividades_escolhidas:
             # 50% de chance de ter um convidante interno
             cpf_convidante = random.choice(internos) if random.random() < 0.5 and internos else None
-            data_inscricao = gerar_data_inscricao()
+            data_inscricao = gerar_data_inscricao(anos)
 
             if cpf_convidante:
                 participacoes_data.append((participante, id_atividade, cpf_convidante, data_inscricao))
             else:
                 participacoes_data.append((participante, id_atividade, None, data_inscricao))
 
-    # Inserir diretamente no banco (com tratamento para NULL)
-    query_com_convidante = """
-        INSERT INTO PARTICIPACAO_ATIVIDADE (CPF_PARTICIPANTE, ID_ATIVIDADE, CPF_CONVIDANTE_INTERNO, DATA_INSCRICAO)
-        VALUES (%s, %s, %s, %s)
-    """
-
-    query_sem_convidante = """
-        INSERT INTO PARTICIPACAO_ATIVIDADE (CPF_PARTICIPANTE, ID_ATIVIDADE, DATA_INSCRICAO)
-        VALUES (%s, %s, %s)
-    """
+    # Inserir diretamente no banco (convidante None vira NULL)
+    colunas = ("CPF_PARTICIPANTE", "ID_ATIVIDADE", "CPF_CONVIDANTE_INTERNO", "DATA_INSCRICAO")
 
     print(f"Inserindo {len(participacoes_data)} participações no banco...")
-
-    # Separar por tipo para executar queries apropriadas
-    with_convidante = [(p, a, c, d) for p, a, c, d in participacoes_data if c is not None]
-    sem_convidante = [(p, a, d) for p, a, c, d in participacoes_data if c is None]
-
-    if with_convidante:
-        dbsession.executemany(query_com_convidante, with_convidante)
-    if sem_convidante:
-        dbsession.executemany(query_sem_convidante, sem_convidante)
+    dbsession.copy_rows("PARTICIPACAO_ATIVIDADE", colunas, participacoes_data)
 
     print(f"✅ {len(participacoes_data)} participações inseridas com sucesso!")
 
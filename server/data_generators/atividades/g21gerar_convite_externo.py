@@ -1,20 +1,24 @@
-import random
 import sys
 import secrets
 from datetime import datetime, timedelta
-from faker import Faker
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import novo_faker, random
 
-fake = Faker('pt_BR')
+fake = novo_faker()
 
 # Status possíveis para convites
 STATUS_CONVITE = ['PENDENTE', 'ACEITO', 'RECUSADO', 'CANCELADO']
 
 def gerar_token():
-    """Gera um token único de 64 caracteres hexadecimais."""
+    """Gera um token único de 64 caracteres hexadecimais.
+
+    O token é uma credencial de acesso ao convite, então vem de ``secrets`` e
+    não da semente (que é impressa e gravada no banco): é o único dado da
+    população que não se repete entre execuções com a mesma semente.
+    """
     return secrets.token_hex(32)
 
 def gerar_convite_externo(dbsession):
@@ -104,51 +108,23 @@ def gerar_convite_externo(dbsession):
             ))
 
     # Inserir diretamente no banco
-    query_com_obs = """
-        INSERT INTO CONVITE_EXTERNO (
-            CPF_CONVIDANTE,
-            DOCUMENTO_CONVIDADO,
-            NOME_CONVIDADO,
-            EMAIL_CONVIDADO,
-            TELEFONE_CONVIDADO,
-            ID_ATIVIDADE,
-            STATUS,
-            TOKEN,
-            DATA_CONVITE,
-            DATA_RESPOSTA,
-            OBSERVACOES
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    query_sem_obs = """
-        INSERT INTO CONVITE_EXTERNO (
-            CPF_CONVIDANTE,
-            DOCUMENTO_CONVIDADO,
-            NOME_CONVIDADO,
-            EMAIL_CONVIDADO,
-            TELEFONE_CONVIDADO,
-            ID_ATIVIDADE,
-            STATUS,
-            TOKEN,
-            DATA_CONVITE,
-            DATA_RESPOSTA
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    colunas = (
+        "CPF_CONVIDANTE",
+        "DOCUMENTO_CONVIDADO",
+        "NOME_CONVIDADO",
+        "EMAIL_CONVIDADO",
+        "TELEFONE_CONVIDADO",
+        "ID_ATIVIDADE",
+        "STATUS",
+        "TOKEN",
+        "DATA_CONVITE",
+        "DATA_RESPOSTA",
+        "OBSERVACOES",
+    )
 
     print(f"Inserindo {len(convites_data)} convites externos no banco...")
-
-    # Separar por tipo para executar queries apropriadas
-    com_obs = [(c, d, n, e, t, i, s, tok, dc, dr, o)
-               for c, d, n, e, t, i, s, tok, dc, dr, o in convites_data if o is not None]
-    sem_obs = [(c, d, n, e, t, i, s, tok, dc, dr)
-               for c, d, n, e, t, i, s, tok, dc, dr, o in convites_data if o is None]
-
-    if com_obs:
-        dbsession.executemany(query_com_obs, com_obs)
-    if sem_obs:
-        dbsession.executemany(query_sem_obs, sem_obs)
+    # OBSERVACOES None vira NULL
+    dbsession.copy_rows("CONVITE_EXTERNO", colunas, convites_data)
 
     # Adicionar convite de teste com token SUPER fácil de digitar
     # Token curto e simples: "teste123" - fácil de digitar!
@@ -178,10 +154,7 @@ def gerar_convite_externo(dbsession):
                 "Convite de teste para desenvolvimento"
             )
 
-            # Execute usando tupla (psycopg2 aceita tuplas com %s)
-            with dbsession.connection.cursor() as cursor:
-                cursor.execute(query_com_obs, convite_teste)
-            dbsession.connection.commit()
+            dbsession.copy_rows("CONVITE_EXTERNO", colunas, [convite_teste])
             print(f"✅ Convite de teste criado!")
             print(f"   Token: {token_teste}")
             print(f"   Use este token para testar o login externo!")
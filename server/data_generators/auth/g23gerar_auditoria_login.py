@@ -1,10 +1,10 @@
-import random
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Status possíveis para auditoria
 STATUS_AUDITORIA = ['SUCCESS', 'FAILURE', 'LOCKED']
@@ -27,9 +27,34 @@ def gerar_mensagem(status, email):
     else:  # LOCKED
         return f"Conta bloqueada após múltiplas tentativas falhas para {email}"
 
-def gerar_auditoria_login(dbsession):
+def gerar_historico_login(dbsession, quantidade, anos):
+    """Gera ``quantidade`` eventos de login de usuários aleatórios nos últimos ``anos`` anos."""
+    usuarios_result = dbsession.fetch_all("""
+        SELECT US.CPF, P.EMAIL
+        FROM USUARIO_SENHA US
+        JOIN PESSOA P ON P.CPF = US.CPF
+        ORDER BY US.CPF
+    """)
+    usuarios = [(row['cpf'], row['email']) for row in usuarios_result]
+    if not usuarios:
+        return []
+
+    agora = datetime.now()
+    segundos_historico = 365 * anos * 24 * 3600
+    pesos_status = [0.85, 0.12, 0.03]  # SUCCESS, FAILURE, LOCKED
+
+    eventos = []
+    for _ in range(quantidade):
+        cpf, email = random.choice(usuarios)
+        timestamp = agora - timedelta(seconds=random.randint(0, segundos_historico))
+        status = random.choices(STATUS_AUDITORIA, weights=pesos_status)[0]
+        eventos.append((cpf, timestamp, timestamp, email, gerar_ip_aleatorio(), status, gerar_mensagem(status, email)))
+    return eventos
+
+def gerar_auditoria_login(dbsession, quantidade=0, anos=1):
     """
-    Gera um log de login bem-sucedido para o usuário admin de teste.
+    Gera um log de login bem-sucedido para o usuário admin de teste e,
+    com ``quantidade`` > 0, um histórico de logins dos demais usuários.
     """
     EMAIL_ADMIN = "admin@usp.br"
 
@@ -53,23 +78,23 @@ def gerar_auditoria_login(dbsession):
     cpf = pessoa_admin_result.get("cpf")
 
     # Inserir diretamente no banco (conforme estrutura log_table do PF)
-    query = """
-        INSERT INTO AUDITORIA_LOGIN (
-            CPF, DATA_HORA_LOGIN,
-            TIMESTAMP_EVENTO,
-            EMAIL_USUARIO,
-            IP_ORIGEM,
-            STATUS,
-            MENSAGEM
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
+    colunas = (
+        "CPF",
+        "DATA_HORA_LOGIN",
+        "TIMESTAMP_EVENTO",
+        "EMAIL_USUARIO",
+        "IP_ORIGEM",
+        "STATUS",
+        "MENSAGEM",
+    )
 
     auditoria_data = [(cpf, timestamp, timestamp, EMAIL_ADMIN, ip_origem, status, mensagem)]
+    if quantidade > 0:
+        auditoria_data += gerar_historico_login(dbsession, quantidade, anos)
 
-    print(f"Inserindo 1 log de auditoria de login para {EMAIL_ADMIN}...")
-    dbsession.executemany(query, auditoria_data)
-    print(f"✅ 1 log de auditoria de login inserido com sucesso!")
+    print(f"Inserindo {len(auditoria_data)} logs de auditoria de login...")
+    dbsession.copy_rows("AUDITORIA_LOGIN", colunas, auditoria_data)
+    print(f"✅ {len(auditoria_data)} logs de auditoria de login inseridos com sucesso!")
 
 if __name__ == "__main__":
     dbsession = DBSession()
@@ -1,14 +1,14 @@
-import random
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
-def gerar_metrica_acesso_diaria(dbsession):
+def gerar_metrica_acesso_diaria(dbsession, dias=180):
     """
-    Gera métricas diárias de acesso para os últimos 6 meses.
+    Gera métricas diárias de acesso para os últimos ``dias`` dias (padrão: 6 meses).
     Calcula totais baseados em dados existentes de internos, externos e funcionários.
     """
     # Buscar totais reais do banco
@@ -29,11 +29,11 @@ def gerar_metrica_acesso_diaria(dbsession):
         print("⚠️  Nenhum dado de pessoas encontrado. Pulando geração de métricas de acesso.")
         return
 
-    # Gerar métricas para os últimos 6 meses (180 dias)
+    # Gerar métricas para os últimos `dias` dias
     metricas_data = []
-    data_base = datetime.now().date() - timedelta(days=180)
+    data_base = datetime.now().date() - timedelta(days=dias)
 
-    for i in range(180):
+    for i in range(dias):
         data_referencia = data_base + timedelta(days=i)
 
         # Calcular acessos baseados em totais reais com variação aleatória
@@ -65,18 +65,10 @@ def gerar_metrica_acesso_diaria(dbsession):
         ))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO METRICA_ACESSO_DIARIA (
-            DATA_REFERENCIA,
-            TOTAL_INTERNOS,
-            TOTAL_EXTERNOS,
-            TOTAL_FUNCIONARIOS
-        )
-        VALUES (%s, %s, %s, %s)
-    """
+    colunas = ("DATA_REFERENCIA", "TOTAL_INTERNOS", "TOTAL_EXTERNOS", "TOTAL_FUNCIONARIOS")
 
     print(f"Inserindo {len(metricas_data)} métricas de acesso diárias no banco...")
-    dbsession.executemany(query, metricas_data)
+    dbsession.copy_rows("METRICA_ACESSO_DIARIA", colunas, metricas_data)
     print(f"✅ {len(metricas_data)} métricas de acesso diárias inseridas com sucesso!")
     print(f"   Período: {data_base} até {datetime.now().date()}")
 
@@ -1,13 +1,12 @@
-import random
 import sys
 from datetime import datetime, timedelta
-from faker import Faker
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import novo_faker, random
 
-fake = Faker('pt_BR')
+fake = novo_faker()
 
 # Status possíveis para solicitações
 STATUS_SOLICITACAO = ['PENDENTE', 'APROVADA', 'REJEITADA']
@@ -135,44 +134,19 @@ def gerar_solicitacao_cadastro(dbsession):
             observacoes
         ))
 
-    # Inserir diretamente no banco
-    query_com_obs = """
-        INSERT INTO SOLICITACAO_CADASTRO (
-            CPF_PESSOA,
-            NUSP,
-            STATUS,
-            CPF_ADMIN_APROVADOR,
-            DATA_SOLICITACAO,
-            DATA_APROVACAO,
-            OBSERVACOES
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-
-    query_sem_obs = """
-        INSERT INTO SOLICITACAO_CADASTRO (
-            CPF_PESSOA,
-            NUSP,
-            STATUS,
-            CPF_ADMIN_APROVADOR,
-            DATA_SOLICITACAO,
-            DATA_APROVACAO
-        )
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """
+    # Inserir diretamente no banco (OBSERVACOES None vira NULL)
+    colunas = (
+        "CPF_PESSOA",
+        "NUSP",
+        "STATUS",
+        "CPF_ADMIN_APROVADOR",
+        "DATA_SOLICITACAO",
+        "DATA_APROVACAO",
+        "OBSERVACOES",
+    )
 
     print(f"Inserindo {len(solicitacoes_data)} solicitações de cadastro no banco...")
-
-    # Separar por tipo para executar queries apropriadas
-    com_obs = [(c, n, s, a, ds, da, o)
-               for c, n, s, a, ds, da, o in solicitacoes_data if o is not None]
-    sem_obs = [(c, n, s, a, ds, da)
-               for c, n, s, a, ds, da, o in solicitacoes_data if o is None]
-
-    if com_obs:
-        dbsession.executemany(query_com_obs, com_obs)
-    if sem_obs:
-        dbsession.executemany(query_sem_obs, sem_obs)
+    dbsession.copy_rows("SOLICITACAO_CADASTRO", colunas, solicitacoes_data)
 
     print(f"✅ {len(solicitacoes_data)} solicitações de cadastro inseridas com sucesso!")
 
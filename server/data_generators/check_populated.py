@@ -4,9 +4,11 @@ Retorna 0 se já foi populado, 1 se não foi populado.
 """
 import sys
 from app.database import DBSession
+from data_generators.progress import execucao_pendente
 
 def is_db_populated():
-    """Verifica se o banco já foi populado checando se a tabela PESSOA existe e tem dados."""
+    """Verifica se o banco já foi populado checando se a tabela PESSOA existe e tem dados
+    (e se não há uma população interrompida a retomar)."""
     try:
         dbsession = DBSession()
 
@@ -26,6 +28,10 @@ def is_db_populated():
             count_result = dbsession.fetch_one(count_query)
 
             if count_result and count_result['count'] > 0:
+                if execucao_pendente(dbsession):
+                    print("População anterior interrompida; será retomada.")
+                    dbsession.close()
+                    return False
                 print(f"Banco de dados já populado ({count_result['count']} pessoas encontradas).")
                 dbsession.close()
                 return True
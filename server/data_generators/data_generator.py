@@ -12,6 +12,8 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from app.database import DBSession
+
 # Importa todas as funções de geração
 from data_generators.pessoas.g01gerar_pessoas import gerar_pessoas
 from data_generators.pessoas.g02gerar_interno_usp import gerar_interno_usp
@@ -52,77 +54,112 @@ from data_generators.auth.g24gerar_metrica_acesso_diaria import (
 from data_generators.auth.g25gerar_solicitacao_cadastro import (
     gerar_solicitacao_cadastro,
 )
+from data_generators.pipeline import Stage, resolve_workers, run_stages
+from data_generators.progress import concluir_execucao, iniciar_execucao
+from data_generators.scale import anos_historico
 
 
-# Ordem de execução das funções de geração (respeitando dependências)
-GENERATION_ORDER = [
-    # Domínio: Pessoas
-    ("pessoa", gerar_pessoas, {"quantidade": 5000}),
-    ("interno_usp", gerar_interno_usp, {}),
-    ("usuario_senha", gerar_usuario_senha, {}),
-    ("funcionario", gerar_funcionarios, {}),
-    ("funcionario_atribuicao", gerar_atribuicoes_funcionario, {}),
-    ("funcionario_restricao", gerar_restricoes_funcionario, {}),
-    ("educador_fisico", gerar_educadores_fisicos, {}),
-    # Domínio: Infraestrutura
-    ("instalacao", gerar_instalacoes, {"num_registros": 20}),
-    ("equipamento", gerar_equipamentos, {}),
-    ("doacao", gerar_doacoes, {}),
-    ("emprestimo_equipamento", gerar_emprestimo_equipamento, {}),
-    # Domínio: Reservas
-    ("reserva", gerar_reservas, {}),
-    ("reserva_equipamento", gerar_reservas_equipamento, {}),
-    # Domínio: Atividades
-    ("atividade", gerar_atividades, {"quantidade": 16}),
-    ("ocorrencia_semanal", popular_ocorrencias, {}),
-    ("conduz_atividade", gerar_conduz_atividade, {}),
-    ("participacao_atividade", gerar_participacao_atividade, {}),
-    ("convite_externo", gerar_convite_externo, {}),
-    # Domínio: Eventos
-    ("evento", gerar_eventos, {}),
-    ("supervisao_evento", gerar_supervisao_evento, {}),
-    # Domínio: Grupos
-    ("grupo_extensao", gerar_grupos_extensao, {"quantidade_grupos": 4}),
-    ("atividade_grupo_extensao", gerar_atividade_grupo_extensao, {}),
-    # Domínio: Autenticação e Auditoria
-    ("auditoria_login", gerar_auditoria_login, {}),
-    ("solicitacao_cadastro", gerar_solicitacao_cadastro, {}),
-    ("metrica_acesso_diaria", gerar_metrica_acesso_diaria, {}),
-]
-
-
-def populate_database(dbsession):
+def generation_order(scale=1):
+    """
+    Etapas de geração com suas dependências (tabelas que precisam estar
+    completas antes), em ordem topológica, com tamanhos multiplicados por
+    ``scale``. As tabelas sem tamanho explícito derivam das demais (ex.:
+    internos são 90% das pessoas).
+    """
+    anos = anos_historico(scale)
+    return [
+        # Domínio: Pessoas
+        Stage("pessoa", gerar_pessoas, {"quantidade": 5000 * scale}, batched=True),
+        Stage("interno_usp", gerar_interno_usp, {}, ("pessoa",)),
+        Stage("funcionario", gerar_funcionarios, {}, ("interno_usp",)),
+        Stage("funcionario_atribuicao", gerar_atribuicoes_funcionario, {}, ("funcionario",)),
+        Stage("funcionario_restricao", gerar_restricoes_funcionario, {}, ("funcionario",)),
+        Stage("educador_fisico", gerar_educadores_fisicos, {}, ("funcionario",)),
+        # TIPO/PAPEIS são calculados na inserção: funcionários e atribuições já
+        # precisam estar gravados (os triggers deles ignoram contas inexistentes)
+        Stage("usuario_senha", gerar_usuario_senha, {}, ("interno_usp", "funcionario_atribuicao")),
+        # Domínio: Infraestrutura
+        Stage("instalacao", gerar_instalacoes, {"num_registros": 20 * scale}),
+        Stage("equipamento", gerar_equipamentos, {"quantidade": 200 * scale, "anos": anos}, ("instalacao",)),
+        Stage("doacao", gerar_doacoes, {"anos": anos}, ("interno_usp", "equipamento")),
+        Stage("emprestimo_equipamento", gerar_emprestimo_equipamento, {}, ("interno_usp", "equipamento")),
+        # Domínio: Reservas
+        Stage("reserva", gerar_reservas, {"anos": anos}, ("interno_usp", "instalacao"), batched=True),
+        Stage(
+            "reserva_equipamento",
+            gerar_reservas_equipamento,
+            {"quantidade": 500 * scale, "anos": anos},
+            ("interno_usp", "equipamento"),
+        ),
+        # Domínio: Atividades
+        Stage("atividade", gerar_atividades, {"quantidade": 16 * scale, "anos": anos}),
+        Stage("ocorrencia_semanal", popular_ocorrencias, {}, ("atividade", "instalacao")),
+        Stage("conduz_atividade", gerar_conduz_atividade, {}, ("atividade", "educador_fisico")),
+        Stage("participacao_atividade", gerar_participacao_atividade, {"anos": anos}, ("atividade", "interno_usp")),
+        Stage("convite_externo", gerar_convite_externo, {}, ("atividade", "interno_usp")),
+        # Domínio: Eventos
+        Stage("evento", gerar_eventos, {}, ("reserva",)),
+        Stage("supervisao_evento", gerar_supervisao_evento, {}, ("evento", "funcionario")),
+        # Domínio: Grupos
+        Stage("grupo_extensao", gerar_grupos_extensao, {"quantidade_grupos": 4 * scale}, ("interno_usp",)),
+        Stage("atividade_grupo_extensao", gerar_atividade_grupo_extensao, {}, ("atividade", "grupo_extensao")),
+        # Domínio: Autenticação e Auditoria
+        Stage(
+            "auditoria_login",
+            gerar_auditoria_login,
+            {"quantidade": 2000 * scale, "anos": anos},
+            ("usuario_senha",),
+        ),
+        Stage("solicitacao_cadastro", gerar_solicitacao_cadastro, {}, ("interno_usp", "funcionario")),
+        Stage(
+            "metrica_acesso_diaria",
+            gerar_metrica_acesso_diaria,
+            {"dias": min(180 * scale, 365 * anos)},
+            ("interno_usp", "funcionario"),
+        ),
+    ]
+
+
+GENERATION_ORDER = generation_order()
+
+
+def populate_database(dbsession, scale=None, workers=None, connect=None, seed=None):
     """
     Popula o banco de dados com todos os dados sintéticos.
 
+    Se uma população anterior foi interrompida, ela é retomada com a mesma
+    semente e escala a partir das etapas não concluídas.
+
     Args:
         dbsession: Instância de DBSession para executar as operações
+        scale: Fator de escala dos tamanhos (padrão: POPULATE_SCALE ou 1)
+        workers: Etapas simultâneas (padrão: POPULATE_WORKERS ou 4; 1 = sequencial)
+        connect: Cria a conexão de cada etapa paralela (padrão: nova DBSession
+            no mesmo schema de ``dbsession``)
+        seed: Semente da geração (padrão: POPULATE_SEED ou uma nova sorteada)
     """
+    seed, scale = iniciar_execucao(dbsession, seed=seed, scale=scale)
+    workers = resolve_workers(workers)
+    if connect is None:
+        def connect():
+            return DBSession(schema=dbsession.schema)
+
     print("=" * 60)
-    print("Iniciando população do banco de dados...")
+    print(f"Iniciando população do banco de dados (escala {scale}, semente {seed}, {workers} worker(s))...")
     print("=" * 60)
 
-    for table_name, generator_func, kwargs in GENERATION_ORDER:
+    try:
+        run_stages(generation_order(scale), dbsession, seed, workers=workers, connect=connect)
+    except Exception:
         print(f"\n{'=' * 60}")
-        print(f"Gerando dados para: {table_name}")
+        print(f"❌ Falha na geração de dados. Processo interrompido.")
         print(f"{'=' * 60}")
-        try:
-            generator_func(dbsession, **kwargs)
-            print(f"✅ {table_name} concluído.\n")
-        except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e)
-            print(f"❌ Erro ao gerar {table_name}:")
-            print(f"   Tipo: {error_type}")
-            print(f"   Mensagem: {error_msg}")
-            print(f"\n{'=' * 60}")
-            print(f"❌ Falha na geração de dados. Processo interrompido.")
-            print(f"{'=' * 60}")
-            import traceback
-            print("\nTraceback completo:")
-            traceback.print_exc()
-            raise
+        import traceback
+        print("\nTraceback completo:")
+        traceback.print_exc()
+        raise
 
+    concluir_execucao(dbsession)
     print("\n" + "=" * 60)
     print("✅ Todos os dados foram gerados e inseridos no banco com sucesso!")
     print("=" * 60)
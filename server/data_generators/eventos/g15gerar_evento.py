@@ -1,12 +1,11 @@
-import random
 import sys
-from faker import Faker
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import novo_faker, random
 
-fake = Faker('pt_BR')
+fake = novo_faker()
 
 def gerar_eventos(dbsession):
     # Buscar reservas existentes do banco
@@ -27,13 +26,10 @@ def gerar_eventos(dbsession):
         eventos_data.append((nome_evento, descricao, id_reserva))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO EVENTO (NOME, DESCRICAO, ID_RESERVA)
-        VALUES (%s, %s, %s)
-    """
+    colunas = ("NOME", "DESCRICAO", "ID_RESERVA")
 
     print(f"Inserindo {len(eventos_data)} eventos no banco...")
-    dbsession.executemany(query, eventos_data)
+    dbsession.copy_rows("EVENTO", colunas, eventos_data)
     print(f"✅ {len(eventos_data)} eventos inseridos com sucesso!")
     print(f"Total de reservas: {total_reservas}")
     print(f"Total de eventos gerados: {len(eventos_data)} ({len(eventos_data)/total_reservas:.0%})")
@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 def gerar_supervisao_evento(dbsession):
     # Buscar os funcionários do banco
@@ -34,13 +34,10 @@ def gerar_supervisao_evento(dbsession):
             supervisoes_data.append((cpf_funcionario, id_evento))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO SUPERVISAO_EVENTO (CPF_FUNCIONARIO, ID_EVENTO)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_FUNCIONARIO", "ID_EVENTO")
 
     print(f"Inserindo {len(supervisoes_data)} supervisões no banco...")
-    dbsession.executemany(query, supervisoes_data)
+    dbsession.copy_rows("SUPERVISAO_EVENTO", colunas, supervisoes_data)
     print(f"✅ {len(supervisoes_data)} supervisões inseridas com sucesso!")
     print(f"Total de eventos: {total_eventos}")
     print(f"Total de eventos supervisionados: {len(eventos_supervisionados)} ({len(eventos_supervisionados)/total_eventos:.0%})")
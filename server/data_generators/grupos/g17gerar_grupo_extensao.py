@@ -1,9 +1,10 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
+from data_generators.scale import replicar
 
 # Lista fixa de nomes de grupos de extensão
 NOMES_GRUPOS_EXTENSAO = [
@@ -16,6 +17,7 @@ NOMES_GRUPOS_EXTENSAO = [
 def gerar_grupos_extensao(dbsession, quantidade_grupos=4):
     """
     Gera dados fictícios para GRUPO_EXTENSAO com base em nomes fixos
+    (além deles, núcleos numerados: "Projeto Capoeira Angola - Núcleo 2")
     e insere diretamente no banco.
     """
 
@@ -27,12 +29,9 @@ def gerar_grupos_extensao(dbsession, quantidade_grupos=4):
         print("Aviso: Nenhum interno encontrado no banco.")
         return
 
-    # Definir quantos grupos gerar
-    num_a_selecionar = min(quantidade_grupos, len(NOMES_GRUPOS_EXTENSAO))
-    if quantidade_grupos > len(NOMES_GRUPOS_EXTENSAO):
-        print(f"Aviso: Solicitados {quantidade_grupos} grupos, mas só existem {len(NOMES_GRUPOS_EXTENSAO)} nomes disponíveis.")
-
-    nomes_selecionados = random.sample(NOMES_GRUPOS_EXTENSAO, num_a_selecionar)
+    nomes_selecionados = replicar(
+        NOMES_GRUPOS_EXTENSAO, quantidade_grupos, lambda nome, nucleo: f"{nome} - Núcleo {nucleo}"
+    )
 
     # Gerar os dados dos grupos
     grupos_data = []
@@ -42,13 +41,10 @@ def gerar_grupos_extensao(dbsession, quantidade_grupos=4):
         grupos_data.append((nome, descricao, cpf_responsavel))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO GRUPO_EXTENSAO (NOME_GRUPO, DESCRICAO, CPF_RESPONSAVEL_INTERNO)
-        VALUES (%s, %s, %s)
-    """
+    colunas = ("NOME_GRUPO", "DESCRICAO", "CPF_RESPONSAVEL_INTERNO")
 
     print(f"Inserindo {len(grupos_data)} grupos de extensão no banco...")
-    dbsession.executemany(query, grupos_data)
+    dbsession.copy_rows("GRUPO_EXTENSAO", colunas, grupos_data)
     print(f"✅ {len(grupos_data)} grupos inseridos com sucesso!")
     print(f"Total de grupos gerados: {len(grupos_data)}")
 
@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 def gerar_atividade_grupo_extensao(dbsession):
     """
@@ -42,7 +42,7 @@ def gerar_atividade_grupo_extensao(dbsession):
 
     #Buscar grupos de extensão (Nome) do banco
     grupos_result = dbsession.fetch_all("SELECT NOME_GRUPO FROM GRUPO_EXTENSAO ORDER BY NOME_GRUPO")
-    grupos_extensao = {}  # Ex: {"karate": "Grupo de Karatê Shotokan"}
+    grupos_extensao = {}  # Ex: {"karate": ["Grupo de Karatê Shotokan", "Grupo de Karatê Shotokan - Núcleo 2"]}
 
     for row in grupos_result:
         nome_grupo_exato = row['nome_grupo'].strip()
@@ -51,7 +51,7 @@ def gerar_atividade_grupo_extensao(dbsession):
         for chave, palavras in mapa_semantico.items():
             for palavra in palavras:
                 if palavra in nome_grupo_lower:
-                    grupos_extensao[chave] = nome_grupo_exato
+                    grupos_extensao.setdefault(chave, []).append(nome_grupo_exato)
                     break
 
     if not grupos_extensao:
@@ -65,11 +65,12 @@ def gerar_atividade_grupo_extensao(dbsession):
     for chave in mapa_semantico.keys():
         if chave in atividades_extensao and chave in grupos_extensao:
             ids_ativ = atividades_extensao[chave]
-            nome_grupo = grupos_extensao[chave]
-            print(f"  - {chave.capitalize()}: {len(ids_ativ)} atividade(s) → grupo '{nome_grupo}'")
+            nomes_grupos = grupos_extensao[chave]
+            print(f"  - {chave.capitalize()}: {len(ids_ativ)} atividade(s) → {len(nomes_grupos)} grupo(s)")
 
-            for id_atividade in ids_ativ:
-                registros_data.append((id_atividade, nome_grupo))
+            # Com vários núcleos do mesmo grupo, as turmas são distribuídas entre eles
+            for i, id_atividade in enumerate(ids_ativ):
+                registros_data.append((id_atividade, nomes_grupos[i % len(nomes_grupos)]))
         else:
             print(f"  - {chave.capitalize()}: sem correspondência encontrada (ignorando).")
 
@@ -78,13 +79,10 @@ def gerar_atividade_grupo_extensao(dbsession):
         return
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO ATIVIDADE_GRUPO_EXTENSAO (ID_ATIVIDADE, NOME_GRUPO)
-        VALUES (%s, %s)
-    """
+    colunas = ("ID_ATIVIDADE", "NOME_GRUPO")
 
     print(f"Inserindo {len(registros_data)} registros no banco...")
-    dbsession.executemany(query, registros_data)
+    dbsession.copy_rows("ATIVIDADE_GRUPO_EXTENSAO", colunas, registros_data)
     print(f"✅ {len(registros_data)} registros inseridos com sucesso!")
     print(f"Total de vínculos semânticos gerados: {len(registros_data)}")
 
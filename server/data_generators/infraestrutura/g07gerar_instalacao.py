@@ -1,9 +1,10 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
+from data_generators.scale import replicar
 
 # Dicionário de instalações únicas e coerentes
 NOMES_INSTALACOES_POR_TIPO = {
@@ -41,13 +42,12 @@ def gerar_instalacoes(dbsession, num_registros):
         for nome in nomes:
             instalacoes_unicas.append((nome, tipo))
 
-    # Ajusta caso o número solicitado exceda o disponível
-    if num_registros > len(instalacoes_unicas):
-        print(f"Aviso: número solicitado ({num_registros}) maior que o total disponível ({len(instalacoes_unicas)}).")
-        num_registros = len(instalacoes_unicas)
-
-    # Seleciona instalações únicas aleatoriamente
-    instalacoes_selecionadas = random.sample(instalacoes_unicas, num_registros)
+    # Além das instalações da lista, gera unidades numeradas ("Quadra de Tênis 1 - Unidade 2")
+    instalacoes_selecionadas = replicar(
+        instalacoes_unicas,
+        num_registros,
+        lambda instalacao, rodada: (f"{instalacao[0]} - Unidade {rodada}", instalacao[1]),
+    )
 
     # Gera os registros com ID, capacidade e reservabilidade
     instalacoes_data = []
@@ -58,13 +58,10 @@ def gerar_instalacoes(dbsession, num_registros):
         instalacoes_data.append((id_inst, nome, tipo, capacidade, eh_reservavel))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO INSTALACAO (ID_INSTALACAO, NOME, TIPO, CAPACIDADE, EH_RESERVAVEL)
-        VALUES (%s, %s, %s, %s, %s)
-    """
+    colunas = ("ID_INSTALACAO", "NOME", "TIPO", "CAPACIDADE", "EH_RESERVAVEL")
 
     print(f"Inserindo {len(instalacoes_data)} instalações no banco...")
-    dbsession.executemany(query, instalacoes_data)
+    dbsession.copy_rows("INSTALACAO", colunas, instalacoes_data)
     print(f"✅ {len(instalacoes_data)} instalações inseridas com sucesso!")
 
 
@@ -1,10 +1,12 @@
-import random
 import sys
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
+from data_generators.scale import data_aleatoria
+from data_generators.synth import inteiros_unicos, novo_rng
 
 # Listas separadas logicamente
 ITENS_RESERVAVEIS = [
@@ -39,12 +41,14 @@ ITENS_NAO_RESERVAVEIS = [
     "Colchonete de Pilates", "Cordas de Escada", "Protetores de Tornozelo", "Bola de Basquete de Rua"
 ]
 
-def gerar_id_patrimonio(ids_gerados):
-    while True:
-        id_patrimonio = f"EQ{random.randint(100000, 999999)}"
-        if id_patrimonio not in ids_gerados:
-            ids_gerados.add(id_patrimonio)
-            return id_patrimonio
+# IDs de patrimônio (EQ + 6 dígitos) distintos entre si e dos já cadastrados
+def gerar_ids_patrimonio(dbsession, quantidade):
+    existentes = dbsession.fetch_all("SELECT ID_PATRIMONIO FROM EQUIPAMENTO")
+    numeros_usados = [
+        int(row['id_patrimonio'][2:]) for row in existentes if row['id_patrimonio'][2:].isdigit()
+    ]
+    numeros = inteiros_unicos(novo_rng(), 100000, 1000000, quantidade, excluir=numeros_usados)
+    return [f"EQ{numero}" for numero in numeros.tolist()]
 
 def gerar_preco_aquisicao(eh_reservavel):
     if eh_reservavel == 'N':
@@ -52,14 +56,12 @@ def gerar_preco_aquisicao(eh_reservavel):
     if eh_reservavel == 'S':
         return round(random.uniform(100.00, 500.00), 2)
 
-def gerar_data_aquisicao():
-    start_date = datetime(2018, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    return (start_date + timedelta(days=random_days)).date()
+# Aquisições cobrem o histórico de reservas e mais cinco anos antes dele
+def gerar_data_aquisicao(anos=1):
+    hoje = date.today()
+    return data_aleatoria(hoje - timedelta(days=365 * (anos + 5)), hoje)
 
-def gerar_equipamentos(dbsession):
+def gerar_equipamentos(dbsession, quantidade=200, anos=1):
     # Buscar as instalações do banco
     instalacoes_result = dbsession.fetch_all("SELECT ID_INSTALACAO, NOME, TIPO FROM INSTALACAO ORDER BY ID_INSTALACAO")
 
@@ -91,11 +93,8 @@ def gerar_equipamentos(dbsession):
         locais_deposito = todos_locais
 
     equipamentos_data = []
-    ids_gerados = set()
-
-    for _ in range(200):
-        id_patrimonio = gerar_id_patrimonio(ids_gerados)
 
+    for id_patrimonio in gerar_ids_patrimonio(dbsession, quantidade):
         if random.choice([True, False]):
             # Caso: Item NÃO RESERVÁVEL (Academia)
             nome_equipamento = random.choice(ITENS_NAO_RESERVAVEIS)
@@ -110,18 +109,22 @@ def gerar_equipamentos(dbsession):
             id_instalacao_local = random.choice(locais_deposito)
 
         preco_aquisicao = gerar_preco_aquisicao(eh_reservavel)
-        data_aquisicao = gerar_data_aquisicao()
+        data_aquisicao = gerar_data_aquisicao(anos)
 
         equipamentos_data.append((id_patrimonio, nome_equipamento, id_instalacao_local, preco_aquisicao, data_aquisicao, eh_reservavel))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO EQUIPAMENTO (ID_PATRIMONIO, NOME, ID_INSTALACAO_LOCAL, PRECO_AQUISICAO, DATA_AQUISICAO, EH_RESERVAVEL)
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """
+    colunas = (
+        "ID_PATRIMONIO",
+        "NOME",
+        "ID_INSTALACAO_LOCAL",
+        "PRECO_AQUISICAO",
+        "DATA_AQUISICAO",
+        "EH_RESERVAVEL",
+    )
 
     print(f"Inserindo {len(equipamentos_data)} equipamentos no banco...")
-    dbsession.executemany(query, equipamentos_data)
+    dbsession.copy_rows("EQUIPAMENTO", colunas, equipamentos_data)
     print(f"✅ {len(equipamentos_data)} equipamentos inseridos com sucesso!")
 
 if __name__ == "__main__":
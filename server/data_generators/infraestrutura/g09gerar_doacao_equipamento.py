@@ -1,20 +1,18 @@
-import random
 import sys
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
+from data_generators.scale import data_aleatoria
 
-# Função para gerar uma data de doação aleatória
-def gerar_data_doacao():
-    start_date = datetime(2015, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    return (start_date + timedelta(days=random_days)).date()
+# Função para gerar uma data de doação aleatória (histórico e mais oito anos antes dele)
+def gerar_data_doacao(anos=1):
+    hoje = date.today()
+    return data_aleatoria(hoje - timedelta(days=365 * (anos + 8)), hoje)
 
-def gerar_doacoes(dbsession):
+def gerar_doacoes(dbsession, anos=1):
     # Buscar pessoas que não são internas (pessoas restantes)
     pessoas_result = dbsession.fetch_all("""
         SELECT CPF FROM PESSOA
@@ -30,36 +28,29 @@ def gerar_doacoes(dbsession):
     if not ids_equipamentos:
         raise ValueError("Não há equipamentos disponíveis para doação!")
 
-    # Criar conjunto de equipamentos disponíveis (evita duplicatas)
-    equipamentos_disponiveis = set(ids_equipamentos)
-
     # Selecionar 15% das pessoas aleatoriamente
     total_pessoas = len(cpfs_pessoas)
     percentual_15 = max(1, int(total_pessoas * 0.15))
     cpfs_selecionados = random.sample(cpfs_pessoas, percentual_15)
 
     # Garantir que não geraremos mais doações do que equipamentos disponíveis
-    num_doacoes = min(len(cpfs_selecionados), len(equipamentos_disponiveis))
+    num_doacoes = min(len(cpfs_selecionados), len(ids_equipamentos))
     cpfs_selecionados = cpfs_selecionados[:num_doacoes]
 
-    doacoes_data = []
+    # Cada equipamento é doado no máximo uma vez
+    equipamentos_doados = random.sample(ids_equipamentos, num_doacoes)
 
-    for cpf_doador in cpfs_selecionados:
-        # Escolher equipamento aleatório sem repetição
-        id_equipamento = random.choice(list(equipamentos_disponiveis))
-        equipamentos_disponiveis.remove(id_equipamento)
+    doacoes_data = []
 
-        data_doacao = gerar_data_doacao()
+    for cpf_doador, id_equipamento in zip(cpfs_selecionados, equipamentos_doados):
+        data_doacao = gerar_data_doacao(anos)
         doacoes_data.append((id_equipamento, cpf_doador, data_doacao))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO DOACAO (ID_EQUIPAMENTO, CPF_DOADOR, DATA_DOACAO)
-        VALUES (%s, %s, %s)
-    """
+    colunas = ("ID_EQUIPAMENTO", "CPF_DOADOR", "DATA_DOACAO")
 
     print(f"Inserindo {len(doacoes_data)} doações no banco...")
-    dbsession.executemany(query, doacoes_data)
+    dbsession.copy_rows("DOACAO", colunas, doacoes_data)
     print(f"✅ {len(doacoes_data)} doações inseridas com sucesso!")
     print(f"Total de doações geradas: {len(doacoes_data)} (sobre {total_pessoas} pessoas)")
 
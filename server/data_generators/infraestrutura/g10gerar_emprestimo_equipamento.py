@@ -1,10 +1,10 @@
-import random
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Status possíveis para empréstimos
 STATUS_EMPRESTIMO = ['EM_PREPARACAO', 'RETIRADO', 'DEVOLVIDO', 'CANCELADO']
@@ -97,46 +97,20 @@ def gerar_emprestimo_equipamento(dbsession):
                 observacoes
             ))
 
-    # Inserir diretamente no banco
-    query_com_obs = """
-        INSERT INTO EMPRESTIMO_EQUIPAMENTO (
-            ID_EQUIPAMENTO,
-            CPF_RESPONSAVEL_INTERNO,
-            QUANTIDADE,
-            DATA_EMPRESTIMO,
-            DATA_DEVOLUCAO_PREVISTA,
-            DATA_DEVOLUCAO_REAL,
-            STATUS,
-            OBSERVACOES
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    query_sem_obs = """
-        INSERT INTO EMPRESTIMO_EQUIPAMENTO (
-            ID_EQUIPAMENTO,
-            CPF_RESPONSAVEL_INTERNO,
-            QUANTIDADE,
-            DATA_EMPRESTIMO,
-            DATA_DEVOLUCAO_PREVISTA,
-            DATA_DEVOLUCAO_REAL,
-            STATUS
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
+    # Inserir diretamente no banco (OBSERVACOES None vira NULL)
+    colunas = (
+        "ID_EQUIPAMENTO",
+        "CPF_RESPONSAVEL_INTERNO",
+        "QUANTIDADE",
+        "DATA_EMPRESTIMO",
+        "DATA_DEVOLUCAO_PREVISTA",
+        "DATA_DEVOLUCAO_REAL",
+        "STATUS",
+        "OBSERVACOES",
+    )
 
     print(f"Inserindo {len(emprestimos_data)} empréstimos de equipamentos no banco...")
-
-    # Separar por tipo para executar queries apropriadas
-    com_obs = [(e, c, q, de, dp, dr, s, o)
-               for e, c, q, de, dp, dr, s, o in emprestimos_data if o is not None]
-    sem_obs = [(e, c, q, de, dp, dr, s)
-               for e, c, q, de, dp, dr, s, o in emprestimos_data if o is None]
-
-    if com_obs:
-        dbsession.executemany(query_com_obs, com_obs)
-    if sem_obs:
-        dbsession.executemany(query_sem_obs, sem_obs)
+    dbsession.copy_rows("EMPRESTIMO_EQUIPAMENTO", colunas, emprestimos_data)
 
     print(f"✅ {len(emprestimos_data)} empréstimos de equipamentos inseridos com sucesso!")
 
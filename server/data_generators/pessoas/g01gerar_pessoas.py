@@ -1,33 +1,17 @@
-from faker import Faker
-import random
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
-
-
-# Função para gerar CPF válido
-def gerar_cpf():
-    def calcular_dv(cpf_base):
-        cpf_base = [int(d) for d in cpf_base]
-        for i in range(2):
-            peso = list(range(10 - i, 1, -1)) if i == 0 else list(range(11 - i, 1, -1))
-            soma = sum([cpf_base[j] * peso[j] for j in range(len(peso))])
-            resto = soma % 11
-            digito = 0 if resto < 2 else 11 - resto
-            cpf_base.append(digito)
-        return "".join(map(str, cpf_base))
-
-    while True:
-        cpf_base = [str(random.randint(0, 9)) for _ in range(9)]
-        cpf = calcular_dv(cpf_base)
-        if cpf[0] != "0":  # opcional, evitar CPF começando com 0
-            return cpf
+from data_generators.progress import lotes
+from data_generators.seeding import novo_faker, random
+from data_generators.synth import bases_de_cpfs, gerar_pessoas_sinteticas, novo_rng, ordenados_unicos
 
 
 # Inicializa Faker
-fake = Faker("pt_BR")
+fake = novo_faker()
 
 # Emails fixos para login de testes
 EMAIL_ADMIN = "admin@usp.br"
@@ -35,19 +19,48 @@ EMAIL_INTERNO = "interno@usp.br"
 EMAIL_FUNCIONARIO = "funcionario@usp.br"
 EMAIL_TESTE_CADASTRO = "cadastro@usp.br"
 
+# Pessoas por lote (cada lote é gravado e registrado numa transação)
+PESSOAS_POR_LOTE = 50_000
+
+
+class PessoasExistentes:
+    """CPFs e emails já usados, lidos do banco uma vez e acrescidos a cada lote."""
+
+    def __init__(self, dbsession):
+        pessoas = dbsession.fetch_all("SELECT CPF, EMAIL FROM PESSOA")
+        self.cpfs = {row['cpf'] for row in pessoas}
+        self.emails = {row['email'] for row in pessoas}
+        # Ordenadas e sem repetição: inteiros_unicos não precisa reordenar a cada lote
+        self.bases = ordenados_unicos(bases_de_cpfs(self.cpfs))
+
+    def adicionar(self, pessoas_data):
+        cpfs = [pessoa[0] for pessoa in pessoas_data]
+        self.cpfs.update(cpfs)
+        self.emails.update(pessoa[2] for pessoa in pessoas_data)
+        self.bases = ordenados_unicos(np.concatenate([self.bases, bases_de_cpfs(cpfs)]))
+
 
 def gerar_pessoas(dbsession, quantidade):
-    # Verificar quais CPFs e emails já existem no banco
-    pessoas_existentes = dbsession.fetch_all("SELECT CPF, EMAIL FROM PESSOA")
-    cpfs_existentes = {row['cpf'] for row in pessoas_existentes}
-    emails_existentes = {row['email'] for row in pessoas_existentes}
+    total_lotes = max(-(-quantidade // PESSOAS_POR_LOTE), 1)
+    print(f"Gerando {quantidade} pessoas em {total_lotes} lote(s)...")
 
-    cpfs_gerados = set()  # Garante CPFs únicos no batch atual
-    emails_usados = set()  # Garante emails únicos no batch atual
+    # Lido uma vez (numa retomada, já inclui os lotes gravados); reler a
+    # tabela a cada lote tornaria a geração quadrática
+    existentes = PessoasExistentes(dbsession)
+    for lote in lotes(dbsession, total_lotes):
+        tamanho = min(PESSOAS_POR_LOTE, quantidade - lote * PESSOAS_POR_LOTE)
+        # Usuários de teste entram no primeiro lote
+        gerar_lote_pessoas(dbsession, tamanho, incluir_teste=lote == 0, existentes=existentes)
 
-    pessoas_data = []
 
-    print(f"Gerando {quantidade} pessoas...")
+def gerar_lote_pessoas(dbsession, quantidade, incluir_teste=True, existentes=None):
+    # CPFs e emails já usados (no banco e nos lotes anteriores desta execução)
+    if existentes is None:
+        existentes = PessoasExistentes(dbsession)
+    cpfs_existentes = existentes.cpfs
+    emails_existentes = existentes.emails
+
+    pessoas_data = []
 
     # Criar usuários de teste no início
     # CPFs fixos para garantir consistência entre repopulações
@@ -56,7 +69,7 @@ def gerar_pessoas(dbsession, quantidade):
         ("interno@usp.br", "Interno Teste", "75005018033"),
         ("funcionario@usp.br", "Funcionário Teste", "75005018111"),
         ("cadastro@usp.br", "Teste Cadastro", "01995923222"),
-    ]
+    ] if incluir_teste else []
 
     for email_teste, nome_teste, cpf_fixo in usuarios_teste:
         # Verificar se já existe no banco
@@ -65,7 +78,6 @@ def gerar_pessoas(dbsession, quantidade):
             continue
 
         cpf_teste = cpf_fixo
-        cpfs_gerados.add(cpf_teste)
 
         celular_teste = (
             f"(11) 9{random.randint(1000, 9999)}-{random.randint(1000, 9999)}"
@@ -81,58 +93,39 @@ def gerar_pessoas(dbsession, quantidade):
                 data_nascimento_teste,
             )
         )
-        emails_usados.add(email_teste)
         print(f"   📧 Email fixo para login: {email_teste} (CPF: {cpf_teste})")
 
+    # Usuários de teste passam a contar como existentes para as demais
+    existentes.adicionar(pessoas_data)
+
     # Calcular quantas pessoas ainda precisam ser geradas
     pessoas_restantes = quantidade - len(pessoas_data)
 
-    for i in range(pessoas_restantes):
-        # Gera CPF único (não existe no banco nem no batch atual)
-        cpf = gerar_cpf()
-        tentativas_cpf = 0
-        while cpf in cpfs_existentes or cpf in cpfs_gerados:
-            cpf = gerar_cpf()
-            tentativas_cpf += 1
-            if tentativas_cpf > 1000:
-                # Se não conseguir gerar após muitas tentativas, pular esta pessoa
-                print(f"   ⚠️  Não foi possível gerar CPF único após 1000 tentativas. Pulando pessoa {i+1}.")
-                continue
-
-        cpfs_gerados.add(cpf)
-
-        nome = fake.name()
-
-        # Gera email único (não existe no banco nem no batch atual)
-        email = fake.email()
-        tentativas_email = 0
-        while email in emails_existentes or email in emails_usados:
-            email = fake.email()
-            tentativas_email += 1
-            if tentativas_email > 1000:
-                # Se não conseguir gerar após muitas tentativas, usar CPF como base
-                email = f"{cpf}@usp.br"
-                break
-        emails_usados.add(email)
-
-        celular = f"(11) 9{random.randint(1000, 9999)}-{random.randint(1000, 9999)}"
-        data_nascimento = fake.date_of_birth(minimum_age=18, maximum_age=80)
-
-        pessoas_data.append((cpf, nome, email, celular, data_nascimento))
+    # Demais pessoas geradas em colunas (CPF e email únicos por construção,
+    # já excluindo os existentes no banco e os dos usuários de teste)
+    if pessoas_restantes > 0:
+        sinteticas = gerar_pessoas_sinteticas(
+            novo_rng(),
+            pessoas_restantes,
+            emails_excluidos=emails_existentes,
+            bases_excluidas=existentes.bases,
+        )
+        existentes.adicionar(sinteticas)
+        pessoas_data += sinteticas
 
     if not pessoas_data:
         print("⚠️  Nenhuma pessoa nova para inserir. Todas já existem no banco.")
         return
 
-    # Inserir diretamente no banco usando executemany com ON CONFLICT
+    # Inserir diretamente no banco em páginas de várias linhas, com ON CONFLICT
     query = """
         INSERT INTO PESSOA (CPF, NOME, EMAIL, CELULAR, DATA_NASCIMENTO)
-        VALUES (%s, %s, %s, %s, %s)
+        VALUES %s
         ON CONFLICT (CPF) DO NOTHING
     """
 
     print(f"Inserindo {len(pessoas_data)} pessoas no banco...")
-    dbsession.executemany(query, pessoas_data)
+    dbsession.insert_values(query, pessoas_data)
     print(f"✅ {len(pessoas_data)} pessoas inseridas com sucesso!")
 
 
@@ -1,34 +1,10 @@
-import random
 import sys
-import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
-
-# Função para gerar um NUSP aleatório (5 a 8 dígitos) que não existe no banco
-def gerar_nusp(dbsession, max_tentativas=100):
-    """
-    Gera um NUSP único verificando se já existe no banco.
-
-    Args:
-        dbsession: Instância de DBSession para consultar o banco
-        max_tentativas: Número máximo de tentativas para gerar um NUSP único
-
-    Returns:
-        str: NUSP único
-    """
-    for _ in range(max_tentativas):
-        nusp = f"{random.randint(10000, 99999999)}"
-        # Verificar se o NUSP já existe
-        existe = dbsession.fetch_one(
-            "SELECT 1 FROM INTERNO_USP WHERE NUSP = %s",
-            (nusp,)
-        )
-        if not existe:
-            return nusp
-    # Se não conseguiu gerar um único após max_tentativas, usar timestamp + random
-    return f"{int(time.time()) % 100000000}{random.randint(1000, 9999)}"
+from data_generators.seeding import random
+from data_generators.synth import inteiros_unicos, novo_rng
 
 # Função para dividir os dados em 90% para internos e 10% para pessoas restantes
 def gerar_interno_usp(dbsession):
@@ -75,59 +51,43 @@ def gerar_interno_usp(dbsession):
     # Inserir os CPFs de teste no início para garantir
     cpfs_internos = cpfs_teste + cpfs_internos
 
-    # Verificar quais CPFs já têm internos cadastrados
-    cpfs_existentes = set()
-    if cpfs_internos:
-        cpfs_str = "', '".join(cpfs_internos)
-        existentes_result = dbsession.fetch_all(
-            f"SELECT CPF_PESSOA FROM INTERNO_USP WHERE CPF_PESSOA IN ('{cpfs_str}')"
-        )
-        cpfs_existentes = {row['cpf_pessoa'] for row in existentes_result}
+    # Internos já cadastrados e NUSPs em uso, carregados uma vez
+    # (evita uma consulta por interno)
+    existentes_result = dbsession.fetch_all("SELECT CPF_PESSOA, NUSP FROM INTERNO_USP")
+    cpfs_existentes = {row['cpf_pessoa'] for row in existentes_result}
+    nusps_usados = {row['nusp'] for row in existentes_result}
 
     # Preparar dados para inserção no banco (apenas para CPFs que não têm interno ainda)
     internos_data = []
-    nusps_gerados = set()  # Para evitar duplicatas no mesmo batch
+    cpfs_sem_nusp = []
 
     for cpf_pessoa in cpfs_internos:
-        if cpf_pessoa not in cpfs_existentes:
-            # Verificar se é email de teste para usar NUSP fixo
-            email_pessoa = email_para_cpf.get(cpf_pessoa)
-            if email_pessoa and email_pessoa in NUSPS_TESTE:
-                # Usar NUSP fixo para emails de teste
-                nusp = NUSPS_TESTE[email_pessoa]
-                # Verificar se o NUSP fixo já existe (pode existir de execução anterior)
-                nusp_existe = dbsession.fetch_one(
-                    "SELECT 1 FROM INTERNO_USP WHERE NUSP = %s AND CPF_PESSOA != %s",
-                    (nusp, cpf_pessoa)
-                )
-                if nusp_existe:
-                    # Se o NUSP fixo já está em uso por outro CPF, gerar um novo
-                    print(f"   ⚠️  NUSP fixo {nusp} já está em uso. Gerando novo NUSP para {email_pessoa}")
-                    nusp = gerar_nusp(dbsession)
-                    tentativas = 0
-                    while nusp in nusps_gerados:
-                        nusp = gerar_nusp(dbsession)
-                        tentativas += 1
-                        if tentativas > 100:
-                            nusp = f"{int(time.time() * 1000) % 100000000}{random.randint(1000, 9999)}"
-                            break
-                else:
-                    print(f"   📧 Usando NUSP fixo {nusp} para {email_pessoa}")
-            else:
-                # Gerar NUSP único para usuários normais (não existe no banco nem no batch atual)
-                nusp = gerar_nusp(dbsession)
-                tentativas = 0
-                while nusp in nusps_gerados:  # gerar_nusp já verifica no banco
-                    nusp = gerar_nusp(dbsession)
-                    tentativas += 1
-                    if tentativas > 100:
-                        # Fallback: usar timestamp + random para garantir unicidade
-                        nusp = f"{int(time.time() * 1000) % 100000000}{random.randint(1000, 9999)}"
-                        break
-
-            nusps_gerados.add(nusp)
+        if cpf_pessoa in cpfs_existentes:
+            continue
+        # Verificar se é email de teste para usar NUSP fixo
+        email_pessoa = email_para_cpf.get(cpf_pessoa)
+        nusp = NUSPS_TESTE.get(email_pessoa)
+        if nusp is None:
+            cpfs_sem_nusp.append(cpf_pessoa)
+        elif nusp in nusps_usados:
+            # NUSP fixo já em uso por outro CPF (execução anterior): sortear um novo
+            print(f"   ⚠️  NUSP fixo {nusp} já está em uso. Gerando novo NUSP para {email_pessoa}")
+            cpfs_sem_nusp.append(cpf_pessoa)
+        else:
+            print(f"   📧 Usando NUSP fixo {nusp} para {email_pessoa}")
+            nusps_usados.add(nusp)
             internos_data.append((cpf_pessoa, nusp))
 
+    # NUSPs (5 a 8 dígitos) sorteados de uma vez, distintos entre si e dos já usados
+    nusps = inteiros_unicos(
+        novo_rng(),
+        10000,
+        100_000_000,
+        len(cpfs_sem_nusp),
+        excluir=(int(nusp) for nusp in nusps_usados if nusp.isdigit()),
+    )
+    internos_data += zip(cpfs_sem_nusp, map(str, nusps.tolist()))
+
     if not internos_data:
         print("⚠️  Todos os CPFs já possuem internos cadastrados. Nada a inserir.")
         return
@@ -136,12 +96,12 @@ def gerar_interno_usp(dbsession):
     # NUSP já é verificado antes de inserir, então só precisamos verificar CPF
     query = """
         INSERT INTO INTERNO_USP (CPF_PESSOA, NUSP)
-        VALUES (%s, %s)
+        VALUES %s
         ON CONFLICT (CPF_PESSOA) DO NOTHING
     """
 
     print(f"Inserindo {len(internos_data)} internos no banco...")
-    dbsession.executemany(query, internos_data)
+    dbsession.insert_values(query, internos_data)
     print(f"✅ {len(internos_data)} internos inseridos com sucesso!")
 
 if __name__ == "__main__":
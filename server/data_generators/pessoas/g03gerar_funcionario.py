@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Função para gerar uma formação aleatória (exemplo)
 def gerar_formacao():
@@ -62,13 +62,10 @@ def gerar_funcionarios(dbsession):
         funcionarios_data.append((cpf_pessoa, formacao))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO FUNCIONARIO (CPF_INTERNO, FORMACAO)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_INTERNO", "FORMACAO")
 
     print(f"Inserindo {len(funcionarios_data)} funcionários no banco...")
-    dbsession.executemany(query, funcionarios_data)
+    dbsession.copy_rows("FUNCIONARIO", colunas, funcionarios_data)
     print(f"✅ {len(funcionarios_data)} funcionários inseridos com sucesso!")
 
 if __name__ == "__main__":
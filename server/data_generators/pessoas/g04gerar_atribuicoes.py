@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Função para gerar uma atribuição aleatória para o contexto de Educação Física, Esportes e Recreação
 def gerar_atribuicao():
@@ -57,13 +57,10 @@ def gerar_atribuicoes_funcionario(dbsession):
         atribuicoes_data.append((cpf_funcionario, atribuicao))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO FUNCIONARIO_ATRIBUICAO (CPF_FUNCIONARIO, ATRIBUICAO)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_FUNCIONARIO", "ATRIBUICAO")
 
     print(f"Inserindo {len(atribuicoes_data)} atribuições no banco...")
-    dbsession.executemany(query, atribuicoes_data)
+    dbsession.copy_rows("FUNCIONARIO_ATRIBUICAO", colunas, atribuicoes_data)
     print(f"✅ {len(atribuicoes_data)} atribuições inseridas com sucesso!")
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Função para gerar uma restrição física aleatória
 def gerar_restricao_fisica():
@@ -41,13 +41,10 @@ def gerar_restricoes_funcionario(dbsession):
         restricoes_data.append((cpf_funcionario, restricao_fisica))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO FUNCIONARIO_RESTRICAO (CPF_FUNCIONARIO, RESTRICAO_FISICA)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_FUNCIONARIO", "RESTRICAO_FISICA")
 
     print(f"Inserindo {len(restricoes_data)} restrições no banco...")
-    dbsession.executemany(query, restricoes_data)
+    dbsession.copy_rows("FUNCIONARIO_RESTRICAO", colunas, restricoes_data)
     print(f"✅ {len(restricoes_data)} restrições inseridas com sucesso!")
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Função para gerar um número de conselho aleatório
 def gerar_numero_conselho():
@@ -24,18 +24,23 @@ def gerar_educadores_fisicos(dbsession):
 
     # Montar os dados para o educador físico
     educadores_data = []
+    # NUMERO_CONSELHO é único; em escala, sorteios repetidos passam a ser prováveis
+    conselhos_usados = {
+        row['numero_conselho']
+        for row in dbsession.fetch_all("SELECT NUMERO_CONSELHO FROM EDUCADOR_FISICO")
+    }
     for cpf_funcionario in cpfs_selecionados:
         numero_conselho = gerar_numero_conselho()
+        while numero_conselho in conselhos_usados:
+            numero_conselho = gerar_numero_conselho()
+        conselhos_usados.add(numero_conselho)
         educadores_data.append((cpf_funcionario, numero_conselho))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO EDUCADOR_FISICO (CPF_FUNCIONARIO, NUMERO_CONSELHO)
-        VALUES (%s, %s)
-    """
+    colunas = ("CPF_FUNCIONARIO", "NUMERO_CONSELHO")
 
     print(f"Inserindo {len(educadores_data)} educadores físicos no banco...")
-    dbsession.executemany(query, educadores_data)
+    dbsession.copy_rows("EDUCADOR_FISICO", colunas, educadores_data)
     print(f"✅ {len(educadores_data)} educadores físicos inseridos com sucesso!")
 
 if __name__ == "__main__":
@@ -1,10 +1,10 @@
-import random
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.seeding import random
 
 # Senha padrão para testes (será hasheada pelo PostgreSQL)
 SENHA_PADRAO = "senha123"
@@ -51,6 +51,7 @@ def gerar_usuario_senha(dbsession):
         SELECT I.CPF_PESSOA, P.EMAIL
         FROM INTERNO_USP I
         JOIN PESSOA P ON I.CPF_PESSOA = P.CPF
+        ORDER BY I.CPF_PESSOA
     """)
     internos_dict = {row["cpf_pessoa"]: row["email"] for row in internos_result}
     cpfs_internos = list(internos_dict.keys())
@@ -157,32 +158,23 @@ def gerar_usuario_senha(dbsession):
 
     print("   ✅ Hash gerado com sucesso!")
 
-    # Buscar tipos de usuário usando função get_user_type
+    # Buscar tipos de usuário usando função get_user_type (uma única consulta)
     print("   Determinando tipos de usuário...")
-    tipos_usuarios = {}
-    with dbsession.connection.cursor() as cursor:
-        for cpf in cpfs_internos:
-            cursor.execute("SELECT get_user_type(%s) as tipo", (cpf,))
-            result = cursor.fetchone()
-            tipos_usuarios[cpf] = result[0] if result and result[0] else 'Interno'
+    tipos_result = dbsession.fetch_all("""
+        SELECT I.CPF_PESSOA, get_user_type(I.CPF_PESSOA) AS TIPO
+        FROM INTERNO_USP I
+    """)
+    tipos_usuarios = {row["cpf_pessoa"]: row["tipo"] or 'Interno' for row in tipos_result}
 
     print("   ✅ Tipos determinados!")
 
-    # Inserir usando hash pré-gerado (muito mais rápido)
-    query = """
-        INSERT INTO USUARIO_SENHA (
-            CPF, LOGIN, SENHA, TIPO,
-            SENHA_HASH,
-            DATA_CRIACAO, DATA_ULTIMA_ALTERACAO,
-            BLOQUEADO, TENTATIVAS_LOGIN, DATA_ULTIMO_LOGIN
-        )
-        VALUES (
-            %s, %s, %s, %s,
-            %s,
-            %s, %s,
-            %s, %s, %s
-        )
-    """
+    # Inserir com COPY usando hash pré-gerado (PAPEIS é preenchido pelo trigger)
+    colunas = (
+        "CPF", "LOGIN", "SENHA", "TIPO",
+        "SENHA_HASH",
+        "DATA_CRIACAO", "DATA_ULTIMA_ALTERACAO",
+        "BLOQUEADO", "TENTATIVAS_LOGIN", "DATA_ULTIMO_LOGIN",
+    )
 
     # Preparar dados com hash pré-gerado e novos campos do PF
     dados_com_hash = [
@@ -199,14 +191,14 @@ def gerar_usuario_senha(dbsession):
     ]
 
     try:
-        # Inserir em lotes para dar feedback de progresso
-        BATCH_SIZE = 500  # Lotes maiores agora que não precisamos gerar hash para cada um
+        # Inserir em lotes grandes (um COPY por lote) para dar feedback de progresso
+        BATCH_SIZE = 50000
         total = len(dados_com_hash)
         inserted = 0
 
         for i in range(0, total, BATCH_SIZE):
             batch = dados_com_hash[i:i + BATCH_SIZE]
-            dbsession.executemany(query, batch)
+            dbsession.copy_rows("USUARIO_SENHA", colunas, batch)
             inserted += len(batch)
 
             # Feedback de progresso
@@ -0,0 +1,185 @@
+"""
+Execução das etapas de geração como um grafo de dependências.
+
+Cada ``Stage`` declara as tabelas que precisa encontrar completas antes de
+rodar. Etapas independentes (infraestrutura x pessoas, auditoria x métricas)
+rodam em paralelo numa ``ThreadPoolExecutor``, cada uma com sua própria
+conexão; com ``workers`` = 1 tudo roda em sequência na sessão recebida. O
+psycopg2 libera o GIL enquanto espera o banco, então COPY, triggers, checagem
+de FKs e manutenção de índices de uma etapa correm junto com a geração em
+Python das outras.
+
+Cada etapa roda com o ``random`` semeado por ``data_generators.seeding`` e
+grava sua marca de conclusão (``data_generators.progress``) na mesma
+transação dos dados; etapas já concluídas numa execução anterior são puladas.
+Etapas com ``batched`` gerenciam as próprias transações, uma por lote.
+
+Ao final é impresso o tempo de cada etapa, a soma, o caminho crítico (maior
+cadeia de dependências) e o tempo total de parede.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, NamedTuple
+
+from data_generators.progress import concluir_etapa, etapa, etapas_concluidas
+
+WORKERS_ENV = "POPULATE_WORKERS"
+DEFAULT_WORKERS = 4
+
+
+class Stage(NamedTuple):
+    name: str
+    func: Callable[..., Any]
+    kwargs: dict[str, Any]
+    depends_on: tuple[str, ...] = ()
+    # Grava em lotes com ``progress.lotes`` (retomável no meio da etapa)
+    batched: bool = False
+
+
+def resolve_workers(workers=None):
+    """Número de etapas simultâneas informado, ou o de ``POPULATE_WORKERS``."""
+    if workers is None:
+        workers = os.environ.get(WORKERS_ENV) or DEFAULT_WORKERS
+    try:
+        workers = int(workers)
+    except (TypeError, ValueError):
+        raise ValueError(f"Número de workers inválido: {workers!r}") from None
+    return max(workers, 1)
+
+
+def validate_stages(stages):
+    """Confere nomes únicos, dependências conhecidas e que a lista já é uma ordem topológica."""
+    vistos = set()
+    for stage in stages:
+        if stage.name in vistos:
+            raise ValueError(f"Etapa duplicada: {stage.name}")
+        desconhecidas = [dep for dep in stage.depends_on if dep not in vistos]
+        if desconhecidas:
+            raise ValueError(
+                f"Etapa {stage.name} depende de {', '.join(desconhecidas)}, "
+                "que não aparece antes dela"
+            )
+        vistos.add(stage.name)
+
+
+def critical_path(stages, durations):
+    """Maior soma de durações ao longo de uma cadeia de dependências."""
+    termino = {}
+    for stage in stages:
+        inicio = max((termino[dep] for dep in stage.depends_on), default=0.0)
+        termino[stage.name] = inicio + durations.get(stage.name, 0.0)
+    return max(termino.values(), default=0.0)
+
+
+def _print_stage_error(name, exc):
+    print(f"❌ Erro ao gerar {name}:")
+    print(f"   Tipo: {type(exc).__name__}")
+    print(f"   Mensagem: {exc}")
+
+
+def _execute_stage(stage, dbsession, seed):
+    with etapa(stage.name, seed):
+        if stage.batched:
+            stage.func(dbsession, **stage.kwargs)
+            concluir_etapa(dbsession, stage.name)
+            return
+        with dbsession.transaction():
+            stage.func(dbsession, **stage.kwargs)
+            concluir_etapa(dbsession, stage.name)
+
+
+def _run_stage(stage, connect, seed):
+    dbsession = connect()
+    started = time.monotonic()
+    try:
+        _execute_stage(stage, dbsession, seed)
+    finally:
+        dbsession.close()
+    return time.monotonic() - started
+
+
+def run_stages(stages, dbsession, seed, workers=1, connect=None):
+    """Executa as etapas respeitando dependências e retorna a duração de cada uma.
+
+    ``seed`` é a semente da população; etapas já concluídas no banco são
+    puladas. ``connect`` cria a conexão de cada etapa quando ``workers`` > 1.
+    Se uma etapa falha, nenhuma outra é iniciada, as que estão rodando
+    terminam e o erro é relançado.
+    """
+    validate_stages(stages)
+    concluidas = etapas_concluidas(dbsession)
+    for stage in stages:
+        if stage.name in concluidas:
+            print(f"⏭️  {stage.name} já concluído numa execução anterior.")
+    durations = {}
+    started = time.monotonic()
+
+    if workers <= 1 or connect is None:
+        for stage in stages:
+            if stage.name in concluidas:
+                continue
+            print(f"\n{'=' * 60}")
+            print(f"Gerando dados para: {stage.name}")
+            print(f"{'=' * 60}")
+            stage_started = time.monotonic()
+            try:
+                _execute_stage(stage, dbsession, seed)
+            except Exception as exc:
+                _print_stage_error(stage.name, exc)
+                raise
+            durations[stage.name] = time.monotonic() - stage_started
+            print(f"✅ {stage.name} concluído em {durations[stage.name]:.1f}s.\n")
+    else:
+        _run_concurrently(stages, workers, connect, seed, concluidas, durations)
+
+    _print_timings(stages, durations, time.monotonic() - started)
+    return durations
+
+
+def _run_concurrently(stages, workers, connect, seed, concluidas, durations):
+    pendentes = [stage for stage in stages if stage.name not in concluidas]
+    concluidas = set(concluidas)
+    em_execucao = {}
+    erro = None
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="populate") as executor:
+        while pendentes or em_execucao:
+            if erro is None:
+                # Na ordem da lista, para que etapas do caminho longo comecem cedo
+                for stage in [s for s in pendentes if set(s.depends_on) <= concluidas]:
+                    pendentes.remove(stage)
+                    print(f"▶️  Iniciando {stage.name}")
+                    em_execucao[executor.submit(_run_stage, stage, connect, seed)] = stage
+            if not em_execucao:
+                break
+
+            prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for future in prontas:
+                stage = em_execucao.pop(future)
+                try:
+                    durations[stage.name] = future.result()
+                except Exception as exc:
+                    _print_stage_error(stage.name, exc)
+                    erro = erro or exc
+                    continue
+                concluidas.add(stage.name)
+                print(f"✅ {stage.name} concluído em {durations[stage.name]:.1f}s.")
+
+    if erro is not None:
+        nao_iniciadas = [stage.name for stage in pendentes]
+        if nao_iniciadas:
+            print(f"Etapas não executadas: {', '.join(nao_iniciadas)}")
+        raise erro
+
+
+def _print_timings(stages, durations, total):
+    print(f"\n{'=' * 60}")
+    print("Tempo por etapa:")
+    for stage in stages:
+        if stage.name in durations:
+            print(f"   {stage.name:<28} {durations[stage.name]:8.1f}s")
+    print(f"   {'soma das etapas':<28} {sum(durations.values()):8.1f}s")
+    print(f"   {'caminho crítico':<28} {critical_path(stages, durations):8.1f}s")
+    print(f"   {'tempo total':<28} {total:8.1f}s")
+    print(f"{'=' * 60}")
@@ -2,11 +2,23 @@
 Ponto de entrada único para popular o banco de dados.
 
 Este script cria o schema e popula o banco com dados sintéticos completos.
+
+Uso: ``python data_generators/populate.py [--scale N] [--workers N] [--seed N]``.
+O fator de escala também pode vir de ``POPULATE_SCALE`` (ver
+``data_generators/scale.py``), o número de etapas simultâneas de
+``POPULATE_WORKERS`` (ver ``data_generators/pipeline.py``) e a semente de
+``POPULATE_SEED`` (ver ``data_generators/seeding.py``). Uma população
+interrompida é retomada na próxima execução (ver ``data_generators/progress.py``).
 """
 
+import argparse
 from pathlib import Path
 from app.database import DBSession
 from data_generators.data_generator import populate_database
+from data_generators.pipeline import WORKERS_ENV
+from data_generators.progress import execucao_pendente
+from data_generators.scale import SCALE_ENV
+from data_generators.seeding import SEED_ENV
 
 
 def _database_has_data(dbsession):
@@ -82,6 +94,7 @@ def _apply_functions_and_triggers(dbsession):
         "internal_functions.sql",
         "staff_functions.sql",
         "common_triggers.sql",
+        "report_summaries.sql",
     ]
 
     sql_path = Path("./sql/functions")
@@ -93,8 +106,13 @@ def _apply_functions_and_triggers(dbsession):
             print(f"Erro ao aplicar funções: {e}")
 
 
-def populate_db():
-    """Cria o schema e popula o banco de dados com dados completos."""
+def populate_db(scale=None, workers=None, seed=None):
+    """Cria o schema e popula o banco de dados com dados completos.
+
+    ``scale`` multiplica os tamanhos da população (padrão: POPULATE_SCALE ou 1);
+    ``workers`` limita as etapas simultâneas (padrão: POPULATE_WORKERS ou 4);
+    ``seed`` fixa a semente (padrão: POPULATE_SEED ou uma nova sorteada).
+    """
     dbsession = DBSession()
 
     try:
@@ -121,8 +139,8 @@ def populate_db():
                 "Continuando mesmo assim (schema pode estar parcialmente criado)...\n"
             )
 
-        # Verificar se dados já existem
-        if _database_has_data(dbsession):
+        # Verificar se dados já existem (população interrompida é retomada)
+        if _database_has_data(dbsession) and not execucao_pendente(dbsession):
             print("\n" + "=" * 60)
             print("Banco de dados já contém dados. Pulando população.")
             print("=" * 60)
@@ -132,11 +150,31 @@ def populate_db():
         print("\n" + "=" * 60)
         print("Iniciando população do banco de dados...")
         print("=" * 60)
-        populate_database(dbsession)
+        populate_database(dbsession, scale=scale, workers=workers, seed=seed)
 
     finally:
         dbsession.close()
 
 
 if __name__ == "__main__":
-    populate_db()
+    parser = argparse.ArgumentParser(description="Popula o banco de dados com dados sintéticos.")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=None,
+        help=f"Fator de escala dos tamanhos (padrão: {SCALE_ENV} ou 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Etapas de geração simultâneas, cada uma com sua conexão (padrão: {WORKERS_ENV} ou 4; 1 = sequencial)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help=f"Semente da geração, para reconstruir a mesma base (padrão: {SEED_ENV} ou uma nova sorteada)",
+    )
+    args = parser.parse_args()
+    populate_db(scale=args.scale, workers=args.workers, seed=args.seed)
@@ -0,0 +1,184 @@
+"""
+Progresso da população sintética, para retomar execuções interrompidas.
+
+A semente e a escala da população em curso ficam em ``POPULACAO_EXECUCAO`` e
+cada etapa concluída em ``POPULACAO_ETAPA`` (``sql/populate_progress.sql``).
+A marca de conclusão é gravada na mesma transação dos dados da etapa, então
+uma etapa que falhou não deixa linhas para trás. Ao rodar de novo, a
+execução pendente é retomada com a mesma semente e escala: etapas concluídas
+são puladas e as demais recomeçam do zero.
+
+O rollback de uma etapa ou lote não devolve os valores já tirados das
+sequências das colunas identidade. Por isso, antes de retomar, cada sequência
+volta para o maior id gravado na sua tabela. Assim os ids, e as FKs das etapas
+seguintes, saem iguais aos de uma execução sem interrupção.
+
+Etapas grandes (``Stage.batched``) gravam em lotes com ``lotes``: cada lote é
+uma transação que também avança ``LOTES_CONCLUIDOS`` e é semeado pelo seu
+número, então a retomada continua do primeiro lote não gravado e gera as
+mesmas linhas que a execução original geraria.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from psycopg2 import sql
+
+from data_generators.scale import SCALE_ENV, resolve_scale
+from data_generators.seeding import SEED_ENV, resolve_seed, semear
+
+PROGRESS_SQL = Path(__file__).resolve().parent.parent / "sql" / "populate_progress.sql"
+
+# Etapa em execução na thread atual (preenchida pelo pipeline)
+_etapa_atual = threading.local()
+
+
+def garantir_tabelas(dbsession):
+    dbsession.execute(PROGRESS_SQL.read_text(encoding="utf-8"))
+
+
+def _informado(valor, env):
+    return valor if valor is not None else os.environ.get(env) or None
+
+
+def iniciar_execucao(dbsession, seed=None, scale=None):
+    """Retoma a população pendente ou registra uma nova; retorna (semente, escala).
+
+    Numa retomada, semente e escala informadas (ou de ``POPULATE_SEED`` e
+    ``POPULATE_SCALE``) precisam ser as da execução interrompida.
+    """
+    garantir_tabelas(dbsession)
+    pendente = dbsession.fetch_one(
+        "SELECT SEMENTE, ESCALA FROM POPULACAO_EXECUCAO WHERE CONCLUIDA_EM IS NULL"
+    )
+    if pendente is not None:
+        semente, escala = pendente["semente"], pendente["escala"]
+        seed, scale = _informado(seed, SEED_ENV), _informado(scale, SCALE_ENV)
+        if (seed is not None and resolve_seed(seed) != semente) or (
+            scale is not None and resolve_scale(scale) != escala
+        ):
+            raise ValueError(
+                f"Há uma população interrompida com semente {semente} e escala {escala}. "
+                "Retome com os mesmos valores ou limpe o banco antes de uma nova população."
+            )
+        reiniciar_sequencias(dbsession)
+        concluidas = etapas_concluidas(dbsession)
+        print(f"↪️  Retomando população interrompida (semente {semente}, escala {escala}, "
+              f"{len(concluidas)} etapa(s) já concluída(s))")
+        return semente, escala
+
+    semente, escala = resolve_seed(seed), resolve_scale(scale)
+    with dbsession.transaction():
+        dbsession.execute("DELETE FROM POPULACAO_ETAPA")
+        dbsession.execute("DELETE FROM POPULACAO_EXECUCAO")
+        dbsession.execute(
+            "INSERT INTO POPULACAO_EXECUCAO (SEMENTE, ESCALA) VALUES (%(semente)s, %(escala)s)",
+            {"semente": semente, "escala": escala},
+        )
+    return semente, escala
+
+
+def reiniciar_sequencias(dbsession):
+    """Volta a sequência de cada coluna identidade para o maior valor gravado."""
+    colunas = dbsession.fetch_all(
+        """
+        SELECT c.relname AS tabela, a.attname AS coluna
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        WHERE a.attidentity <> ''
+          AND NOT a.attisdropped
+          AND c.relkind = 'r'
+          AND pg_table_is_visible(c.oid)
+        """
+    )
+    with dbsession.transaction():
+        for row in colunas:
+            tabela, coluna = sql.Identifier(row["tabela"]), sql.Identifier(row["coluna"])
+            # Tabela vazia: o próximo id volta a ser 1
+            dbsession.execute(
+                sql.SQL(
+                    "SELECT setval(pg_get_serial_sequence(%(tabela)s, %(coluna)s), "
+                    "COALESCE(MAX({coluna}), 0) + 1, false) FROM {tabela}"
+                ).format(tabela=tabela, coluna=coluna),
+                {"tabela": row["tabela"], "coluna": row["coluna"]},
+            )
+
+
+def concluir_execucao(dbsession):
+    dbsession.execute("UPDATE POPULACAO_EXECUCAO SET CONCLUIDA_EM = CURRENT_TIMESTAMP")
+
+
+def execucao_pendente(dbsession):
+    """True se uma população começou e não terminou (False se as tabelas não existem)."""
+    try:
+        row = dbsession.fetch_one(
+            "SELECT COUNT(*) AS count FROM POPULACAO_EXECUCAO WHERE CONCLUIDA_EM IS NULL"
+        )
+    except Exception:
+        dbsession.connection.rollback()
+        return False
+    return bool(row and row["count"])
+
+
+def etapas_concluidas(dbsession):
+    rows = dbsession.fetch_all("SELECT NOME FROM POPULACAO_ETAPA WHERE CONCLUIDA_EM IS NOT NULL")
+    return {row["nome"] for row in rows}
+
+
+def concluir_etapa(dbsession, nome):
+    dbsession.execute(
+        """
+        INSERT INTO POPULACAO_ETAPA (NOME, CONCLUIDA_EM)
+        VALUES (%(nome)s, CURRENT_TIMESTAMP)
+        ON CONFLICT (NOME) DO UPDATE SET CONCLUIDA_EM = EXCLUDED.CONCLUIDA_EM
+        """,
+        {"nome": nome},
+    )
+
+
+@contextmanager
+def etapa(nome, seed):
+    """Marca ``nome`` como a etapa da thread atual, com o ``random`` semeado para ela."""
+    semear(seed, nome)
+    _etapa_atual.nome, _etapa_atual.seed = nome, seed
+    try:
+        yield
+    finally:
+        _etapa_atual.nome = _etapa_atual.seed = None
+
+
+def lotes(dbsession, total):
+    """Itera sobre os lotes ``0 .. total - 1`` da etapa atual ainda não gravados.
+
+    O corpo do laço roda numa transação que, ao final, também registra o lote
+    como concluído; se ele falhar, o lote é revertido inteiro. O ``random`` é
+    semeado por lote. Fora do pipeline (gerador rodado diretamente) todos os
+    lotes rodam, sem registro.
+    """
+    nome = getattr(_etapa_atual, "nome", None)
+    seed = getattr(_etapa_atual, "seed", None)
+    gravados = 0
+    if nome is not None:
+        row = dbsession.fetch_one(
+            "SELECT LOTES_CONCLUIDOS FROM POPULACAO_ETAPA WHERE NOME = %(nome)s", {"nome": nome}
+        )
+        gravados = row["lotes_concluidos"] if row else 0
+        if gravados:
+            print(f"   ↪️  {gravados}/{total} lote(s) já gravado(s); retomando do lote {gravados + 1}")
+
+    for lote in range(gravados, total):
+        if nome is not None:
+            semear(seed, nome, lote)
+        with dbsession.transaction():
+            yield lote
+            if nome is not None:
+                dbsession.execute(
+                    """
+                    INSERT INTO POPULACAO_ETAPA (NOME, LOTES_CONCLUIDOS)
+                    VALUES (%(nome)s, %(lotes)s)
+                    ON CONFLICT (NOME) DO UPDATE SET LOTES_CONCLUIDOS = EXCLUDED.LOTES_CONCLUIDOS
+                    """,
+                    {"nome": nome, "lotes": lote + 1},
+                )
+        print(f"   Lote {lote + 1}/{total} gravado.")
@@ -1,84 +1,105 @@
-import random
 import sys
-from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
-
-# Função para gerar uma data de reserva aleatória
-def gerar_data_reserva():
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    return (start_date + timedelta(days=random_days)).date()
-
-# Função para gerar horários de reserva coerentes (mínimo 1h, máximo 2h)
-# e que comecem em hora cheia ou meia hora
-def gerar_horarios_reserva():
-    # Limites de operação
-    start_hour = 6   # 06:00
-    end_hour = 22    # 22:00
-
-    # Gera horário inicial: pode ser em hora cheia ou meia hora
-    hora = random.randint(start_hour, end_hour - 1)
-    minuto = random.choice([0, 30])  # apenas 00 ou 30 minutos
-
-    horario_inicio = datetime.strptime(f"{hora:02d}:{minuto:02d}", "%H:%M")
-
-    # Duração aleatória entre 60 e 120 minutos (1h a 2h)
-    duracao = random.randint(60, 120)
-    horario_fim = horario_inicio + timedelta(minutes=duracao)
-
-    # Evita que o horário ultrapasse o limite das 22h
-    if horario_fim.hour >= 22 and (horario_fim.minute > 0 or horario_fim.hour > 22):
-        horario_fim = datetime.strptime("22:00", "%H:%M")
-
-    return horario_inicio.time(), horario_fim.time()
+from data_generators.progress import lotes
+from data_generators.scale import janela_reservas
+from data_generators.synth import chaves_unicas, datas, horarios, novo_rng, probabilidades_zipf
+
+# Horas de início (06h a 21h) da mais procurada para a menos procurada (pico no começo da noite)
+HORAS_POR_PROCURA = [18, 19, 17, 20, 7, 12, 8, 21, 16, 6, 13, 9, 11, 10, 14, 15]
+
+# Reservas ocupam blocos de duas horas entre 06h e 22h, no máximo uma por
+# instalação, dia e bloco: sem sobreposição por construção
+PRIMEIRA_HORA = 6
+BLOCOS_POR_DIA = 8
+
+# Reservas gravadas em lotes, cada um cobrindo este número de dias da janela
+DIAS_POR_LOTE = 180
+
+# Procura de cada bloco: soma dos pesos (Zipf) das duas horas que ele cobre
+_PESOS_HORAS = {hora: 1.0 / (posicao ** 0.8) for posicao, hora in enumerate(HORAS_POR_PROCURA, start=1)}
+PROBABILIDADES_BLOCOS = np.array([
+    _PESOS_HORAS[PRIMEIRA_HORA + 2 * bloco] + _PESOS_HORAS[PRIMEIRA_HORA + 2 * bloco + 1]
+    for bloco in range(BLOCOS_POR_DIA)
+])
+PROBABILIDADES_BLOCOS /= PROBABILIDADES_BLOCOS.sum()
+
+# Horários coerentes dentro do bloco: início em hora cheia ou meia hora,
+# duração entre 1h e 2h sem passar do fim do bloco (o último termina às 22h)
+def gerar_horarios_reserva(rng, blocos):
+    deslocamentos = rng.choice([0, 30], size=len(blocos))
+    inicios = (PRIMEIRA_HORA * 60) + 120 * blocos + deslocamentos
+    duracoes = rng.integers(60, 121 - deslocamentos)
+    return horarios(inicios), horarios(inicios + duracoes)
 
 # Função para gerar as reservas
-def gerar_reservas(dbsession):
+def gerar_reservas(dbsession, anos=1):
+    """
+    Gera reservas de instalações ao longo de ``anos`` anos até hoje (e algumas
+    semanas à frente). Metade dos internos reserva, em média uma vez por ano;
+    poucas instalações concentram a maior parte das reservas (Zipf).
+    """
+    # Plano da etapa: quem reserva, quantas vezes e a popularidade das instalações
+    rng = novo_rng()
+
     # Buscar pessoas internas
     internos_result = dbsession.fetch_all("SELECT CPF_PESSOA FROM INTERNO_USP ORDER BY CPF_PESSOA")
-    cpfs_internos = [row['cpf_pessoa'] for row in internos_result]
+    cpfs_internos = np.array([row['cpf_pessoa'] for row in internos_result])
 
     # Buscar instalações
     instalacoes_result = dbsession.fetch_all("SELECT ID_INSTALACAO FROM INSTALACAO ORDER BY ID_INSTALACAO")
-    ids_instalacoes = [row['id_instalacao'] for row in instalacoes_result]
-
-    # Selecionar 50% das pessoas aleatoriamente
-    total_pessoas = len(cpfs_internos)
-    percentual_50 = int(total_pessoas * 0.5)
-    cpfs_selecionados = random.sample(cpfs_internos, percentual_50)
-
-    reservas_data = []
-    reservas_existentes = set()  # Tuplas (id_instalacao, data_reserva, horario_inicio)
-
-    # Gerar reservas sem duplicar a chave única
-    for cpf_responsavel in cpfs_selecionados:
-        tentativas = 0
-        while tentativas < 10:  # Evitar loop infinito
-            id_instalacao = random.choice(ids_instalacoes)
-            data_reserva = gerar_data_reserva()
-            horario_inicio, horario_fim = gerar_horarios_reserva()
-            chave = (id_instalacao, data_reserva, horario_inicio)
-
-            if chave not in reservas_existentes:
-                reservas_existentes.add(chave)
-                reservas_data.append((id_instalacao, cpf_responsavel, data_reserva, horario_inicio, horario_fim))
-                break
-            tentativas += 1
-
-    # Inserir diretamente no banco
-    query = """
-        INSERT INTO RESERVA (ID_INSTALACAO, CPF_RESPONSAVEL_INTERNO, DATA_RESERVA, HORARIO_INICIO, HORARIO_FIM)
-        VALUES (%s, %s, %s, %s, %s)
-    """
-
-    print(f"Inserindo {len(reservas_data)} reservas no banco...")
-    dbsession.executemany(query, reservas_data)
-    print(f"✅ {len(reservas_data)} reservas inseridas com sucesso!")
+    ids_instalacoes = np.array([row['id_instalacao'] for row in instalacoes_result])
+    inicio, fim = janela_reservas(anos)
+    total_dias = (fim - inicio).days + 1
+
+    if not len(cpfs_internos) or not len(ids_instalacoes):
+        print("⚠️  Sem internos ou instalações cadastrados. Nenhuma reserva gerada.")
+        return
+
+    # Selecionar 50% das pessoas aleatoriamente, cada uma com 1 a 2*anos-1 reservas
+    selecionados = rng.choice(cpfs_internos, size=int(len(cpfs_internos) * 0.5), replace=False)
+    responsaveis = rng.permutation(np.repeat(selecionados, rng.integers(1, 2 * anos, size=len(selecionados))))
+    probabilidades_instalacoes = probabilidades_zipf(rng, len(ids_instalacoes))
+
+    # Cada lote cobre um trecho da janela e recebe a parte proporcional dos responsáveis
+    total_lotes = -(-total_dias // DIAS_POR_LOTE)
+    limites_dias = [min(lote * DIAS_POR_LOTE, total_dias) for lote in range(total_lotes + 1)]
+    limites_responsaveis = [dia * len(responsaveis) // total_dias for dia in limites_dias]
+    colunas = ("ID_INSTALACAO", "CPF_RESPONSAVEL_INTERNO", "DATA_RESERVA", "HORARIO_INICIO", "HORARIO_FIM")
+    total_reservas = 0
+
+    print(f"Gerando cerca de {len(responsaveis)} reservas em {total_lotes} lote(s)...")
+    for lote in lotes(dbsession, total_lotes):
+        rng_lote = novo_rng()
+        primeiro_dia = limites_dias[lote]
+        responsaveis_lote = responsaveis[limites_responsaveis[lote]:limites_responsaveis[lote + 1]]
+
+        # (instalação, dia, bloco) distintos
+        instalacoes, dias, blocos = chaves_unicas(
+            rng_lote,
+            len(responsaveis_lote),
+            (len(ids_instalacoes), limites_dias[lote + 1] - primeiro_dia, BLOCOS_POR_DIA),
+            (probabilidades_instalacoes, None, PROBABILIDADES_BLOCOS),
+        )
+        horarios_inicio, horarios_fim = gerar_horarios_reserva(rng_lote, blocos)
+
+        reservas_data = list(zip(
+            ids_instalacoes[instalacoes].tolist(),
+            responsaveis_lote[:len(instalacoes)].tolist(),
+            datas(inicio, primeiro_dia + dias),
+            horarios_inicio,
+            horarios_fim,
+        ))
+
+        # Inserir diretamente no banco
+        dbsession.copy_rows("RESERVA", colunas, reservas_data)
+        total_reservas += len(reservas_data)
+
+    print(f"✅ {total_reservas} reservas inseridas com sucesso!")
 
 if __name__ == "__main__":
     dbsession = DBSession()
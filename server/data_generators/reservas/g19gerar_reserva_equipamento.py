@@ -1,74 +1,70 @@
-import random
 import sys
-from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.database import DBSession
+from data_generators.scale import janela_reservas
+from data_generators.synth import chaves_unicas, datas, horarios, novo_rng, probabilidades_zipf
 
-def gerar_data_reserva():
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    return (start_date + timedelta(days=random_days)).date()
-
-def gerar_horarios_reserva():
-    start_hour = 8
-    end_hour = 20
-    hora = random.randint(start_hour, end_hour - 1)
-    minuto = random.choice([0, 30])
-    horario_inicio = datetime.strptime(f"{hora:02d}:{minuto:02d}", "%H:%M")
+# Reservas de equipamento em blocos de duas horas entre 08h e 20h, no máximo
+# uma por equipamento, dia e bloco: sem sobreposição por construção
+PRIMEIRA_HORA = 8
+BLOCOS_POR_DIA = 6
 
-    # Reservas de equipamento costumam ser mais curtas
-    duracao = random.choice([60, 120])
-    horario_fim = horario_inicio + timedelta(minutes=duracao)
+# Reservas de equipamento costumam ser mais curtas: 1h (em hora cheia ou meia
+# hora) ou 2h ocupando o bloco inteiro
+def gerar_horarios_reserva(rng, blocos):
+    duracoes = rng.choice([60, 120], size=len(blocos))
+    deslocamentos = np.where(duracoes == 60, rng.choice([0, 30], size=len(blocos)), 0)
+    inicios = (PRIMEIRA_HORA * 60) + 120 * blocos + deslocamentos
+    return horarios(inicios), horarios(inicios + duracoes)
 
-    return horario_inicio.time(), horario_fim.time()
+def gerar_reservas_equipamento(dbsession, quantidade=500, anos=1):
+    rng = novo_rng()
 
-def gerar_reservas_equipamento(dbsession):
     # Buscar pessoas internas do banco
     internos_result = dbsession.fetch_all("SELECT CPF_PESSOA FROM INTERNO_USP ORDER BY CPF_PESSOA")
-    cpfs_internos = [row['cpf_pessoa'] for row in internos_result]
+    cpfs_internos = np.array([row['cpf_pessoa'] for row in internos_result])
 
     # Buscar equipamentos reserváveis do banco
     equipamentos_result = dbsession.fetch_all("SELECT ID_PATRIMONIO FROM EQUIPAMENTO WHERE EH_RESERVAVEL = 'S' ORDER BY ID_PATRIMONIO")
-    ids_equipamentos = [row['id_patrimonio'] for row in equipamentos_result]
+    ids_equipamentos = np.array([row['id_patrimonio'] for row in equipamentos_result])
 
-    if not ids_equipamentos:
+    if not len(ids_equipamentos):
         print("ERRO: Nenhum equipamento reservável encontrado no banco.")
         return
+    if not len(cpfs_internos):
+        print("ERRO: Nenhum interno encontrado no banco.")
+        return
 
-    reservas_data = []
-    reservas_check = set()
-
-    # Gerar cerca de 500 reservas fictícias
-    for _ in range(500):
-        cpf_responsavel = random.choice(cpfs_internos)
-        id_equipamento = random.choice(ids_equipamentos)
-
-        tentativas = 0
-        while tentativas < 5:
-            data_reserva = gerar_data_reserva()
-            h_inicio, h_fim = gerar_horarios_reserva()
-
-            # Chave única simplificada para evitar colisões no gerador
-            chave = (id_equipamento, data_reserva, h_inicio)
-
-            if chave not in reservas_check:
-                reservas_check.add(chave)
-                reservas_data.append((id_equipamento, cpf_responsavel, data_reserva, h_inicio, h_fim))
-                break
-            tentativas += 1
+    inicio, fim = janela_reservas(anos)
+    total_dias = (fim - inicio).days + 1
+
+    # Cerca de `quantidade` (equipamento, dia, bloco) distintos; poucos
+    # equipamentos concentram a maior parte das reservas (Zipf)
+    equipamentos, dias, blocos = chaves_unicas(
+        rng,
+        quantidade,
+        (len(ids_equipamentos), total_dias, BLOCOS_POR_DIA),
+        (probabilidades_zipf(rng, len(ids_equipamentos)), None, None),
+    )
+    horarios_inicio, horarios_fim = gerar_horarios_reserva(rng, blocos)
+
+    reservas_data = list(zip(
+        ids_equipamentos[equipamentos].tolist(),
+        rng.choice(cpfs_internos, size=len(equipamentos)).tolist(),
+        datas(inicio, dias),
+        horarios_inicio,
+        horarios_fim,
+    ))
 
     # Inserir diretamente no banco
-    query = """
-        INSERT INTO RESERVA_EQUIPAMENTO (ID_EQUIPAMENTO, CPF_RESPONSAVEL_INTERNO, DATA_RESERVA, HORARIO_INICIO, HORARIO_FIM)
-        VALUES (%s, %s, %s, %s, %s)
-    """
+    colunas = ("ID_EQUIPAMENTO", "CPF_RESPONSAVEL_INTERNO", "DATA_RESERVA", "HORARIO_INICIO", "HORARIO_FIM")
 
     print(f"Inserindo {len(reservas_data)} reservas de equipamento no banco...")
-    dbsession.executemany(query, reservas_data)
+    dbsession.copy_rows("RESERVA_EQUIPAMENTO", colunas, reservas_data)
     print(f"✅ {len(reservas_data)} reservas de equipamento inseridas com sucesso!")
 
 if __name__ == "__main__":
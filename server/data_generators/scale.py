@@ -0,0 +1,65 @@
+"""
+Fator de escala da população sintética.
+
+``populate.py --scale N`` (ou ``POPULATE_SCALE=N``) multiplica por N o tamanho
+de cada tabela: pessoas, instalações, atividades, grupos e equipamentos crescem
+proporcionalmente, e as demais tabelas derivam delas. O histórico de reservas
+passa a cobrir ``anos_historico(N)`` anos até hoje (mais algumas semanas à
+frente) e a escolha de instalações, equipamentos e horários segue uma
+distribuição de Zipf, com pontos quentes como os de produção.
+
+Com N = 1 os tamanhos são os da população padrão.
+"""
+import os
+from datetime import date, timedelta
+
+from data_generators.seeding import random
+
+SCALE_ENV = "POPULATE_SCALE"
+
+# Anos de histórico de reservas: um por unidade de escala, até este limite
+MAX_ANOS_HISTORICO = 10
+# Reservas podem ser feitas com até este número de dias de antecedência
+DIAS_FUTUROS = 60
+
+
+def resolve_scale(scale=None):
+    """Fator de escala informado, ou o de ``POPULATE_SCALE`` (padrão 1)."""
+    if scale is None:
+        scale = os.environ.get(SCALE_ENV) or 1
+    try:
+        scale = int(scale)
+    except (TypeError, ValueError):
+        raise ValueError(f"Fator de escala inválido: {scale!r}") from None
+    if scale < 1:
+        raise ValueError(f"Fator de escala deve ser >= 1 (recebido {scale})")
+    return scale
+
+
+def anos_historico(scale):
+    return min(scale, MAX_ANOS_HISTORICO)
+
+
+def janela_reservas(anos):
+    """Período das reservas: ``anos`` anos até hoje e ``DIAS_FUTUROS`` adiante."""
+    hoje = date.today()
+    return hoje - timedelta(days=365 * anos), hoje + timedelta(days=DIAS_FUTUROS)
+
+
+def data_aleatoria(inicio, fim):
+    return inicio + timedelta(days=random.randint(0, (fim - inicio).days))
+
+
+def replicar(itens, quantidade, rotular):
+    """Seleciona ``quantidade`` itens distintos de ``itens``.
+
+    Esgotados os originais, cada nova rodada usa ``rotular(item, rodada)``
+    (rodada a partir de 2) para gerar cópias distintas, como "Nome - Turma 2".
+    """
+    selecionados = []
+    rodada = 1
+    while len(selecionados) < quantidade and itens:
+        lote = list(itens) if rodada == 1 else [rotular(item, rodada) for item in itens]
+        selecionados.extend(random.sample(lote, min(len(lote), quantidade - len(selecionados))))
+        rodada += 1
+    return selecionados
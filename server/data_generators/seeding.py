@@ -0,0 +1,62 @@
+"""
+Semente da população sintética.
+
+``populate.py --seed N`` (ou ``POPULATE_SEED=N``) torna a geração
+reproduzível: com a mesma semente, a mesma escala e no mesmo dia, o banco
+sai igual. Cada etapa (e cada lote das etapas em lotes) recomeça de uma
+semente derivada da global e do seu nome, então o resultado não depende da
+ordem em que etapas paralelas terminam nem de a execução ter sido retomada
+(a retomada também devolve as sequências dos ids ao maior id gravado; ver
+``progress.reiniciar_sequencias``). Isso vale para um banco novo: ids tirados
+antes da população, mesmo que de linhas já apagadas, deslocam as sequências.
+A exceção são os tokens de convite externo, credenciais sorteadas com
+``secrets``.
+
+Os geradores importam ``random`` daqui em vez do módulo padrão: é um
+``random.Random`` por thread, com a mesma API, para que etapas paralelas não
+disputem o mesmo estado. Os ``Faker`` de ``novo_faker`` e o gerador NumPy de
+``synth.novo_rng`` sorteiam a partir dele.
+"""
+import os
+import random as _random
+import threading
+
+from faker import Faker
+
+SEED_ENV = "POPULATE_SEED"
+
+
+class _RandomPorThread(threading.local):
+    """API do módulo ``random`` sobre um ``random.Random`` próprio de cada thread."""
+
+    def __init__(self):
+        self.gerador = _random.Random()
+
+    def __getattr__(self, nome):
+        return getattr(self.gerador, nome)
+
+
+random = _RandomPorThread()
+
+
+def resolve_seed(seed=None):
+    """Semente informada, a de ``POPULATE_SEED`` ou uma nova sorteada."""
+    if seed is None:
+        seed = os.environ.get(SEED_ENV) or _random.SystemRandom().getrandbits(63)
+    try:
+        return int(seed)
+    except (TypeError, ValueError):
+        raise ValueError(f"Semente inválida: {seed!r}") from None
+
+
+def semear(seed, etapa, lote=None):
+    """Reinicia o ``random`` da thread atual para a etapa (e lote) informados."""
+    chave = f"{seed}:{etapa}" if lote is None else f"{seed}:{etapa}:{lote}"
+    random.seed(chave)
+
+
+def novo_faker(locale="pt_BR"):
+    """``Faker`` que sorteia com o ``random`` da thread atual (e portanto com a semente da etapa)."""
+    fake = Faker(locale)
+    fake.random = random
+    return fake
@@ -0,0 +1,206 @@
+"""
+Síntese vetorizada de colunas para os geradores (NumPy).
+
+Em vez de montar cada linha com ``random``/Faker e repetir sorteios até não
+colidir, as funções daqui geram colunas inteiras de uma vez:
+
+- CPFs com dígitos verificadores calculados sobre arrays;
+- identificadores únicos por construção (sorteio sem repetição que já exclui
+  os valores em uso), sem laços de nova tentativa;
+- nomes, emails, celulares e datas de nascimento a partir dos vocabulários do
+  Faker pt_BR;
+- horários de reserva em blocos de duas horas, sem sobreposição por construção.
+
+O gerador NumPy vem de ``novo_rng``: sem semente explícita, ela é tirada do
+``random`` de ``data_generators.seeding``, então a semente da etapa torna
+estas colunas reproduzíveis.
+"""
+import unicodedata
+from datetime import date, time
+
+import numpy as np
+from faker.providers.internet.pt_BR import Provider as InternetProvider
+from faker.providers.person.pt_BR import Provider as PessoaProvider
+
+from data_generators.seeding import random
+
+PESOS_DV1 = np.arange(10, 1, -1)
+PESOS_DV2 = np.arange(11, 1, -1)
+
+PRIMEIROS_NOMES = sorted(set(PessoaProvider.first_names_female) | set(PessoaProvider.first_names_male))
+SOBRENOMES = sorted(set(PessoaProvider.last_names))
+DOMINIOS_EMAIL = list(InternetProvider.free_email_domains)
+
+# Horários como objetos time, indexados por minuto do dia
+HORARIOS = [time(minuto // 60, minuto % 60) for minuto in range(24 * 60)]
+
+
+def novo_rng(seed=None):
+    """Gerador NumPy; sem ``seed``, a semente vem do ``random`` da etapa."""
+    if seed is None:
+        seed = random.getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def probabilidades_zipf(rng, n, expoente=1.0):
+    """Probabilidades de Zipf para ``n`` itens, com a ordem de popularidade embaralhada."""
+    pesos = 1.0 / np.arange(1, n + 1) ** expoente
+    return rng.permutation(pesos / pesos.sum())
+
+
+def ordenados_unicos(valores):
+    """``valores`` como array int64 ordenado e sem repetição (sem reordenar se já estiver)."""
+    if not isinstance(valores, np.ndarray):
+        valores = list(valores)
+    valores = np.asarray(valores, dtype=np.int64)
+    if valores.size > 1 and not np.all(valores[1:] > valores[:-1]):
+        # sort estável junta trechos já ordenados (ex.: lotes concatenados) em
+        # tempo linear, ao contrário do np.unique
+        valores = np.sort(valores, kind="stable")
+        valores = valores[np.concatenate(([True], valores[1:] != valores[:-1]))]
+    return valores
+
+
+def _fora_de(valores, excluir):
+    """Elementos de ``valores`` que não estão em ``excluir`` (ordenado), por busca binária."""
+    if not excluir.size:
+        return valores
+    posicoes = np.minimum(np.searchsorted(excluir, valores), excluir.size - 1)
+    return valores[excluir[posicoes] != valores]
+
+
+def inteiros_unicos(rng, inicio, fim, quantidade, excluir=()):
+    """``quantidade`` inteiros distintos em [inicio, fim), fora de ``excluir``, em ordem aleatória.
+
+    ``excluir`` já ordenado e sem repetição (ver ``ordenados_unicos``) não é
+    reordenado, e cada rodada só faz buscas binárias nele: gerar em lotes
+    contra um conjunto grande de valores usados fica linear.
+    """
+    excluir = ordenados_unicos(excluir)
+    em_uso = np.count_nonzero((excluir >= inicio) & (excluir < fim))
+    if quantidade > (fim - inicio) - em_uso:
+        raise ValueError(
+            f"Não há {quantidade} valores livres em [{inicio}, {fim}) ({em_uso} já em uso)"
+        )
+
+    escolhidos = np.empty(0, dtype=np.int64)
+    while len(escolhidos) < quantidade:
+        faltam = quantidade - len(escolhidos)
+        candidatos = rng.integers(inicio, fim, size=faltam + faltam // 10 + 16)
+        # Candidatos únicos e ordenados (como setdiff1d): embaralhar antes de cortar
+        candidatos = _fora_de(_fora_de(ordenados_unicos(candidatos), excluir), np.sort(escolhidos))
+        escolhidos = np.concatenate([escolhidos, rng.permutation(candidatos)[:faltam]])
+    return escolhidos
+
+
+def _digito_verificador(soma):
+    resto = soma % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def cpfs_de_bases(bases):
+    """CPFs (inteiros de 11 dígitos) a partir dos 9 primeiros dígitos."""
+    bases = np.asarray(bases, dtype=np.int64)
+    digitos = (bases[:, None] // 10 ** np.arange(8, -1, -1)) % 10
+    dv1 = _digito_verificador(digitos @ PESOS_DV1)
+    dv2 = _digito_verificador(digitos @ PESOS_DV2[:9] + dv1 * PESOS_DV2[9])
+    return bases * 100 + dv1 * 10 + dv2
+
+
+def bases_de_cpfs(cpfs):
+    """Bases (9 primeiros dígitos) dos CPFs, no formato de ``bases_excluidas``."""
+    return np.array([int(cpf[:9]) for cpf in cpfs if cpf[:9].isdigit()], dtype=np.int64)
+
+
+def gerar_cpfs(rng, quantidade, excluir=(), bases_excluidas=None):
+    """``quantidade`` CPFs válidos e distintos (sem zero à esquerda) fora de ``excluir``.
+
+    Quem gera em lotes pode passar ``bases_excluidas`` já convertidas
+    (``bases_de_cpfs``) em vez de reconverter todos os CPFs a cada lote.
+    """
+    # Bases distintas dão CPFs distintos; excluir a base de cada CPF existente
+    # também cobre CPFs antigos com dígitos verificadores errados
+    if bases_excluidas is None:
+        bases_excluidas = bases_de_cpfs(excluir)
+    bases = inteiros_unicos(rng, 100_000_000, 1_000_000_000, quantidade, bases_excluidas)
+    return cpfs_de_bases(bases).astype(str).tolist()
+
+
+def _sem_acento(texto):
+    normalizado = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in normalizado if not unicodedata.combining(c)).lower().replace(" ", "")
+
+
+def gerar_pessoas_sinteticas(
+    rng, quantidade, cpfs_excluidos=(), emails_excluidos=(), bases_excluidas=None
+):
+    """Tuplas (CPF, NOME, EMAIL, CELULAR, DATA_NASCIMENTO) com CPF e email únicos."""
+    cpfs = gerar_cpfs(rng, quantidade, cpfs_excluidos, bases_excluidas)
+
+    primeiros = rng.integers(0, len(PRIMEIROS_NOMES), size=quantidade).tolist()
+    sobrenomes = rng.integers(0, len(SOBRENOMES), size=(quantidade, 2)).tolist()
+    # Metade das pessoas com dois sobrenomes
+    dois_sobrenomes = (rng.random(quantidade) < 0.5).tolist()
+    nomes = [
+        f"{PRIMEIROS_NOMES[p]} {SOBRENOMES[s1]} {SOBRENOMES[s2]}" if dois else f"{PRIMEIROS_NOMES[p]} {SOBRENOMES[s2]}"
+        for p, (s1, s2), dois in zip(primeiros, sobrenomes, dois_sobrenomes)
+    ]
+
+    # Email único por construção: sufixo numérico distinto por pessoa
+    primeiros_email = [_sem_acento(nome) for nome in PRIMEIROS_NOMES]
+    sobrenomes_email = [_sem_acento(nome) for nome in SOBRENOMES]
+    sufixos = inteiros_unicos(rng, 1, max(10 * quantidade, 1000), quantidade).tolist()
+    dominios = rng.integers(0, len(DOMINIOS_EMAIL), size=quantidade).tolist()
+    if not isinstance(emails_excluidos, (set, frozenset)):
+        emails_excluidos = set(emails_excluidos)
+    emails = []
+    for cpf, p, (_, s2), sufixo, d in zip(cpfs, primeiros, sobrenomes, sufixos, dominios):
+        email = f"{primeiros_email[p]}.{sobrenomes_email[s2]}{sufixo}@{DOMINIOS_EMAIL[d]}"
+        # Colisão só é possível com emails já existentes no banco
+        emails.append(email if email not in emails_excluidos else f"{cpf}@usp.br")
+
+    celulares = rng.integers(1000, 10000, size=(quantidade, 2)).tolist()
+    celulares = [f"(11) 9{a}-{b}" for a, b in celulares]
+
+    # Entre 18 e 80 anos
+    idades_dias = rng.integers(18 * 365, 80 * 365, size=quantidade)
+    nascimentos = (np.datetime64(date.today(), "D") - idades_dias.astype("timedelta64[D]")).tolist()
+
+    return list(zip(cpfs, nomes, emails, celulares, nascimentos))
+
+
+def chaves_unicas(rng, quantidade, tamanhos, probabilidades, rodadas=10):
+    """Sorteia até ``quantidade`` combinações distintas de índices, uma por dimensão.
+
+    A dimensão ``i`` tem ``tamanhos[i]`` valores sorteados com
+    ``probabilidades[i]`` (None = uniforme). Combinações repetidas são
+    descartadas e sorteadas de novo por até ``rodadas`` rodadas; com
+    probabilidades muito concentradas as combinações quentes saturam e podem
+    voltar menos de ``quantidade``. Retorna um array de índices por dimensão.
+    """
+    escolhidas = np.empty(0, dtype=np.int64)
+    for _ in range(rodadas):
+        faltam = quantidade - len(escolhidas)
+        if faltam <= 0:
+            break
+        chaves = np.zeros(faltam, dtype=np.int64)
+        for tamanho, p in zip(tamanhos, probabilidades):
+            chaves = chaves * tamanho + rng.choice(tamanho, size=faltam, p=p)
+        escolhidas = np.concatenate([escolhidas, np.setdiff1d(chaves, escolhidas)])
+    escolhidas = rng.permutation(escolhidas)
+
+    indices = []
+    for tamanho in reversed(tamanhos):
+        indices.append(escolhidas % tamanho)
+        escolhidas = escolhidas // tamanho
+    return indices[::-1]
+
+
+def datas(inicio, deslocamentos):
+    """Lista de ``date``: ``inicio`` mais cada deslocamento em dias."""
+    return (np.datetime64(inicio, "D") + np.asarray(deslocamentos).astype("timedelta64[D]")).tolist()
+
+
+def horarios(minutos):
+    """Lista de ``time`` a partir de minutos desde 00:00."""
+    return [HORARIOS[minuto] for minuto in np.asarray(minutos).tolist()]
@@ -48,12 +48,17 @@ def check_db_populated():
         return False
 
 def populate_database():
-    """Popula o banco de dados com dados sintéticos usando o sistema unificado."""
-    print("=== Iniciando população do banco de dados ===")
+    """Popula o banco de dados com dados sintéticos usando o sistema unificado.
+
+    O tamanho vem de POPULATE_SCALE (fator de escala, padrão 1) e a semente de
+    POPULATE_SEED (opcional). Uma população interrompida é retomada.
+    """
+    scale = os.environ.get("POPULATE_SCALE") or "1"
+    print(f"=== Iniciando população do banco de dados (escala {scale}) ===")
 
     try:
         from data_generators.populate import populate_db
-        populate_db()
+        populate_db(scale=scale)
         print("=== População do banco concluída com sucesso! ===")
         return True
     except Exception as e:
@@ -62,6 +67,26 @@ def populate_database():
         traceback.print_exc()
         return False
 
+def bootstrap_schema():
+    """Verifica o schema e aplica funções, índices e views uma única vez na inicialização."""
+    print("=== Executando bootstrap do schema ===")
+
+    try:
+        from app import create_app
+        from app.database import DBSession
+        from app.services.database.bootstrap import ensure_schema_populated
+
+        app = create_app()
+        with app.app_context():
+            with DBSession() as dbsession:
+                ensure_schema_populated(dbsession, force=True)
+        print("=== Bootstrap do schema concluído ===")
+        return True
+    except Exception as e:
+        print(f"AVISO: Falha no bootstrap do schema: {e}")
+        print("O schema será verificado na primeira requisição.")
+        return False
+
 def main():
     """Função principal do entrypoint."""
     print("=== Docker Entrypoint iniciado ===")
@@ -85,6 +110,10 @@ def main():
     else:
         print("POPULATE_DB não está definido como 'true'. Pulando população do banco.")
 
+    # Bootstrap feito aqui dispensa a verificação do schema no caminho das requisições
+    if bootstrap_schema():
+        os.environ["DB_SCHEMA_BOOTSTRAPPED"] = "true"
+
     # Iniciar a aplicação Flask
     print("=== Iniciando aplicação Flask ===")
 
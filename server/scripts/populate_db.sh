@@ -2,6 +2,7 @@
 # Script para popular o banco de dados
 # Executa o script Python data_generators/populate.py
 # Deve ser executado a partir da raiz do projeto ou via scripts/populate_db.sh
+# Uso: scripts/populate_db.sh [--scale N]
 
 # Obter o diretório onde o script está localizado
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
@@ -16,5 +17,5 @@ echo "Diretório de execução: $(pwd)"
 # Configurar PYTHONPATH para incluir a raiz do projeto
 export PYTHONPATH="${PYTHONPATH}:${PROJECT_ROOT}"
 
-# Executar o script Python
-python data_generators/populate.py
+# Executar o script Python (argumentos repassados, ex.: --scale 10)
+python data_generators/populate.py "$@"
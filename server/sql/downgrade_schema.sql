@@ -1,6 +1,10 @@
 -- Drop tables in reverse order of creation from upgrade_schema.sql
 -- Using CASCADE to ensure dependent objects (FKs, constraints) are removed.
 
+DROP TABLE IF EXISTS POPULACAO_ETAPA CASCADE;
+DROP TABLE IF EXISTS POPULACAO_EXECUCAO CASCADE;
+DROP TABLE IF EXISTS RESUMO_INSCRICOES_DIARIAS CASCADE;
+DROP TABLE IF EXISTS RESUMO_RESERVAS_DIARIAS CASCADE;
 DROP TABLE IF EXISTS SOLICITACAO_CADASTRO CASCADE;
 DROP TABLE IF EXISTS METRICA_ACESSO_DIARIA CASCADE;
 DROP TABLE IF EXISTS AUDITORIA_LOGIN CASCADE;
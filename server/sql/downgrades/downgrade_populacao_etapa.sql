@@ -0,0 +1 @@
+DELETE FROM POPULACAO_ETAPA;
\ No newline at end of file
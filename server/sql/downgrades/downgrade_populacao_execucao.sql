@@ -0,0 +1 @@
+DELETE FROM POPULACAO_EXECUCAO;
\ No newline at end of file
@@ -25,6 +25,71 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- FUNCTION: compute_user_roles
+-- Computes the role bitmap of a user in a single query
+-- (the value cached in USUARIO_SENHA.PAPEIS by the sync triggers)
+-- Bits: 1 = admin, 2 = staff, 4 = internal, 8 = external
+-- Parameters:
+--   cpf_pessoa: CPF of the user
+-- Returns: SMALLINT bitmap (0 when the user has no role)
+CREATE OR REPLACE FUNCTION compute_user_roles(cpf_pessoa VARCHAR)
+RETURNS SMALLINT
+AS $$
+    SELECT (
+        CASE WHEN EXISTS (
+            SELECT 1
+            FROM funcionario_atribuicao fa
+            JOIN funcionario f ON fa.cpf_funcionario = f.cpf_interno
+            WHERE f.cpf_interno = $1
+            AND fa.atribuicao LIKE '%Administrador%'
+        ) THEN 1 ELSE 0 END
+        | CASE WHEN EXISTS (
+            SELECT 1 FROM funcionario f WHERE f.cpf_interno = $1
+        ) THEN 2 ELSE 0 END
+        | CASE WHEN EXISTS (
+            SELECT 1 FROM interno_usp i WHERE i.cpf_pessoa = $1
+        ) THEN 4 ELSE 0 END
+        | CASE WHEN EXISTS (
+            SELECT 1
+            FROM pessoa p
+            WHERE p.cpf = $1
+            AND NOT EXISTS (
+                SELECT 1 FROM interno_usp i WHERE i.cpf_pessoa = p.cpf
+            )
+            AND EXISTS (
+                SELECT 1 FROM convite_externo ce WHERE ce.email_convidado = p.email
+            )
+        ) THEN 8 ELSE 0 END
+    )::SMALLINT;
+$$ LANGUAGE sql STABLE;
+
+-- FUNCTION: user_type_from_roles
+-- Primary user type of a role bitmap
+-- Priority: Administrador > Staff > Interno > Externo
+CREATE OR REPLACE FUNCTION user_type_from_roles(papeis SMALLINT)
+RETURNS VARCHAR
+AS $$
+    SELECT CASE
+        WHEN $1 & 1 <> 0 THEN 'Administrador'
+        WHEN $1 & 2 <> 0 THEN 'Staff'
+        WHEN $1 & 4 <> 0 THEN 'Interno'
+        WHEN $1 & 8 <> 0 THEN 'Externo'
+    END::VARCHAR;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- FUNCTION: user_roles_from_bits
+-- Role names of a role bitmap, in the order admin, staff, internal, external
+CREATE OR REPLACE FUNCTION user_roles_from_bits(papeis SMALLINT)
+RETURNS TEXT[]
+AS $$
+    SELECT ARRAY(
+        SELECT r.nome
+        FROM (VALUES (1, 'admin'), (2, 'staff'), (4, 'internal'), (8, 'external')) AS r(valor, nome)
+        WHERE $1 & r.valor <> 0
+        ORDER BY r.valor
+    );
+$$ LANGUAGE sql IMMUTABLE;
+
 -- FUNCTION: get_user_type
 -- Determines the primary user type (conforme especificação do PF)
 -- Parameters:
@@ -33,60 +98,15 @@ $$ LANGUAGE plpgsql;
 CREATE OR REPLACE FUNCTION get_user_type(cpf_pessoa VARCHAR)
 RETURNS VARCHAR
 AS $$
-DECLARE
-    user_type VARCHAR(50);
 BEGIN
-    -- Check priority: Administrador > Staff > Interno > Externo
-    -- Check if user is admin
-    IF EXISTS(
-        SELECT 1
-        FROM funcionario_atribuicao fa
-        JOIN funcionario f ON fa.cpf_funcionario = f.cpf_interno
-        WHERE f.cpf_interno = get_user_type.cpf_pessoa
-        AND fa.atribuicao LIKE '%Administrador%'
-    ) THEN
-        RETURN 'Administrador';
-    END IF;
-
-    -- Check if user is staff
-    IF EXISTS(
-        SELECT 1
-        FROM funcionario f
-        WHERE f.cpf_interno = get_user_type.cpf_pessoa
-    ) THEN
-        RETURN 'Staff';
-    END IF;
-
-    -- Check if user is internal
-    IF EXISTS(
-        SELECT 1
-        FROM interno_usp i
-        WHERE i.cpf_pessoa = get_user_type.cpf_pessoa
-    ) THEN
-        RETURN 'Interno';
-    END IF;
-
-    -- Check if user is external
-    IF EXISTS(
-        SELECT 1
-        FROM pessoa p
-        WHERE p.cpf = get_user_type.cpf_pessoa
-        AND NOT EXISTS (
-            SELECT 1 FROM interno_usp i WHERE i.cpf_pessoa = p.cpf
-        )
-        AND EXISTS (
-            SELECT 1 FROM convite_externo ce WHERE ce.email_convidado = p.email
-        )
-    ) THEN
-        RETURN 'Externo';
-    END IF;
-
-    RETURN NULL;
+    RETURN user_type_from_roles(compute_user_roles(cpf_pessoa));
 END;
 $$ LANGUAGE plpgsql;
 
 -- FUNCTION: get_user_roles
 -- Determines user roles based on database relationships
+-- Reads the bitmap kept in USUARIO_SENHA.PAPEIS; people without an account
+-- have it computed on the spot
 -- Parameters:
 --   cpf_pessoa: CPF of the user
 -- Returns: JSON object with roles array
@@ -94,66 +114,17 @@ CREATE OR REPLACE FUNCTION get_user_roles(cpf_pessoa VARCHAR)
 RETURNS JSON
 AS $$
 DECLARE
-    roles JSON;
-    is_admin BOOLEAN := FALSE;
-    is_staff BOOLEAN := FALSE;
-    is_internal BOOLEAN := FALSE;
-    is_external BOOLEAN := FALSE;
-    roles_array TEXT[] := ARRAY[]::TEXT[];
+    bits SMALLINT;
 BEGIN
-    -- Check if user is admin (has 'Administrador' in FUNCIONARIO_ATRIBUICAO)
-    SELECT EXISTS(
-        SELECT 1
-        FROM funcionario_atribuicao fa
-        JOIN funcionario f ON fa.cpf_funcionario = f.cpf_interno
-        WHERE f.cpf_interno = cpf_pessoa
-        AND fa.atribuicao LIKE '%Administrador%'
-    ) INTO is_admin;
-
-    -- Check if user is staff (exists in FUNCIONARIO)
-    SELECT EXISTS(
-        SELECT 1
-        FROM funcionario
-        WHERE cpf_interno = cpf_pessoa
-    ) INTO is_staff;
-
-    -- Check if user is internal (exists in INTERNO_USP)
-    SELECT EXISTS(
-        SELECT 1
-        FROM interno_usp
-        WHERE interno_usp.cpf_pessoa = get_user_roles.cpf_pessoa
-    ) INTO is_internal;
-
-    -- Check if user is external (exists in PESSOA but not in INTERNO_USP and has CONVITE_EXTERNO)
-    SELECT EXISTS(
-        SELECT 1
-        FROM pessoa p
-        WHERE p.cpf = cpf_pessoa
-        AND NOT EXISTS (
-            SELECT 1 FROM interno_usp i WHERE i.cpf_pessoa = p.cpf
-        )
-        AND EXISTS (
-            SELECT 1 FROM convite_externo ce WHERE ce.email_convidado = p.email
-        )
-    ) INTO is_external;
+    SELECT us.papeis INTO bits
+    FROM usuario_senha us
+    WHERE us.cpf = get_user_roles.cpf_pessoa;
 
-    -- Build roles array
-    IF is_admin THEN
-        roles_array := array_append(roles_array, 'admin');
-    END IF;
-    IF is_staff THEN
-        roles_array := array_append(roles_array, 'staff');
-    END IF;
-    IF is_internal THEN
-        roles_array := array_append(roles_array, 'internal');
-    END IF;
-    IF is_external THEN
-        roles_array := array_append(roles_array, 'external');
+    IF NOT FOUND THEN
+        bits := compute_user_roles(cpf_pessoa);
     END IF;
 
-    -- Return as JSON
-    roles := json_build_object('roles', roles_array);
-    RETURN roles;
+    RETURN json_build_object('roles', user_roles_from_bits(bits));
 END;
 $$ LANGUAGE plpgsql;
 
@@ -424,17 +395,59 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- FUNCTION: log_login_attempt
+-- Builds the AUDITORIA_LOGIN row for a login attempt and inserts it when
+-- write_row is TRUE. The row is always returned as JSON so the application
+-- can write it later in batches (LOGIN_AUDIT_ASYNC).
+CREATE OR REPLACE FUNCTION log_login_attempt(
+    p_cpf VARCHAR,
+    p_email VARCHAR,
+    p_ip_origin VARCHAR,
+    p_status VARCHAR,
+    p_message TEXT,
+    write_row BOOLEAN DEFAULT TRUE
+)
+RETURNS JSON
+AS $$
+BEGIN
+    IF write_row THEN
+        INSERT INTO auditoria_login (
+            cpf, data_hora_login,
+            timestamp_evento, email_usuario, ip_origem, status, mensagem
+        )
+        VALUES (
+            p_cpf, CURRENT_TIMESTAMP,
+            CURRENT_TIMESTAMP, p_email, p_ip_origin, p_status, p_message
+        );
+    END IF;
+
+    RETURN json_build_object(
+        'cpf', p_cpf,
+        'timestamp_evento', CURRENT_TIMESTAMP,
+        'email_usuario', p_email,
+        'ip_origem', p_ip_origin,
+        'status', p_status,
+        'mensagem', p_message
+    );
+END;
+$$ LANGUAGE plpgsql;
+
 -- FUNCTION: authenticate_user
 -- Authenticates a user and returns their roles
 -- Parameters:
 --   email_or_cpf: Email or CPF of the user
 --   plain_password: Plain text password
 --   ip_origin: IP address of the login attempt
--- Returns: JSON with success status, user data, and roles
+--   write_audit: When FALSE the AUDITORIA_LOGIN row is not inserted here; it is
+--                returned under 'audit' for the application to write in batches.
+--                Failed-attempt counters and lockout are always updated here.
+-- Returns: JSON with success status, user data, roles and the audit row
+DROP FUNCTION IF EXISTS authenticate_user(VARCHAR, TEXT, VARCHAR);
 CREATE OR REPLACE FUNCTION authenticate_user(
     email_or_cpf VARCHAR,
     plain_password TEXT,
-    ip_origin VARCHAR DEFAULT NULL
+    ip_origin VARCHAR DEFAULT NULL,
+    write_audit BOOLEAN DEFAULT TRUE
 )
 RETURNS JSON
 AS $$
@@ -443,6 +456,7 @@ DECLARE
     password_record RECORD;
     password_valid BOOLEAN;
     roles_json JSON;
+    audit_json JSON;
     result JSON;
 BEGIN
     -- Find user by email or CPF
@@ -452,18 +466,14 @@ BEGIN
 
     IF NOT FOUND THEN
         -- Log failed attempt (sem CPF pois usuário não existe)
-        INSERT INTO auditoria_login (
-            cpf, data_hora_login,
-            timestamp_evento, email_usuario, ip_origem, status, mensagem
-        )
-        VALUES (
-            NULL, CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP, email_or_cpf, ip_origin, 'FAILURE', 'User not found'
+        audit_json := log_login_attempt(
+            NULL, email_or_cpf, ip_origin, 'FAILURE', 'User not found', write_audit
         );
 
         RETURN json_build_object(
             'success', FALSE,
-            'message', 'Credenciais inválidas'
+            'message', 'Credenciais inválidas',
+            'audit', audit_json
         );
     END IF;
 
@@ -474,35 +484,27 @@ BEGIN
 
     IF NOT FOUND THEN
         -- Log failed attempt (sem CPF pois conta não existe)
-        INSERT INTO auditoria_login (
-            cpf, data_hora_login,
-            timestamp_evento, email_usuario, ip_origem, status, mensagem
-        )
-        VALUES (
-            NULL, CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP, user_record.email, ip_origin, 'FAILURE', 'User account not found'
+        audit_json := log_login_attempt(
+            NULL, user_record.email, ip_origin, 'FAILURE', 'User account not found', write_audit
         );
 
         RETURN json_build_object(
             'success', FALSE,
-            'message', 'Credenciais inválidas'
+            'message', 'Credenciais inválidas',
+            'audit', audit_json
         );
     END IF;
 
     -- Check if account is blocked
     IF password_record.bloqueado THEN
-        INSERT INTO auditoria_login (
-            cpf, data_hora_login,
-            timestamp_evento, email_usuario, ip_origem, status, mensagem
-        )
-        VALUES (
-            password_record.cpf, CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP, user_record.email, ip_origin, 'LOCKED', 'Account is blocked'
+        audit_json := log_login_attempt(
+            password_record.cpf, user_record.email, ip_origin, 'LOCKED', 'Account is blocked', write_audit
         );
 
         RETURN json_build_object(
             'success', FALSE,
-            'message', 'Conta bloqueada'
+            'message', 'Conta bloqueada',
+            'audit', audit_json
         );
     END IF;
 
@@ -510,31 +512,22 @@ BEGIN
     password_valid := verify_password(plain_password, password_record.senha_hash);
 
     IF NOT password_valid THEN
-        -- Increment failed attempts
+        -- Increment failed attempts and block the account after 5 failures
+        -- (single statement, so concurrent attempts cannot lose increments)
         UPDATE usuario_senha
-        SET tentativas_login = tentativas_login + 1
+        SET tentativas_login = tentativas_login + 1,
+            bloqueado = bloqueado OR tentativas_login + 1 >= 5
         WHERE cpf = user_record.cpf;
 
-        -- Block account after 5 failed attempts
-        IF password_record.tentativas_login + 1 >= 5 THEN
-            UPDATE usuario_senha
-            SET bloqueado = TRUE
-            WHERE cpf = user_record.cpf;
-        END IF;
-
         -- Log failed attempt
-        INSERT INTO auditoria_login (
-            cpf, data_hora_login,
-            timestamp_evento, email_usuario, ip_origem, status, mensagem
-        )
-        VALUES (
-            password_record.cpf, CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP, user_record.email, ip_origin, 'FAILURE', 'Invalid password'
+        audit_json := log_login_attempt(
+            password_record.cpf, user_record.email, ip_origin, 'FAILURE', 'Invalid password', write_audit
         );
 
         RETURN json_build_object(
             'success', FALSE,
-            'message', 'Credenciais inválidas'
+            'message', 'Credenciais inválidas',
+            'audit', audit_json
         );
     END IF;
 
@@ -548,13 +541,8 @@ BEGIN
     roles_json := get_user_roles(user_record.cpf);
 
     -- Log successful login
-    INSERT INTO auditoria_login (
-        cpf, data_hora_login,
-        timestamp_evento, email_usuario, ip_origem, status, mensagem
-    )
-    VALUES (
-        password_record.cpf, CURRENT_TIMESTAMP,
-        CURRENT_TIMESTAMP, user_record.email, ip_origin, 'SUCCESS', 'Login successful'
+    audit_json := log_login_attempt(
+        password_record.cpf, user_record.email, ip_origin, 'SUCCESS', 'Login successful', write_audit
     );
 
     -- Build result
@@ -563,7 +551,8 @@ BEGIN
         'user_id', user_record.cpf,
         'email', user_record.email,
         'nome', user_record.nome,
-        'roles', roles_json->'roles'
+        'roles', roles_json->'roles',
+        'audit', audit_json
     );
 
     RETURN result;
@@ -687,15 +676,15 @@ BEGIN
 
     -- Check if activity exists and has available spots BEFORE accepting
     IF invite_record.id_atividade IS NOT NULL THEN
+        -- Lock the activity row so concurrent acceptances cannot exceed the limit
         SELECT * INTO activity_record
         FROM atividade
-        WHERE id_atividade = invite_record.id_atividade;
+        WHERE id_atividade = invite_record.id_atividade
+        FOR UPDATE;
 
         IF FOUND THEN
-            -- Check if there are available spots
-            SELECT COUNT(*) INTO current_participants_count
-            FROM participacao_atividade
-            WHERE id_atividade = invite_record.id_atividade;
+            -- Check if there are available spots (counter maintained by trigger)
+            current_participants_count := activity_record.vagas_ocupadas;
 
             -- If activity has a limit and it's reached, reject the acceptance
             IF activity_record.vagas_limite IS NOT NULL
@@ -5,6 +5,9 @@ BEGIN
     IF (NEW.horario_inicio < '06:00' OR NEW.horario_fim > '22:00') THEN
         RAISE EXCEPTION 'Horário de reserva inválido (permitido: 06h–22h)';
     END IF;
+    IF NEW.horario_fim <= NEW.horario_inicio THEN
+        RAISE EXCEPTION 'O horário de fim deve ser maior que o horário de início.';
+    END IF;
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
@@ -36,36 +39,273 @@ CREATE TRIGGER trg_checar_formacao_educador
 BEFORE INSERT ON conduz_atividade
 FOR EACH ROW EXECUTE FUNCTION checar_formacao_educador();
 
--- TRIGGER para impedir reservas conflitantes na mesma instalação:
+-- CONSTRAINTS para impedir reservas conflitantes (mesma instalação/equipamento):
+-- Exclusion constraints sobre (recurso =, tsrange &&) com btree_gist. O índice
+-- GiST da constraint torna a verificação uma busca no índice (sem varrer a
+-- tabela) e o Postgres serializa inserções concorrentes que se sobrepõem: a
+-- segunda espera a primeira e falha com SQLSTATE 23P01 (exclusion_violation).
+-- Adicionadas via DO para que bancos existentes recebam as constraints; se já
+-- houver reservas sobrepostas, um aviso é emitido e o restante do arquivo segue.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_reserva_sobreposicao') THEN
+        BEGIN
+            ALTER TABLE reserva
+                ADD CONSTRAINT ex_reserva_sobreposicao EXCLUDE USING gist (
+                    id_instalacao WITH =,
+                    tsrange(data_reserva + horario_inicio, data_reserva + horario_fim) WITH &&
+                );
+        EXCEPTION WHEN exclusion_violation OR data_exception THEN
+            RAISE WARNING 'ex_reserva_sobreposicao não criada: existem reservas sobrepostas (%)', SQLERRM;
+        END;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_reserva_equip_sobreposicao') THEN
+        BEGIN
+            ALTER TABLE reserva_equipamento
+                ADD CONSTRAINT ex_reserva_equip_sobreposicao EXCLUDE USING gist (
+                    id_equipamento WITH =,
+                    tsrange(data_reserva + horario_inicio, data_reserva + horario_fim) WITH &&
+                );
+        EXCEPTION WHEN exclusion_violation OR data_exception THEN
+            RAISE WARNING 'ex_reserva_equip_sobreposicao não criada: existem reservas sobrepostas (%)', SQLERRM;
+        END;
+    END IF;
+END;
+$$;
 
 -- ============================================================================
--- TRIGGERS PARA SINCRONIZAR CAMPO TIPO EM USUARIO_SENHA
+-- CONTADOR DE VAGAS OCUPADAS EM ATIVIDADE
 -- ============================================================================
--- Estes triggers garantem que o campo TIPO seja sempre atualizado quando
--- há mudanças nas tabelas relacionadas que determinam o tipo do usuário.
--- O tipo é determinado pela função get_user_type() com prioridade:
+-- ATIVIDADE.VAGAS_OCUPADAS guarda o número de linhas de PARTICIPACAO_ATIVIDADE
+-- da atividade, para que listagens e checagens de vagas não agreguem as
+-- participações. É mantido por triggers de instrução (tabelas de transição),
+-- então um INSERT em lote atualiza cada atividade uma única vez.
+-- reconciliar_vagas_ocupadas() detecta e corrige divergências.
+
+-- Bancos criados antes do contador recebem a coluna e o valor inicial
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'atividade'
+          AND column_name = 'vagas_ocupadas'
+    ) THEN
+        ALTER TABLE atividade ADD COLUMN vagas_ocupadas INT NOT NULL DEFAULT 0;
+
+        UPDATE atividade a
+        SET vagas_ocupadas = p.total
+        FROM (
+            SELECT id_atividade, COUNT(*)::INT AS total
+            FROM participacao_atividade
+            GROUP BY id_atividade
+        ) p
+        WHERE p.id_atividade = a.id_atividade;
+    END IF;
+END;
+$$;
+
+-- FUNCTION: trg_vagas_ocupadas
+-- Aplica o delta de INSERT/UPDATE/DELETE em PARTICIPACAO_ATIVIDADE ao contador.
+CREATE OR REPLACE FUNCTION trg_vagas_ocupadas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE atividade a
+        SET vagas_ocupadas = a.vagas_ocupadas - d.total
+        FROM (
+            SELECT id_atividade, COUNT(*)::INT AS total
+            FROM antigas
+            GROUP BY id_atividade
+        ) d
+        WHERE a.id_atividade = d.id_atividade;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE atividade a
+        SET vagas_ocupadas = a.vagas_ocupadas + d.total
+        FROM (
+            SELECT id_atividade, COUNT(*)::INT AS total
+            FROM novas
+            GROUP BY id_atividade
+        ) d
+        WHERE a.id_atividade = d.id_atividade;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- FUNCTION: trg_vagas_ocupadas_truncate
+CREATE OR REPLACE FUNCTION trg_vagas_ocupadas_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE atividade SET vagas_ocupadas = 0 WHERE vagas_ocupadas <> 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_insert ON participacao_atividade;
+CREATE TRIGGER trg_vagas_ocupadas_insert
+AFTER INSERT ON participacao_atividade
+REFERENCING NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_vagas_ocupadas();
+
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_update ON participacao_atividade;
+CREATE TRIGGER trg_vagas_ocupadas_update
+AFTER UPDATE ON participacao_atividade
+REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_vagas_ocupadas();
+
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_delete ON participacao_atividade;
+CREATE TRIGGER trg_vagas_ocupadas_delete
+AFTER DELETE ON participacao_atividade
+REFERENCING OLD TABLE AS antigas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_vagas_ocupadas();
+
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_truncate ON participacao_atividade;
+CREATE TRIGGER trg_vagas_ocupadas_truncate
+AFTER TRUNCATE ON participacao_atividade
+FOR EACH STATEMENT EXECUTE FUNCTION trg_vagas_ocupadas_truncate();
+
+-- FUNCTION: reconciliar_vagas_ocupadas
+-- Compara o contador com a contagem real, corrige as divergências e retorna
+-- as atividades corrigidas (vazio quando não há drift). Escritas em
+-- PARTICIPACAO_ATIVIDADE ficam bloqueadas durante a verificação.
+-- Uso: SELECT * FROM reconciliar_vagas_ocupadas();
+DROP FUNCTION IF EXISTS reconciliar_vagas_ocupadas();
+CREATE OR REPLACE FUNCTION reconciliar_vagas_ocupadas()
+RETURNS TABLE (
+    id_atividade_corrigida INT,
+    vagas_ocupadas_anterior INT,
+    vagas_ocupadas_real INT
+)
+AS $$
+BEGIN
+    LOCK TABLE participacao_atividade IN SHARE MODE;
+
+    RETURN QUERY
+    WITH reais AS (
+        SELECT a.id_atividade AS id_item, a.vagas_ocupadas AS armazenado, COUNT(pa.cpf_participante)::INT AS contagem
+        FROM atividade a
+        LEFT JOIN participacao_atividade pa ON pa.id_atividade = a.id_atividade
+        GROUP BY a.id_atividade, a.vagas_ocupadas
+    ),
+    corrigidas AS (
+        UPDATE atividade a
+        SET vagas_ocupadas = r.contagem
+        FROM reais r
+        WHERE a.id_atividade = r.id_item
+          AND r.armazenado <> r.contagem
+        RETURNING a.id_atividade AS id_item
+    )
+    SELECT r.id_item, r.armazenado, r.contagem
+    FROM reais r
+    JOIN corrigidas c ON c.id_item = r.id_item
+    ORDER BY r.id_item;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- NOTIFICAÇÃO DE MUDANÇAS NO CATÁLOGO DE ATIVIDADES
+-- ============================================================================
+-- A aplicação mantém em memória o catálogo de /internal/activities
+-- (app/services/activity_catalog.py) e escuta o canal catalogo_atividades
+-- para descartá-lo. O NOTIFY só é entregue no COMMIT, e notificações iguais
+-- na mesma transação são agrupadas pelo Postgres, então cada transação que
+-- altera as tabelas gera no máximo uma mensagem por tabela.
+
+-- FUNCTION: notificar_catalogo_atividades
+CREATE OR REPLACE FUNCTION notificar_catalogo_atividades()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('catalogo_atividades', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_atividade ON atividade;
+CREATE TRIGGER trg_notificar_catalogo_atividade
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON atividade
+FOR EACH STATEMENT EXECUTE FUNCTION notificar_catalogo_atividades();
+
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_ocorrencia ON ocorrencia_semanal;
+CREATE TRIGGER trg_notificar_catalogo_ocorrencia
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ocorrencia_semanal
+FOR EACH STATEMENT EXECUTE FUNCTION notificar_catalogo_atividades();
+
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_participacao ON participacao_atividade;
+CREATE TRIGGER trg_notificar_catalogo_participacao
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON participacao_atividade
+FOR EACH STATEMENT EXECUTE FUNCTION notificar_catalogo_atividades();
+
+-- O catálogo mostra e filtra pelo grupo de extensão da atividade. Renomear um
+-- grupo também altera atividade_grupo_extensao (ON UPDATE CASCADE).
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_grupo ON grupo_extensao;
+CREATE TRIGGER trg_notificar_catalogo_grupo
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON grupo_extensao
+FOR EACH STATEMENT EXECUTE FUNCTION notificar_catalogo_atividades();
+
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_atividade_grupo ON atividade_grupo_extensao;
+CREATE TRIGGER trg_notificar_catalogo_atividade_grupo
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON atividade_grupo_extensao
+FOR EACH STATEMENT EXECUTE FUNCTION notificar_catalogo_atividades();
+
+-- ============================================================================
+-- TRIGGERS PARA SINCRONIZAR TIPO E PAPEIS EM USUARIO_SENHA
+-- ============================================================================
+-- Estes triggers garantem que os campos TIPO e PAPEIS sejam sempre atualizados
+-- quando há mudanças nas tabelas relacionadas que determinam o tipo do usuário.
+-- PAPEIS é o bitmap calculado por compute_user_roles() (1 admin, 2 staff,
+-- 4 interno, 8 externo), lido por get_user_roles() e pela aplicação para
+-- revalidar os papéis da sessão. TIPO é derivado dele com prioridade:
 -- Administrador > Staff > Interno > Externo
 
+-- Bancos criados antes do bitmap recebem a coluna e o valor inicial
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'usuario_senha'
+          AND column_name = 'papeis'
+    ) THEN
+        ALTER TABLE usuario_senha ADD COLUMN papeis SMALLINT NOT NULL DEFAULT 0;
+
+        UPDATE usuario_senha
+        SET papeis = compute_user_roles(cpf);
+    END IF;
+END;
+$$;
+
 -- FUNCTION: sync_user_type
--- Atualiza o campo TIPO em USUARIO_SENHA usando get_user_type()
+-- Recalcula TIPO e PAPEIS em USUARIO_SENHA; só escreve quando algo mudou
 -- Parameters:
 --   cpf_pessoa: CPF do usuário a ser atualizado
 CREATE OR REPLACE FUNCTION sync_user_type(cpf_pessoa VARCHAR)
 RETURNS VOID
 AS $$
 DECLARE
-    calculated_type VARCHAR(50);
+    bits SMALLINT;
 BEGIN
-    -- Calcula o tipo usando a função get_user_type
-    calculated_type := get_user_type(cpf_pessoa);
-
-    -- Atualiza o campo TIPO se o usuário existir em USUARIO_SENHA
-    IF EXISTS(SELECT 1 FROM usuario_senha WHERE cpf = cpf_pessoa) THEN
-        UPDATE usuario_senha
-        SET tipo = calculated_type,
-            data_ultima_alteracao = CURRENT_TIMESTAMP
-        WHERE cpf = cpf_pessoa;
+    -- Pessoas sem conta não têm o que sincronizar
+    IF NOT EXISTS(SELECT 1 FROM usuario_senha WHERE cpf = cpf_pessoa) THEN
+        RETURN;
     END IF;
+
+    bits := compute_user_roles(cpf_pessoa);
+
+    UPDATE usuario_senha
+    SET papeis = bits,
+        tipo = user_type_from_roles(bits),
+        data_ultima_alteracao = CURRENT_TIMESTAMP
+    WHERE cpf = cpf_pessoa
+      AND (papeis IS DISTINCT FROM bits OR tipo IS DISTINCT FROM user_type_from_roles(bits));
 END;
 $$ LANGUAGE plpgsql;
 
@@ -81,11 +321,15 @@ BEGIN
     ELSE
         -- Quando adiciona ou atualiza atribuição, recalcula tipo
         PERFORM sync_user_type(NEW.cpf_funcionario);
+        IF TG_OP = 'UPDATE' AND OLD.cpf_funcionario IS DISTINCT FROM NEW.cpf_funcionario THEN
+            PERFORM sync_user_type(OLD.cpf_funcionario);
+        END IF;
         RETURN NEW;
     END IF;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_sync_tipo_funcionario_atribuicao ON funcionario_atribuicao;
 CREATE TRIGGER trg_sync_tipo_funcionario_atribuicao
 AFTER INSERT OR UPDATE OR DELETE ON funcionario_atribuicao
 FOR EACH ROW EXECUTE FUNCTION trg_sync_tipo_funcionario_atribuicao();
@@ -102,11 +346,15 @@ BEGIN
     ELSE
         -- Quando cria ou atualiza funcionário, recalcula tipo (pode virar Staff)
         PERFORM sync_user_type(NEW.cpf_interno);
+        IF TG_OP = 'UPDATE' AND OLD.cpf_interno IS DISTINCT FROM NEW.cpf_interno THEN
+            PERFORM sync_user_type(OLD.cpf_interno);
+        END IF;
         RETURN NEW;
     END IF;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_sync_tipo_funcionario ON funcionario;
 CREATE TRIGGER trg_sync_tipo_funcionario
 AFTER INSERT OR UPDATE OR DELETE ON funcionario
 FOR EACH ROW EXECUTE FUNCTION trg_sync_tipo_funcionario();
@@ -123,59 +371,89 @@ BEGIN
     ELSE
         -- Quando cria ou atualiza interno, recalcula tipo (pode virar Interno)
         PERFORM sync_user_type(NEW.cpf_pessoa);
+        IF TG_OP = 'UPDATE' AND OLD.cpf_pessoa IS DISTINCT FROM NEW.cpf_pessoa THEN
+            PERFORM sync_user_type(OLD.cpf_pessoa);
+        END IF;
         RETURN NEW;
     END IF;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_sync_tipo_interno ON interno_usp;
 CREATE TRIGGER trg_sync_tipo_interno
 AFTER INSERT OR UPDATE OR DELETE ON interno_usp
 FOR EACH ROW EXECUTE FUNCTION trg_sync_tipo_interno();
 
--- TRIGGER: Atualizar TIPO quando convite externo é criado/aceito
--- Dispara quando há INSERT ou UPDATE em CONVITE_EXTERNO (quando status muda para ACEITO)
+-- TRIGGER: Atualizar TIPO quando convite externo é criado/alterado/removido
+-- O papel externo depende da existência de qualquer convite para o email da
+-- pessoa, então recalcula o email antigo e o novo em INSERT, UPDATE e DELETE
 CREATE OR REPLACE FUNCTION trg_sync_tipo_convite_externo()
 RETURNS TRIGGER AS $$
 DECLARE
     cpf_externo VARCHAR(11);
 BEGIN
-    -- Busca o CPF do externo pelo email do convite
-    SELECT p.cpf INTO cpf_externo
-    FROM pessoa p
-    WHERE p.email = NEW.email_convidado;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        -- Busca o CPF do externo pelo email do convite
+        FOR cpf_externo IN
+            SELECT p.cpf FROM pessoa p WHERE p.email = NEW.email_convidado
+        LOOP
+            PERFORM sync_user_type(cpf_externo);
+        END LOOP;
+    END IF;
 
-    -- Se encontrou CPF e o convite foi aceito, atualiza o tipo
-    IF cpf_externo IS NOT NULL AND NEW.status = 'ACEITO' THEN
-        PERFORM sync_user_type(cpf_externo);
+    IF TG_OP = 'DELETE'
+       OR (TG_OP = 'UPDATE' AND OLD.email_convidado IS DISTINCT FROM NEW.email_convidado) THEN
+        FOR cpf_externo IN
+            SELECT p.cpf FROM pessoa p WHERE p.email = OLD.email_convidado
+        LOOP
+            PERFORM sync_user_type(cpf_externo);
+        END LOOP;
     END IF;
 
-    RETURN NEW;
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_sync_tipo_convite_externo ON convite_externo;
 CREATE TRIGGER trg_sync_tipo_convite_externo
-AFTER INSERT OR UPDATE ON convite_externo
+AFTER INSERT OR DELETE OR UPDATE OF email_convidado, status ON convite_externo
 FOR EACH ROW
-WHEN (NEW.status = 'ACEITO')
 EXECUTE FUNCTION trg_sync_tipo_convite_externo();
 
--- TRIGGER: Garantir TIPO preenchido na criação de USUARIO_SENHA
--- Dispara antes de INSERT em USUARIO_SENHA para garantir que TIPO seja preenchido
+-- TRIGGER: Atualizar TIPO quando o email da pessoa muda
+-- O email liga a pessoa aos convites externos
+CREATE OR REPLACE FUNCTION trg_sync_tipo_pessoa_email()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM sync_user_type(NEW.cpf);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_sync_tipo_pessoa_email ON pessoa;
+CREATE TRIGGER trg_sync_tipo_pessoa_email
+AFTER UPDATE OF email ON pessoa
+FOR EACH ROW
+WHEN (OLD.email IS DISTINCT FROM NEW.email)
+EXECUTE FUNCTION trg_sync_tipo_pessoa_email();
+
+-- TRIGGER: Garantir TIPO e PAPEIS preenchidos na criação de USUARIO_SENHA
+-- Dispara antes de INSERT em USUARIO_SENHA
 CREATE OR REPLACE FUNCTION trg_ensure_tipo_on_insert()
 RETURNS TRIGGER AS $$
-DECLARE
-    calculated_type VARCHAR(50);
 BEGIN
-    -- Se TIPO não foi fornecido ou é NULL, calcula usando get_user_type
+    NEW.papeis := compute_user_roles(NEW.cpf);
+
+    -- Se TIPO não foi fornecido ou é NULL, deriva do bitmap
     IF NEW.tipo IS NULL THEN
-        calculated_type := get_user_type(NEW.cpf);
-        NEW.tipo := calculated_type;
+        NEW.tipo := user_type_from_roles(NEW.papeis);
     END IF;
 
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_ensure_tipo_on_insert ON usuario_senha;
 CREATE TRIGGER trg_ensure_tipo_on_insert
 BEFORE INSERT ON usuario_senha
 FOR EACH ROW EXECUTE FUNCTION trg_ensure_tipo_on_insert();
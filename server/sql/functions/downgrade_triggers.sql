@@ -5,7 +5,25 @@ DROP TRIGGER IF EXISTS trg_sync_tipo_funcionario_atribuicao ON funcionario_atrib
 DROP TRIGGER IF EXISTS trg_sync_tipo_funcionario ON funcionario;
 DROP TRIGGER IF EXISTS trg_sync_tipo_interno ON interno_usp;
 DROP TRIGGER IF EXISTS trg_sync_tipo_convite_externo ON convite_externo;
+DROP TRIGGER IF EXISTS trg_sync_tipo_pessoa_email ON pessoa;
 DROP TRIGGER IF EXISTS trg_ensure_tipo_on_insert ON usuario_senha;
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_atividade ON atividade;
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_ocorrencia ON ocorrencia_semanal;
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_participacao ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_grupo ON grupo_extensao;
+DROP TRIGGER IF EXISTS trg_notificar_catalogo_atividade_grupo ON atividade_grupo_extensao;
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_insert ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_update ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_delete ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_vagas_ocupadas_truncate ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_resumo_reservas_insert ON reserva;
+DROP TRIGGER IF EXISTS trg_resumo_reservas_update ON reserva;
+DROP TRIGGER IF EXISTS trg_resumo_reservas_delete ON reserva;
+DROP TRIGGER IF EXISTS trg_resumo_reservas_truncate ON reserva;
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_insert ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_update ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_delete ON participacao_atividade;
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_truncate ON participacao_atividade;
 
 -- Remover funções associadas aos triggers
 DROP FUNCTION IF EXISTS validar_horario_reserva() CASCADE;
@@ -15,4 +33,13 @@ DROP FUNCTION IF EXISTS trg_sync_tipo_funcionario_atribuicao() CASCADE;
 DROP FUNCTION IF EXISTS trg_sync_tipo_funcionario() CASCADE;
 DROP FUNCTION IF EXISTS trg_sync_tipo_interno() CASCADE;
 DROP FUNCTION IF EXISTS trg_sync_tipo_convite_externo() CASCADE;
+DROP FUNCTION IF EXISTS trg_sync_tipo_pessoa_email() CASCADE;
 DROP FUNCTION IF EXISTS trg_ensure_tipo_on_insert() CASCADE;
+DROP FUNCTION IF EXISTS notificar_catalogo_atividades() CASCADE;
+DROP FUNCTION IF EXISTS trg_vagas_ocupadas() CASCADE;
+DROP FUNCTION IF EXISTS trg_vagas_ocupadas_truncate() CASCADE;
+DROP FUNCTION IF EXISTS reconciliar_vagas_ocupadas();
+DROP FUNCTION IF EXISTS trg_resumo_reservas() CASCADE;
+DROP FUNCTION IF EXISTS trg_resumo_inscricoes() CASCADE;
+DROP FUNCTION IF EXISTS trg_resumo_truncate() CASCADE;
+DROP FUNCTION IF EXISTS recalcular_resumos_relatorios();
@@ -29,6 +29,13 @@ $$ LANGUAGE plpgsql;
 -- SELECT * FROM get_reservas_interno('CPF_INTERNO_EXEMPLO');
 
 -- FUNCTION para listar instalações disponíveis em um determinado dia e horário:
+-- O conflito é testado por sobreposição de intervalos (tsrange &&), atendido
+-- pelo índice GiST da constraint ex_reserva_sobreposicao. A próxima reserva e a anterior vêm de
+-- uma única busca LATERAL cada, pelos índices (id_instalacao, data_reserva,
+-- horario_inicio) e (id_instalacao, data_reserva, horario_fim).
+-- hora_fim < hora_inicio gera exceção; com hora_fim = hora_inicio o intervalo
+-- é vazio e nenhuma reserva é reportada como conflito (as rotas exigem fim >
+-- início antes de chamar).
 DROP FUNCTION IF EXISTS get_instalacoes_disponiveis_horario(DATE, TIME, TIME);
 CREATE OR REPLACE FUNCTION get_instalacoes_disponiveis_horario(
     dia DATE,
@@ -49,6 +56,10 @@ RETURNS TABLE (
 )
 AS $$
 BEGIN
+    IF hora_fim < hora_inicio THEN
+        RAISE EXCEPTION 'Horário final (%) deve ser posterior ao horário inicial (%)', hora_fim, hora_inicio;
+    END IF;
+
     RETURN QUERY
     SELECT
         i.id_instalacao,
@@ -56,71 +67,36 @@ BEGIN
         i.tipo,
         i.capacidade,
         'Disponível'::VARCHAR AS status_disponibilidade,
-        (
-            SELECT r_prox.data_reserva
-            FROM reserva r_prox
-            WHERE r_prox.id_instalacao = i.id_instalacao
-              AND (
-                  (r_prox.data_reserva > dia)
-                  OR (r_prox.data_reserva = dia AND r_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY r_prox.data_reserva ASC, r_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_data,
-        (
-            SELECT r_prox.horario_inicio
-            FROM reserva r_prox
-            WHERE r_prox.id_instalacao = i.id_instalacao
-              AND (
-                  (r_prox.data_reserva > dia)
-                  OR (r_prox.data_reserva = dia AND r_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY r_prox.data_reserva ASC, r_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_inicio,
-        (
-            SELECT r_prox.horario_fim
-            FROM reserva r_prox
-            WHERE r_prox.id_instalacao = i.id_instalacao
-              AND (
-                  (r_prox.data_reserva > dia)
-                  OR (r_prox.data_reserva = dia AND r_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY r_prox.data_reserva ASC, r_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_fim,
-        (
-            SELECT r_ant.data_reserva
-            FROM reserva r_ant
-            WHERE r_ant.id_instalacao = i.id_instalacao
-              AND (
-                  (r_ant.data_reserva < dia)
-                  OR (r_ant.data_reserva = dia AND r_ant.horario_fim <= hora_inicio)
-              )
-            ORDER BY r_ant.data_reserva DESC, r_ant.horario_fim DESC
-            LIMIT 1
-        ) AS reserva_anterior_data,
-        (
-            SELECT r_ant.horario_fim
-            FROM reserva r_ant
-            WHERE r_ant.id_instalacao = i.id_instalacao
-              AND (
-                  (r_ant.data_reserva < dia)
-                  OR (r_ant.data_reserva = dia AND r_ant.horario_fim <= hora_inicio)
-              )
-            ORDER BY r_ant.data_reserva DESC, r_ant.horario_fim DESC
-            LIMIT 1
-        ) AS reserva_anterior_fim
+        r_prox.data_reserva AS proxima_reserva_data,
+        r_prox.horario_inicio AS proxima_reserva_inicio,
+        r_prox.horario_fim AS proxima_reserva_fim,
+        r_ant.data_reserva AS reserva_anterior_data,
+        r_ant.horario_fim AS reserva_anterior_fim
     FROM instalacao i
+    LEFT JOIN LATERAL (
+        SELECT r.data_reserva, r.horario_inicio, r.horario_fim
+        FROM reserva r
+        WHERE r.id_instalacao = i.id_instalacao
+          AND (r.data_reserva, r.horario_inicio) >= (dia, hora_fim)
+        ORDER BY r.data_reserva ASC, r.horario_inicio ASC
+        LIMIT 1
+    ) r_prox ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT r.data_reserva, r.horario_fim
+        FROM reserva r
+        WHERE r.id_instalacao = i.id_instalacao
+          AND (r.data_reserva, r.horario_fim) <= (dia, hora_inicio)
+        ORDER BY r.data_reserva DESC, r.horario_fim DESC
+        LIMIT 1
+    ) r_ant ON TRUE
     WHERE i.eh_reservavel = 'S'
-      AND i.id_instalacao NOT IN (
-          SELECT r.id_instalacao
+      AND NOT EXISTS (
+          -- verifica se há sobreposição de horários
+          SELECT 1
           FROM reserva r
-          WHERE r.data_reserva = dia
-            AND (
-                -- verifica se há sobreposição de horários
-                (hora_inicio < r.horario_fim AND hora_fim > r.horario_inicio)
-            )
+          WHERE r.id_instalacao = i.id_instalacao
+            AND tsrange(r.data_reserva + r.horario_inicio, r.data_reserva + r.horario_fim)
+                && tsrange(dia + hora_inicio, dia + hora_fim)
       )
     ORDER BY i.nome;
 END;
@@ -128,14 +104,22 @@ $$ LANGUAGE plpgsql;
 
 -- SELECT * FROM get_instalacoes_disponiveis_horario('2023-11-10', '12:00', '14:00');
 
--- FUNCTION para listar equipamentos disponíveis em um determinado dia e horário:
-DROP FUNCTION IF EXISTS get_equipamentos_disponiveis_horario(DATE, TIME, TIME);
-CREATE OR REPLACE FUNCTION get_equipamentos_disponiveis_horario(
-    dia DATE,
-    hora_inicio TIME,
-    hora_fim TIME
+-- FUNCTION para listar equipamentos disponíveis em vários horários de uma vez:
+-- Cada horário (dias[k], horas_inicio[k], horas_fim[k]) vira uma linha de
+-- "slots" e tudo é resolvido numa única consulta. Conflito, próxima reserva e
+-- reserva anterior são buscas LATERAL nos índices (id_equipamento,
+-- data_reserva, horario_inicio) e (id_equipamento, data_reserva, horario_fim).
+-- A coluna slot indica a posição (1..n) do horário nos arrays. Como em
+-- get_instalacoes_disponiveis_horario, fim < início gera exceção e um horário
+-- com fim = início é um intervalo vazio, sem conflitos.
+DROP FUNCTION IF EXISTS get_equipamentos_disponiveis_horarios(DATE[], TIME[], TIME[]);
+CREATE OR REPLACE FUNCTION get_equipamentos_disponiveis_horarios(
+    dias DATE[],
+    horas_inicio TIME[],
+    horas_fim TIME[]
 )
 RETURNS TABLE (
+    slot INT,
     id_patrimonio VARCHAR,
     nome VARCHAR,
     local VARCHAR,
@@ -148,80 +132,110 @@ RETURNS TABLE (
 )
 AS $$
 BEGIN
+    IF cardinality(dias) <> cardinality(horas_inicio) OR cardinality(dias) <> cardinality(horas_fim) THEN
+        RAISE EXCEPTION 'Os arrays de dias, horários de início e horários de fim devem ter o mesmo tamanho';
+    END IF;
+
+    IF EXISTS (
+        SELECT 1
+        FROM unnest(horas_inicio, horas_fim) AS h(inicio, fim)
+        WHERE h.fim < h.inicio
+    ) THEN
+        RAISE EXCEPTION 'Horário final deve ser posterior ao horário inicial em todos os horários';
+    END IF;
+
     RETURN QUERY
+    WITH slots AS (
+        SELECT s.ordem::INT AS slot, s.dia, s.inicio, s.fim
+        FROM unnest(dias, horas_inicio, horas_fim) WITH ORDINALITY AS s(dia, inicio, fim, ordem)
+    )
     SELECT
+        s.slot,
         e.id_patrimonio,
         e.nome,
         COALESCE(i.nome, 'Sem local') AS local,
         'Disponível'::VARCHAR AS status_disponibilidade,
-        (
-            SELECT re_prox.data_reserva
-            FROM reserva_equipamento re_prox
-            WHERE re_prox.id_equipamento = e.id_patrimonio
-              AND (
-                  (re_prox.data_reserva > dia)
-                  OR (re_prox.data_reserva = dia AND re_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY re_prox.data_reserva ASC, re_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_data,
-        (
-            SELECT re_prox.horario_inicio
-            FROM reserva_equipamento re_prox
-            WHERE re_prox.id_equipamento = e.id_patrimonio
-              AND (
-                  (re_prox.data_reserva > dia)
-                  OR (re_prox.data_reserva = dia AND re_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY re_prox.data_reserva ASC, re_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_inicio,
-        (
-            SELECT re_prox.horario_fim
-            FROM reserva_equipamento re_prox
-            WHERE re_prox.id_equipamento = e.id_patrimonio
-              AND (
-                  (re_prox.data_reserva > dia)
-                  OR (re_prox.data_reserva = dia AND re_prox.horario_inicio >= hora_fim)
-              )
-            ORDER BY re_prox.data_reserva ASC, re_prox.horario_inicio ASC
-            LIMIT 1
-        ) AS proxima_reserva_fim,
-        (
-            SELECT re_ant.data_reserva
-            FROM reserva_equipamento re_ant
-            WHERE re_ant.id_equipamento = e.id_patrimonio
-              AND (
-                  (re_ant.data_reserva < dia)
-                  OR (re_ant.data_reserva = dia AND re_ant.horario_fim <= hora_inicio)
-              )
-            ORDER BY re_ant.data_reserva DESC, re_ant.horario_fim DESC
-            LIMIT 1
-        ) AS reserva_anterior_data,
-        (
-            SELECT re_ant.horario_fim
-            FROM reserva_equipamento re_ant
-            WHERE re_ant.id_equipamento = e.id_patrimonio
-              AND (
-                  (re_ant.data_reserva < dia)
-                  OR (re_ant.data_reserva = dia AND re_ant.horario_fim <= hora_inicio)
-              )
-            ORDER BY re_ant.data_reserva DESC, re_ant.horario_fim DESC
-            LIMIT 1
-        ) AS reserva_anterior_fim
-    FROM equipamento e
+        re_prox.data_reserva AS proxima_reserva_data,
+        re_prox.horario_inicio AS proxima_reserva_inicio,
+        re_prox.horario_fim AS proxima_reserva_fim,
+        re_ant.data_reserva AS reserva_anterior_data,
+        re_ant.horario_fim AS reserva_anterior_fim
+    FROM slots s
+    CROSS JOIN equipamento e
     LEFT JOIN instalacao i ON e.id_instalacao_local = i.id_instalacao
+    LEFT JOIN LATERAL (
+        SELECT re.data_reserva, re.horario_inicio, re.horario_fim
+        FROM reserva_equipamento re
+        WHERE re.id_equipamento = e.id_patrimonio
+          AND (re.data_reserva, re.horario_inicio) >= (s.dia, s.fim)
+        ORDER BY re.data_reserva ASC, re.horario_inicio ASC
+        LIMIT 1
+    ) re_prox ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT re.data_reserva, re.horario_fim
+        FROM reserva_equipamento re
+        WHERE re.id_equipamento = e.id_patrimonio
+          AND (re.data_reserva, re.horario_fim) <= (s.dia, s.inicio)
+        ORDER BY re.data_reserva DESC, re.horario_fim DESC
+        LIMIT 1
+    ) re_ant ON TRUE
     WHERE e.eh_reservavel = 'S'
-      AND e.id_patrimonio NOT IN (
-          SELECT re.id_equipamento
+      AND NOT EXISTS (
+          -- verifica se há sobreposição de horários
+          SELECT 1
           FROM reserva_equipamento re
-          WHERE re.data_reserva = dia
-            AND (
-                -- verifica se há sobreposição de horários
-                (hora_inicio < re.horario_fim AND hora_fim > re.horario_inicio)
-            )
+          WHERE re.id_equipamento = e.id_patrimonio
+            AND re.data_reserva = s.dia
+            AND re.horario_inicio < s.fim
+            AND re.horario_fim > s.inicio
       )
-    ORDER BY e.nome;
+    ORDER BY s.slot, e.nome;
+END;
+$$ LANGUAGE plpgsql;
+
+-- SELECT * FROM get_equipamentos_disponiveis_horarios(
+--     ARRAY['2023-11-10', '2023-11-11']::DATE[],
+--     ARRAY['12:00', '08:00']::TIME[],
+--     ARRAY['14:00', '09:00']::TIME[]
+-- );
+
+-- FUNCTION para listar equipamentos disponíveis em um determinado dia e horário:
+-- Caso particular de get_equipamentos_disponiveis_horarios com um único horário.
+DROP FUNCTION IF EXISTS get_equipamentos_disponiveis_horario(DATE, TIME, TIME);
+CREATE OR REPLACE FUNCTION get_equipamentos_disponiveis_horario(
+    dia DATE,
+    hora_inicio TIME,
+    hora_fim TIME
+)
+RETURNS TABLE (
+    id_patrimonio VARCHAR,
+    nome VARCHAR,
+    local VARCHAR,
+    status_disponibilidade VARCHAR,
+    proxima_reserva_data DATE,
+    proxima_reserva_inicio TIME,
+    proxima_reserva_fim TIME,
+    reserva_anterior_data DATE,
+    reserva_anterior_fim TIME
+)
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        d.id_patrimonio,
+        d.nome,
+        d.local,
+        d.status_disponibilidade,
+        d.proxima_reserva_data,
+        d.proxima_reserva_inicio,
+        d.proxima_reserva_fim,
+        d.reserva_anterior_data,
+        d.reserva_anterior_fim
+    FROM get_equipamentos_disponiveis_horarios(
+        ARRAY[dia],
+        ARRAY[hora_inicio],
+        ARRAY[hora_fim]
+    ) d;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -255,18 +269,18 @@ BEGIN
         os.dia_semana,
         os.horario_inicio AS horario_inicio,
         os.horario_fim AS horario_fim,
-        COUNT(pa.cpf_participante)::integer AS vagas_ocupadas,
+        -- Contador mantido por trigger (common_triggers.sql), sem agregar participações
+        a.vagas_ocupadas,
         a.vagas_limite
     FROM atividade a
     LEFT JOIN atividade_grupo_extensao ag ON ag.id_atividade = a.id_atividade
     LEFT JOIN grupo_extensao ge ON ge.nome_grupo = ag.nome_grupo
     LEFT JOIN ocorrencia_semanal os ON os.id_atividade = a.id_atividade
-    LEFT JOIN participacao_atividade pa ON pa.id_atividade = a.id_atividade
     WHERE
         (p_dia_semana IS NULL OR os.dia_semana = p_dia_semana)
         AND (p_grupo_extensao IS NULL OR ge.nome_grupo ILIKE '%' || p_grupo_extensao || '%')
         AND (p_modalidade IS NULL OR a.nome ILIKE '%' || p_modalidade || '%')
-    GROUP BY a.id_atividade, ge.nome_grupo, os.dia_semana, os.horario_inicio, os.horario_fim, a.vagas_limite
+    GROUP BY a.id_atividade, ge.nome_grupo, os.dia_semana, os.horario_inicio, os.horario_fim, a.vagas_ocupadas, a.vagas_limite
     ORDER BY os.dia_semana, os.horario_inicio;
 END;
 $$;
@@ -0,0 +1,215 @@
+-- ============================================================================
+-- TABELAS DE RESUMO PARA OS RELATÓRIOS (/reports/overview)
+-- ============================================================================
+-- Os relatórios agregavam RESERVA e PARTICIPACAO_ATIVIDADE inteiras a cada
+-- chamada. As tabelas abaixo guardam contagens diárias já agregadas e são
+-- mantidas por triggers de instrução (com tabelas de transição), de modo que
+-- cada escrita aplica apenas o seu delta e os relatórios leem no máximo uma
+-- linha por (instalação, dia) ou (atividade, dia), independente do tamanho
+-- do histórico. As contagens são atualizadas na mesma transação da escrita.
+--
+-- Este arquivo é reaplicado a cada bootstrap: tudo é idempotente e, se as
+-- tabelas de resumo estiverem vazias com dados já existentes (banco criado
+-- antes deste arquivo), elas são reconstruídas ao final.
+
+CREATE TABLE IF NOT EXISTS RESUMO_RESERVAS_DIARIAS (
+    ID_INSTALACAO INT NOT NULL,
+    DATA_RESERVA DATE NOT NULL,
+    TOTAL_RESERVAS INT NOT NULL,
+
+    CONSTRAINT PK_RESUMO_RESERVAS_DIARIAS PRIMARY KEY (ID_INSTALACAO, DATA_RESERVA),
+    CONSTRAINT FK_RESUMO_RESERVAS_INSTALACAO FOREIGN KEY (ID_INSTALACAO)
+        REFERENCES INSTALACAO (ID_INSTALACAO)
+            ON DELETE CASCADE
+            ON UPDATE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumo_reservas_data
+ON RESUMO_RESERVAS_DIARIAS (DATA_RESERVA);
+
+CREATE TABLE IF NOT EXISTS RESUMO_INSCRICOES_DIARIAS (
+    ID_ATIVIDADE INT NOT NULL,
+    DATA_INSCRICAO DATE NOT NULL,
+    TOTAL_PARTICIPANTES INT NOT NULL,
+
+    CONSTRAINT PK_RESUMO_INSCRICOES_DIARIAS PRIMARY KEY (ID_ATIVIDADE, DATA_INSCRICAO),
+    CONSTRAINT FK_RESUMO_INSCRICOES_ATIVIDADE FOREIGN KEY (ID_ATIVIDADE)
+        REFERENCES ATIVIDADE (ID_ATIVIDADE)
+            ON DELETE CASCADE
+            ON UPDATE CASCADE
+);
+
+-- FUNCTION: trg_resumo_reservas
+-- Aplica o delta de um INSERT/UPDATE/DELETE em RESERVA ao resumo diário.
+-- As linhas antigas (tabela de transição "antigas") são subtraídas e as novas
+-- ("novas") somadas; dias que chegam a zero são removidos.
+CREATE OR REPLACE FUNCTION trg_resumo_reservas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE resumo_reservas_diarias s
+        SET total_reservas = s.total_reservas - d.total
+        FROM (
+            SELECT id_instalacao, data_reserva, COUNT(*) AS total
+            FROM antigas
+            GROUP BY id_instalacao, data_reserva
+        ) d
+        WHERE s.id_instalacao = d.id_instalacao
+          AND s.data_reserva = d.data_reserva;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO resumo_reservas_diarias (id_instalacao, data_reserva, total_reservas)
+        SELECT id_instalacao, data_reserva, COUNT(*)
+        FROM novas
+        GROUP BY id_instalacao, data_reserva
+        ON CONFLICT (id_instalacao, data_reserva)
+        DO UPDATE SET total_reservas = resumo_reservas_diarias.total_reservas + EXCLUDED.total_reservas;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM resumo_reservas_diarias s
+        USING (SELECT DISTINCT id_instalacao, data_reserva FROM antigas) d
+        WHERE s.id_instalacao = d.id_instalacao
+          AND s.data_reserva = d.data_reserva
+          AND s.total_reservas <= 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- FUNCTION: trg_resumo_inscricoes
+-- Mesmo esquema de trg_resumo_reservas para PARTICIPACAO_ATIVIDADE.
+CREATE OR REPLACE FUNCTION trg_resumo_inscricoes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE resumo_inscricoes_diarias s
+        SET total_participantes = s.total_participantes - d.total
+        FROM (
+            SELECT id_atividade, data_inscricao, COUNT(*) AS total
+            FROM antigas
+            GROUP BY id_atividade, data_inscricao
+        ) d
+        WHERE s.id_atividade = d.id_atividade
+          AND s.data_inscricao = d.data_inscricao;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO resumo_inscricoes_diarias (id_atividade, data_inscricao, total_participantes)
+        SELECT id_atividade, data_inscricao, COUNT(*)
+        FROM novas
+        GROUP BY id_atividade, data_inscricao
+        ON CONFLICT (id_atividade, data_inscricao)
+        DO UPDATE SET total_participantes = resumo_inscricoes_diarias.total_participantes + EXCLUDED.total_participantes;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM resumo_inscricoes_diarias s
+        USING (SELECT DISTINCT id_atividade, data_inscricao FROM antigas) d
+        WHERE s.id_atividade = d.id_atividade
+          AND s.data_inscricao = d.data_inscricao
+          AND s.total_participantes <= 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- FUNCTION: trg_resumo_truncate
+-- TRUNCATE não dispara triggers por linha (ex.: TRUNCATE INTERNO_USP CASCADE
+-- nos downgrades), então o resumo da tabela truncada é esvaziado junto.
+CREATE OR REPLACE FUNCTION trg_resumo_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'reserva' THEN
+        TRUNCATE resumo_reservas_diarias;
+    ELSIF TG_TABLE_NAME = 'participacao_atividade' THEN
+        TRUNCATE resumo_inscricoes_diarias;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tabelas de transição não aceitam mais de um evento por trigger,
+-- por isso há um trigger para cada operação.
+DROP TRIGGER IF EXISTS trg_resumo_reservas_insert ON reserva;
+CREATE TRIGGER trg_resumo_reservas_insert
+AFTER INSERT ON reserva
+REFERENCING NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_reservas();
+
+DROP TRIGGER IF EXISTS trg_resumo_reservas_update ON reserva;
+CREATE TRIGGER trg_resumo_reservas_update
+AFTER UPDATE ON reserva
+REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_reservas();
+
+DROP TRIGGER IF EXISTS trg_resumo_reservas_delete ON reserva;
+CREATE TRIGGER trg_resumo_reservas_delete
+AFTER DELETE ON reserva
+REFERENCING OLD TABLE AS antigas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_reservas();
+
+DROP TRIGGER IF EXISTS trg_resumo_reservas_truncate ON reserva;
+CREATE TRIGGER trg_resumo_reservas_truncate
+AFTER TRUNCATE ON reserva
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_truncate();
+
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_insert ON participacao_atividade;
+CREATE TRIGGER trg_resumo_inscricoes_insert
+AFTER INSERT ON participacao_atividade
+REFERENCING NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_inscricoes();
+
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_update ON participacao_atividade;
+CREATE TRIGGER trg_resumo_inscricoes_update
+AFTER UPDATE ON participacao_atividade
+REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_inscricoes();
+
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_delete ON participacao_atividade;
+CREATE TRIGGER trg_resumo_inscricoes_delete
+AFTER DELETE ON participacao_atividade
+REFERENCING OLD TABLE AS antigas
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_inscricoes();
+
+DROP TRIGGER IF EXISTS trg_resumo_inscricoes_truncate ON participacao_atividade;
+CREATE TRIGGER trg_resumo_inscricoes_truncate
+AFTER TRUNCATE ON participacao_atividade
+FOR EACH STATEMENT EXECUTE FUNCTION trg_resumo_truncate();
+
+-- FUNCTION: recalcular_resumos_relatorios
+-- Reconstrói as tabelas de resumo a partir das tabelas de origem.
+-- As escritas em RESERVA/PARTICIPACAO_ATIVIDADE ficam bloqueadas durante a
+-- reconstrução para que nenhum delta se perca.
+-- Uso: SELECT recalcular_resumos_relatorios();
+CREATE OR REPLACE FUNCTION recalcular_resumos_relatorios()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE reserva, participacao_atividade IN SHARE MODE;
+
+    DELETE FROM resumo_reservas_diarias;
+    INSERT INTO resumo_reservas_diarias (id_instalacao, data_reserva, total_reservas)
+    SELECT id_instalacao, data_reserva, COUNT(*)
+    FROM reserva
+    GROUP BY id_instalacao, data_reserva;
+
+    DELETE FROM resumo_inscricoes_diarias;
+    INSERT INTO resumo_inscricoes_diarias (id_atividade, data_inscricao, total_participantes)
+    SELECT id_atividade, data_inscricao, COUNT(*)
+    FROM participacao_atividade
+    GROUP BY id_atividade, data_inscricao;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill para bancos que já tinham dados antes das tabelas de resumo
+DO $$
+BEGIN
+    IF (NOT EXISTS (SELECT 1 FROM resumo_reservas_diarias) AND EXISTS (SELECT 1 FROM reserva))
+       OR (NOT EXISTS (SELECT 1 FROM resumo_inscricoes_diarias) AND EXISTS (SELECT 1 FROM participacao_atividade)) THEN
+        PERFORM recalcular_resumos_relatorios();
+    END IF;
+END;
+$$;
@@ -140,6 +140,9 @@ END;
 $$;
 
 -- PROCEDURE para reservar uma instalação (Ex: Staff faz a reserva para um usuário)
+-- Sobreposições são rejeitadas pela constraint ex_reserva_sobreposicao; o erro é
+-- relançado como "Conflito de reserva" mantendo SQLSTATE 23P01 e o nome da
+-- constraint, com a reserva conflitante no DETAIL (id_reserva=...).
 CREATE OR REPLACE PROCEDURE reservar_instalacao(
     p_id_instalacao INT,
     p_cpf_responsavel VARCHAR,
@@ -147,9 +150,33 @@ CREATE OR REPLACE PROCEDURE reservar_instalacao(
     p_hora_inicio TIME,
     p_hora_fim TIME
 ) LANGUAGE plpgsql AS $$
+DECLARE
+    v_conflito RECORD;
 BEGIN
     INSERT INTO RESERVA (ID_INSTALACAO, CPF_RESPONSAVEL_INTERNO, DATA_RESERVA, HORARIO_INICIO, HORARIO_FIM)
     VALUES (p_id_instalacao, p_cpf_responsavel, p_data, p_hora_inicio, p_hora_fim);
+EXCEPTION
+    WHEN exclusion_violation OR unique_violation THEN
+        SELECT r.id_reserva, r.horario_inicio, r.horario_fim INTO v_conflito
+        FROM reserva r
+        WHERE r.id_instalacao = p_id_instalacao
+          AND tsrange(r.data_reserva + r.horario_inicio, r.data_reserva + r.horario_fim)
+              && tsrange(p_data + p_hora_inicio, p_data + p_hora_fim)
+        ORDER BY r.horario_inicio
+        LIMIT 1;
+
+        IF NOT FOUND THEN
+            RAISE;
+        END IF;
+
+        RAISE EXCEPTION 'Conflito de reserva: a instalação % já está reservada em % das % às %.',
+            p_id_instalacao, p_data, v_conflito.horario_inicio, v_conflito.horario_fim
+            USING ERRCODE = 'exclusion_violation',
+                  CONSTRAINT = 'ex_reserva_sobreposicao',
+                  DETAIL = format(
+                      'id_reserva=%s;data=%s;horario_inicio=%s;horario_fim=%s',
+                      v_conflito.id_reserva, p_data, v_conflito.horario_inicio, v_conflito.horario_fim
+                  );
 END;
 $$;
 
@@ -173,6 +200,8 @@ CREATE OR REPLACE PROCEDURE reservar_equipamento(
     p_hora_inicio TIME,
     p_hora_fim TIME
 ) LANGUAGE plpgsql AS $$
+DECLARE
+    v_conflito RECORD;
 BEGIN
     -- Verifica se o equipamento é reservável (Regra de Negócio)
     PERFORM 1 FROM EQUIPAMENTO
@@ -187,8 +216,33 @@ BEGIN
         RAISE EXCEPTION 'O horário de fim deve ser maior que o horário de início.';
     END IF;
 
-    INSERT INTO RESERVA_EQUIPAMENTO (ID_EQUIPAMENTO, CPF_RESPONSAVEL_INTERNO, DATA_RESERVA, HORARIO_INICIO, HORARIO_FIM)
-    VALUES (p_id_equipamento, p_cpf_responsavel, p_data, p_hora_inicio, p_hora_fim);
+    BEGIN
+        INSERT INTO RESERVA_EQUIPAMENTO (ID_EQUIPAMENTO, CPF_RESPONSAVEL_INTERNO, DATA_RESERVA, HORARIO_INICIO, HORARIO_FIM)
+        VALUES (p_id_equipamento, p_cpf_responsavel, p_data, p_hora_inicio, p_hora_fim);
+    EXCEPTION
+        WHEN exclusion_violation THEN
+            SELECT re.id_reserva_equip, re.horario_inicio, re.horario_fim INTO v_conflito
+            FROM reserva_equipamento re
+            WHERE re.id_equipamento = p_id_equipamento
+              AND re.data_reserva = p_data
+              AND re.horario_inicio < p_hora_fim
+              AND re.horario_fim > p_hora_inicio
+            ORDER BY re.horario_inicio
+            LIMIT 1;
+
+            IF NOT FOUND THEN
+                RAISE;
+            END IF;
+
+            RAISE EXCEPTION 'Conflito de reserva: o equipamento % já está reservado em % das % às %.',
+                p_id_equipamento, p_data, v_conflito.horario_inicio, v_conflito.horario_fim
+                USING ERRCODE = 'exclusion_violation',
+                      CONSTRAINT = 'ex_reserva_equip_sobreposicao',
+                      DETAIL = format(
+                          'id_reserva=%s;data=%s;horario_inicio=%s;horario_fim=%s',
+                          v_conflito.id_reserva_equip, p_data, v_conflito.horario_inicio, v_conflito.horario_fim
+                      );
+    END;
 END;
 $$;
 
@@ -211,13 +265,17 @@ CREATE OR REPLACE PROCEDURE inscrever_participante_atividade(
 )
 LANGUAGE plpgsql
 AS $$
+DECLARE
+    v_atividade RECORD;
 BEGIN
-    -- Verifica se a atividade existe
-    IF NOT EXISTS (
-        SELECT 1
-        FROM atividade
-        WHERE id_atividade = p_id_atividade
-    ) THEN
+    -- Verifica se a atividade existe (travando a linha até o fim da transação,
+    -- para que inscrições concorrentes não ultrapassem o limite de vagas)
+    SELECT vagas_limite, vagas_ocupadas INTO v_atividade
+    FROM atividade
+    WHERE id_atividade = p_id_atividade
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
         RAISE EXCEPTION 'A atividade com ID % não existe.', p_id_atividade;
     END IF;
 
@@ -233,14 +291,7 @@ BEGIN
     END IF;
 
     -- Verifica se há vagas disponíveis para a atividade
-    IF EXISTS (
-        SELECT 1
-        FROM atividade a
-        LEFT JOIN participacao_atividade pa ON pa.id_atividade = a.id_atividade
-        WHERE a.id_atividade = p_id_atividade
-        GROUP BY a.vagas_limite
-        HAVING COUNT(pa.cpf_participante) >= a.vagas_limite
-    ) THEN
+    IF v_atividade.vagas_ocupadas >= v_atividade.vagas_limite THEN
         RAISE EXCEPTION 'A atividade com ID % já está com as vagas esgotadas.', p_id_atividade;
     END IF;
 
@@ -252,6 +303,173 @@ BEGIN
 END;
 $$;
 
+-- FUNCTION para inscrever vários participantes numa atividade de uma vez:
+-- A linha da atividade é travada (FOR UPDATE), as vagas livres são calculadas
+-- uma única vez e todos os inscritos entram num único INSERT. As vagas são
+-- distribuídas na ordem recebida. Retorna um resultado por CPF pedido:
+-- inscrito, ja_inscrito, sem_vagas, pessoa_inexistente ou duplicado.
+DROP FUNCTION IF EXISTS inscrever_participantes_atividade(INT, VARCHAR[]);
+CREATE OR REPLACE FUNCTION inscrever_participantes_atividade(
+    p_id_atividade INT,
+    p_cpfs VARCHAR[]
+)
+RETURNS TABLE (
+    cpf_pedido VARCHAR,
+    resultado VARCHAR
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_vagas_livres INT;
+BEGIN
+    -- vagas_limite NULL significa sem limite (v_vagas_livres NULL)
+    SELECT vagas_limite - vagas_ocupadas INTO v_vagas_livres
+    FROM atividade
+    WHERE id_atividade = p_id_atividade
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'A atividade com ID % não existe.', p_id_atividade;
+    END IF;
+
+    RETURN QUERY
+    WITH pedidos AS (
+        SELECT p.cpf_item::VARCHAR AS cpf_item, p.ordem
+        FROM unnest(p_cpfs) WITH ORDINALITY AS p(cpf_item, ordem)
+    ),
+    classificados AS (
+        SELECT
+            pd.cpf_item,
+            pd.ordem,
+            CASE
+                WHEN ROW_NUMBER() OVER (PARTITION BY pd.cpf_item ORDER BY pd.ordem) > 1 THEN 'duplicado'
+                WHEN NOT EXISTS (SELECT 1 FROM pessoa pe WHERE pe.cpf = pd.cpf_item) THEN 'pessoa_inexistente'
+                WHEN EXISTS (
+                    SELECT 1
+                    FROM participacao_atividade pa
+                    WHERE pa.id_atividade = p_id_atividade
+                      AND pa.cpf_participante = pd.cpf_item
+                ) THEN 'ja_inscrito'
+                ELSE 'candidato'
+            END AS estado
+        FROM pedidos pd
+    ),
+    distribuidos AS (
+        SELECT
+            c.cpf_item,
+            c.ordem,
+            CASE
+                WHEN c.estado <> 'candidato' THEN c.estado
+                WHEN v_vagas_livres IS NULL
+                  OR ROW_NUMBER() OVER (PARTITION BY c.estado ORDER BY c.ordem) <= v_vagas_livres THEN 'inscrito'
+                ELSE 'sem_vagas'
+            END AS estado
+        FROM classificados c
+    ),
+    inseridos AS (
+        INSERT INTO participacao_atividade (cpf_participante, id_atividade, data_inscricao)
+        SELECT d.cpf_item, p_id_atividade, CURRENT_DATE
+        FROM distribuidos d
+        WHERE d.estado = 'inscrito'
+        ON CONFLICT DO NOTHING
+        RETURNING participacao_atividade.cpf_participante AS cpf_item
+    )
+    SELECT
+        d.cpf_item,
+        (CASE
+            -- Inscrição concorrente entre a classificação e o INSERT
+            WHEN d.estado = 'inscrito' AND i.cpf_item IS NULL THEN 'ja_inscrito'
+            ELSE d.estado
+        END)::VARCHAR
+    FROM distribuidos d
+    LEFT JOIN inseridos i ON i.cpf_item = d.cpf_item AND d.estado = 'inscrito'
+    ORDER BY d.ordem;
+END;
+$$;
+
+-- SELECT * FROM inscrever_participantes_atividade(1, ARRAY['12345678901', '10987654321']::VARCHAR[]);
+
+-- FUNCTION para inscrever um participante em várias atividades de uma vez:
+-- As atividades pedidas são travadas em ordem de ID (evita deadlock entre lotes
+-- concorrentes), as vagas de todas são calculadas numa única consulta e as
+-- inscrições entram num único INSERT. Retorna um resultado por atividade pedida:
+-- inscrito, ja_inscrito, sem_vagas, atividade_inexistente ou duplicado.
+DROP FUNCTION IF EXISTS inscrever_participante_em_atividades(VARCHAR, INT[]);
+CREATE OR REPLACE FUNCTION inscrever_participante_em_atividades(
+    p_cpf_participante VARCHAR,
+    p_ids_atividades INT[]
+)
+RETURNS TABLE (
+    id_atividade_pedido INT,
+    resultado VARCHAR
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pessoa WHERE cpf = p_cpf_participante) THEN
+        RAISE EXCEPTION 'O participante % não existe.', p_cpf_participante;
+    END IF;
+
+    PERFORM 1
+    FROM atividade
+    WHERE id_atividade = ANY(p_ids_atividades)
+    ORDER BY id_atividade
+    FOR UPDATE;
+
+    RETURN QUERY
+    WITH pedidos AS (
+        SELECT p.id_item, p.ordem
+        FROM unnest(p_ids_atividades) WITH ORDINALITY AS p(id_item, ordem)
+    ),
+    vagas AS (
+        SELECT
+            a.id_atividade AS id_item,
+            a.vagas_limite - a.vagas_ocupadas AS livres,
+            EXISTS (
+                SELECT 1
+                FROM participacao_atividade pa
+                WHERE pa.id_atividade = a.id_atividade
+                  AND pa.cpf_participante = p_cpf_participante
+            ) AS ja_inscrito
+        FROM atividade a
+        WHERE a.id_atividade = ANY(p_ids_atividades)
+    ),
+    classificados AS (
+        SELECT
+            pd.id_item,
+            pd.ordem,
+            CASE
+                WHEN ROW_NUMBER() OVER (PARTITION BY pd.id_item ORDER BY pd.ordem) > 1 THEN 'duplicado'
+                WHEN v.id_item IS NULL THEN 'atividade_inexistente'
+                WHEN v.ja_inscrito THEN 'ja_inscrito'
+                WHEN v.livres <= 0 THEN 'sem_vagas'
+                ELSE 'inscrito'
+            END AS estado
+        FROM pedidos pd
+        LEFT JOIN vagas v ON v.id_item = pd.id_item
+    ),
+    inseridos AS (
+        INSERT INTO participacao_atividade (cpf_participante, id_atividade, data_inscricao)
+        SELECT p_cpf_participante, c.id_item, CURRENT_DATE
+        FROM classificados c
+        WHERE c.estado = 'inscrito'
+        ON CONFLICT DO NOTHING
+        RETURNING participacao_atividade.id_atividade AS id_item
+    )
+    SELECT
+        c.id_item,
+        (CASE
+            WHEN c.estado = 'inscrito' AND i.id_item IS NULL THEN 'ja_inscrito'
+            ELSE c.estado
+        END)::VARCHAR
+    FROM classificados c
+    LEFT JOIN inseridos i ON i.id_item = c.id_item AND c.estado = 'inscrito'
+    ORDER BY c.ordem;
+END;
+$$;
+
+-- SELECT * FROM inscrever_participante_em_atividades('12345678901', ARRAY[1, 2, 3]);
+
 -- PROCEDURE para remover um participante de uma atividade
 CREATE OR REPLACE PROCEDURE remover_participante_atividade(
     p_cpf_participante VARCHAR,
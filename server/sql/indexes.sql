@@ -5,26 +5,22 @@
 -- 1. Índices para Foreign Keys frequentemente consultadas
 -- ============================================
 
--- Índice para reserva.id_instalacao (usado em muitos JOINs)
-CREATE INDEX IF NOT EXISTS idx_reserva_instalacao ON reserva(id_instalacao);
-
--- Índice para reserva.cpf_responsavel_interno (usado em filtros e JOINs)
-CREATE INDEX IF NOT EXISTS idx_reserva_responsavel ON reserva(cpf_responsavel_interno);
-
--- Índice para participacao_atividade.id_atividade (usado em agregações)
-CREATE INDEX IF NOT EXISTS idx_participacao_atividade ON participacao_atividade(id_atividade);
-
--- Índice para participacao_atividade.cpf_participante (usado em filtros)
-CREATE INDEX IF NOT EXISTS idx_participacao_participante ON participacao_atividade(cpf_participante);
-
--- Índice para reserva_equipamento.id_equipamento (usado em JOINs)
-CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_equip ON reserva_equipamento(id_equipamento);
-
--- Índice para reserva_equipamento.cpf_responsavel_interno (usado em filtros)
-CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_responsavel ON reserva_equipamento(cpf_responsavel_interno);
-
--- Índice para ocorrencia_semanal.id_atividade (usado em JOINs)
-CREATE INDEX IF NOT EXISTS idx_ocorrencia_atividade ON ocorrencia_semanal(id_atividade);
+-- Índices de uma coluna que são prefixo de uma constraint ou de um índice
+-- composto (ver seção 8) foram removidos: só custavam escrita.
+-- reserva.id_instalacao -> UN_RESERVA (id_instalacao, data_reserva, horario_inicio)
+DROP INDEX IF EXISTS idx_reserva_instalacao;
+-- reserva.cpf_responsavel_interno -> idx_reserva_responsavel_data_inicio
+DROP INDEX IF EXISTS idx_reserva_responsavel;
+-- participacao_atividade.id_atividade -> idx_participacao_atividade_data
+DROP INDEX IF EXISTS idx_participacao_atividade;
+-- participacao_atividade.cpf_participante -> PK_PARTICIPACAO_ATIVIDADE (cpf_participante, id_atividade)
+DROP INDEX IF EXISTS idx_participacao_participante;
+-- reserva_equipamento.id_equipamento -> idx_reserva_equipamento_equip_data_inicio
+DROP INDEX IF EXISTS idx_reserva_equipamento_equip;
+-- reserva_equipamento.cpf_responsavel_interno -> idx_reserva_equipamento_responsavel_data_inicio
+DROP INDEX IF EXISTS idx_reserva_equipamento_responsavel;
+-- ocorrencia_semanal.id_atividade -> UN_OCORRENCIA (id_atividade, ...)
+DROP INDEX IF EXISTS idx_ocorrencia_atividade;
 
 -- Índice para ocorrencia_semanal.id_instalacao (usado em JOINs)
 CREATE INDEX IF NOT EXISTS idx_ocorrencia_instalacao ON ocorrencia_semanal(id_instalacao);
@@ -42,11 +38,9 @@ CREATE INDEX IF NOT EXISTS idx_equipamento_instalacao ON equipamento(id_instalac
 -- 2. Índices para colunas usadas em WHERE e JOIN
 -- ============================================
 
--- Índice para pessoa.email (usado em autenticação e buscas)
-CREATE INDEX IF NOT EXISTS idx_pessoa_email ON pessoa(email);
-
--- Índice para interno_usp.nusp (usado em buscas e validações)
-CREATE INDEX IF NOT EXISTS idx_interno_nusp ON interno_usp(nusp);
+-- pessoa.email e interno_usp.nusp já são indexados por UN_PESSOA_EMAIL e UN_INTERNO_USP_NUSP
+DROP INDEX IF EXISTS idx_pessoa_email;
+DROP INDEX IF EXISTS idx_interno_nusp;
 
 -- Índice para reserva.data_reserva (usado em filtros de data)
 CREATE INDEX IF NOT EXISTS idx_reserva_data ON reserva(data_reserva);
@@ -57,8 +51,8 @@ CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_data ON reserva_equipamento(d
 -- Índice para atividade.data_inicio_periodo (usado em filtros de período)
 CREATE INDEX IF NOT EXISTS idx_atividade_data_inicio ON atividade(data_inicio_periodo);
 
--- Índice para convite_externo.token (usado em buscas por token)
-CREATE INDEX IF NOT EXISTS idx_convite_externo_token ON convite_externo(token);
+-- convite_externo.token já é indexado por UN_CONVITE_EXTERNO_TOKEN
+DROP INDEX IF EXISTS idx_convite_externo_token;
 
 -- Índice para convite_externo.email_convidado (usado em buscas)
 CREATE INDEX IF NOT EXISTS idx_convite_externo_email ON convite_externo(email_convidado);
@@ -71,8 +65,8 @@ CREATE INDEX IF NOT EXISTS idx_solicitacao_cadastro_status ON solicitacao_cadast
 -- ============================================
 
 -- Índice para atividade.data_inicio_periodo (já criado acima, também usado em ORDER BY)
--- Índice adicional para ordenação por data de reserva
-CREATE INDEX IF NOT EXISTS idx_reserva_data_ordem ON reserva(data_reserva DESC);
+-- reserva(data_reserva DESC) era redundante: idx_reserva_data é percorrido de trás para frente
+DROP INDEX IF EXISTS idx_reserva_data_ordem;
 
 -- ============================================
 -- 4. Índices compostos para queries específicas
@@ -81,14 +75,133 @@ CREATE INDEX IF NOT EXISTS idx_reserva_data_ordem ON reserva(data_reserva DESC);
 -- Índice composto para reserva (instalacao + data) - usado em relatórios
 CREATE INDEX IF NOT EXISTS idx_reserva_instalacao_data ON reserva(id_instalacao, data_reserva);
 
--- Índice composto para reserva (responsavel + data) - usado em consultas de usuário
-CREATE INDEX IF NOT EXISTS idx_reserva_responsavel_data ON reserva(cpf_responsavel_interno, data_reserva);
-
--- Índice composto para participacao_atividade (atividade + participante) - usado em validações
-CREATE INDEX IF NOT EXISTS idx_participacao_atividade_participante ON participacao_atividade(id_atividade, cpf_participante);
+-- reserva (responsavel + data) e participacao_atividade (atividade + participante)
+-- foram substituídos pelos índices da seção 8; a checagem por (participante,
+-- atividade) usa a PK
+DROP INDEX IF EXISTS idx_reserva_responsavel_data;
+DROP INDEX IF EXISTS idx_participacao_atividade_participante;
 
 -- Índice composto para ocorrencia_semanal (atividade + dia_semana) - usado em buscas
 CREATE INDEX IF NOT EXISTS idx_ocorrencia_atividade_dia ON ocorrencia_semanal(id_atividade, dia_semana);
 
--- Índice composto para reserva_equipamento (equipamento + data) - usado em verificações de disponibilidade
-CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_equip_data ON reserva_equipamento(id_equipamento, data_reserva);
+-- Índices compostos para reserva_equipamento (equipamento + data + horário) - usados em
+-- verificações de disponibilidade (ver seção 6); substituem o antigo (equipamento, data)
+DROP INDEX IF EXISTS idx_reserva_equipamento_equip_data;
+
+-- ============================================
+-- 5. Índices para paginação por keyset
+-- ============================================
+-- Cada índice cobre exatamente a chave de ordenação (com desempate único) usada
+-- pelo cursor "after", então cada página é uma varredura de intervalo no índice.
+
+-- /admin/users: ORDER BY nome, cpf
+CREATE INDEX IF NOT EXISTS idx_pessoa_nome_cpf ON pessoa(nome, cpf);
+
+-- /admin/reservations, /staff/installations/reservations, /views/reservas-completas:
+-- ORDER BY data_reserva DESC, horario_inicio DESC, id_reserva DESC (varredura reversa)
+CREATE INDEX IF NOT EXISTS idx_reserva_keyset ON reserva(data_reserva, horario_inicio, id_reserva);
+
+-- /staff/equipment/reservations: ORDER BY data_reserva DESC, horario_inicio DESC, id_reserva_equip DESC
+CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_keyset ON reserva_equipamento(data_reserva, horario_inicio, id_reserva_equip);
+
+-- ============================================
+-- 6. Índices para disponibilidade de instalações e equipamentos
+-- ============================================
+-- Usados por get_instalacoes_disponiveis_horario e
+-- get_equipamentos_disponiveis_horario(s) (/internal/?date=&start=&end=).
+
+-- Sobreposição de horários: (id_instalacao =, tsrange &&) é atendida pelo índice
+-- GiST da constraint ex_reserva_sobreposicao (functions/common_triggers.sql)
+DROP INDEX IF EXISTS idx_reserva_periodo;
+
+-- Reserva anterior: ORDER BY data_reserva DESC, horario_fim DESC LIMIT 1
+-- (a próxima reserva usa o índice da constraint UN_RESERVA)
+CREATE INDEX IF NOT EXISTS idx_reserva_instalacao_data_fim ON reserva(id_instalacao, data_reserva, horario_fim);
+
+-- Equipamentos: conflito no dia e próxima reserva (data_reserva, horario_inicio)
+CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_equip_data_inicio ON reserva_equipamento(id_equipamento, data_reserva, horario_inicio);
+
+-- Equipamentos: reserva anterior (data_reserva DESC, horario_fim DESC)
+CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_equip_data_fim ON reserva_equipamento(id_equipamento, data_reserva, horario_fim);
+
+-- ============================================
+-- 7. Índices de trigramas para busca textual
+-- ============================================
+-- Índices GIN com gin_trgm_ops atendem ILIKE '%termo%', prefixos e os operadores
+-- de similaridade (%, <%) do pg_trgm. Usados por /search (queries/search/buscar.sql)
+-- e pelos filtros ILIKE de listar_atividades (modalidade e grupo de extensão).
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_pessoa_nome_trgm ON pessoa USING gin (nome gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_pessoa_email_trgm ON pessoa USING gin (email gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_interno_nusp_trgm ON interno_usp USING gin (nusp gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_atividade_nome_trgm ON atividade USING gin (nome gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_grupo_extensao_nome_trgm ON grupo_extensao USING gin (nome_grupo gin_trgm_ops);
+
+-- ============================================
+-- 8. Índices compostos, parciais e de cobertura por asset
+-- ============================================
+-- Cada índice cita os assets (sql/queries/**) ou funções cujo plano ele atende.
+-- `flask check-query-plans` (app/services/database/plan_check.py) roda EXPLAIN
+-- nesses assets e falha se algum voltar a fazer Seq Scan em tabela grande.
+
+-- internal/convites_por_interno.sql: WHERE cpf_convidante = ? ORDER BY data_convite DESC
+-- (filtro e ordenação no índice); verificar/deletar_convite_externo.sql e a
+-- remoção de internos em admin_functions.sql filtram pelo prefixo cpf_convidante
+CREATE INDEX IF NOT EXISTS idx_convite_externo_convidante_data
+ON convite_externo(cpf_convidante, data_convite DESC);
+
+-- external/get_invite_participation.sql (JOIN por id_atividade), remoção de
+-- atividade em staff_functions.sql e o ON DELETE CASCADE da FK; convites sem
+-- atividade ficam fora do índice
+CREATE INDEX IF NOT EXISTS idx_convite_externo_atividade
+ON convite_externo(id_atividade)
+WHERE id_atividade IS NOT NULL;
+
+-- staff/listar_participantes_atividade.sql: WHERE id_atividade = ? ORDER BY
+-- data_inscricao DESC; cpf_participante incluído para dispensar o heap.
+-- Também atende o ON DELETE CASCADE de atividade e reconciliar_vagas_ocupadas()
+CREATE INDEX IF NOT EXISTS idx_participacao_atividade_data
+ON participacao_atividade(id_atividade, data_inscricao DESC)
+INCLUDE (cpf_participante);
+
+-- external/external_participations.sql (JOIN por cpf_convidante_interno) e o
+-- ON DELETE SET NULL da FK; a maioria das inscrições não tem convidante
+CREATE INDEX IF NOT EXISTS idx_participacao_convidante
+ON participacao_atividade(cpf_convidante_interno)
+WHERE cpf_convidante_interno IS NOT NULL;
+
+-- get_reservas_interno (internal/reservas_por_interno.sql):
+-- WHERE cpf_responsavel_interno = ? ORDER BY data_reserva, horario_inicio
+CREATE INDEX IF NOT EXISTS idx_reserva_responsavel_data_inicio
+ON reserva(cpf_responsavel_interno, data_reserva, horario_inicio);
+
+-- internal/reservas_equipamentos_por_interno.sql:
+-- WHERE cpf_responsavel_interno = ? ORDER BY data_reserva DESC, horario_inicio DESC
+CREATE INDEX IF NOT EXISTS idx_reserva_equipamento_responsavel_data_inicio
+ON reserva_equipamento(cpf_responsavel_interno, data_reserva, horario_inicio);
+
+-- Histórico de login por usuário (mais recente primeiro) e o ON DELETE SET NULL
+-- da FK para usuario_senha, que sem índice varre toda a auditoria
+CREATE INDEX IF NOT EXISTS idx_auditoria_login_cpf_timestamp
+ON auditoria_login(cpf, timestamp_evento DESC);
+
+-- auth/list_pending_registrations.sql: WHERE status = 'PENDENTE' ORDER BY data_solicitacao
+CREATE INDEX IF NOT EXISTS idx_solicitacao_pendente_data
+ON solicitacao_cadastro(data_solicitacao)
+WHERE status = 'PENDENTE';
+
+-- auth/check_registration_request_exists.sql e request_registration:
+-- WHERE cpf_pessoa = ? AND status = 'PENDENTE'
+CREATE INDEX IF NOT EXISTS idx_solicitacao_pendente_cpf
+ON solicitacao_cadastro(cpf_pessoa)
+WHERE status = 'PENDENTE';
+
+-- listar_atividades (filtro por grupo de extensão parte de grupo_extensao) e o
+-- ON DELETE CASCADE de grupo_extensao; a PK começa por id_atividade
+CREATE INDEX IF NOT EXISTS idx_atividade_grupo_nome
+ON atividade_grupo_extensao(nome_grupo);
@@ -0,0 +1,27 @@
+-- ============================================================================
+-- PROGRESSO DA POPULAÇÃO SINTÉTICA (data_generators/progress.py)
+-- ============================================================================
+-- POPULACAO_EXECUCAO guarda a semente e a escala da população em curso (uma
+-- linha só); POPULACAO_ETAPA, as etapas concluídas e, nas etapas gravadas em
+-- lotes, quantos lotes já foram confirmados. Uma população interrompida é
+-- retomada a partir daqui. Idempotente: aplicado a cada execução do populate.
+
+CREATE TABLE IF NOT EXISTS POPULACAO_EXECUCAO (
+    ID BOOLEAN NOT NULL DEFAULT TRUE,
+    SEMENTE BIGINT NOT NULL,
+    ESCALA INT NOT NULL,
+    INICIADA_EM TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONCLUIDA_EM TIMESTAMP,
+
+    CONSTRAINT PK_POPULACAO_EXECUCAO PRIMARY KEY (ID),
+    CONSTRAINT CK_POPULACAO_EXECUCAO_UNICA CHECK (ID)
+);
+
+CREATE TABLE IF NOT EXISTS POPULACAO_ETAPA (
+    NOME VARCHAR(64) NOT NULL,
+    LOTES_CONCLUIDOS INT NOT NULL DEFAULT 0,
+    CONCLUIDA_EM TIMESTAMP,
+
+    CONSTRAINT PK_POPULACAO_ETAPA PRIMARY KEY (NOME),
+    CONSTRAINT CK_POPULACAO_ETAPA_LOTES CHECK (LOTES_CONCLUIDOS >= 0)
+);
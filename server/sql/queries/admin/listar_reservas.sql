@@ -1,3 +1,7 @@
+-- Query to list reservations (keyset pagination, newest first)
+-- Parameters:
+--   %(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s - Sort key of the last row of the previous page (NULL for the first page)
+--   %(limit)s - Maximum number of rows (NULL returns all)
 SELECT
     r.id_reserva,
     r.data_reserva,
@@ -10,4 +14,8 @@ SELECT
 FROM reserva r
 LEFT JOIN pessoa p ON r.cpf_responsavel_interno = p.cpf
 LEFT JOIN instalacao i ON r.id_instalacao = i.id_instalacao
-ORDER BY r.data_reserva DESC, r.horario_inicio DESC;
+WHERE %(after_data_reserva)s IS NULL
+    OR (r.data_reserva, r.horario_inicio, r.id_reserva)
+        < (%(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s)
+ORDER BY r.data_reserva DESC, r.horario_inicio DESC, r.id_reserva DESC
+LIMIT %(limit)s;
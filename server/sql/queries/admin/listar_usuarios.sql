@@ -1,3 +1,7 @@
+-- Query to list users (keyset pagination)
+-- Parameters:
+--   %(after_nome)s, %(after_cpf)s - Sort key of the last row of the previous page (NULL for the first page)
+--   %(limit)s - Maximum number of rows (NULL returns all)
 SELECT
     p.cpf,
     p.nome,
@@ -15,4 +19,7 @@ FROM pessoa p
 LEFT JOIN interno_usp i ON p.cpf = i.cpf_pessoa
 LEFT JOIN funcionario f ON p.cpf = f.cpf_interno
 LEFT JOIN educador_fisico ef ON p.cpf = ef.cpf_funcionario
-ORDER BY p.nome;
+WHERE %(after_nome)s IS NULL
+    OR (p.nome, p.cpf) > (%(after_nome)s, %(after_cpf)s)
+ORDER BY p.nome, p.cpf
+LIMIT %(limit)s;
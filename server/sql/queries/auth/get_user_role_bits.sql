@@ -0,0 +1,7 @@
+-- Query to get the role bitmap of a user (maintained by the sync triggers)
+-- Parameters:
+--   %(cpf)s - CPF of the user
+-- Returns: papeis (1 admin, 2 staff, 4 internal, 8 external)
+SELECT papeis
+FROM usuario_senha
+WHERE cpf = %(cpf)s;
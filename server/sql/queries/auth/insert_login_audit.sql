@@ -0,0 +1,14 @@
+-- Query to insert login audit rows in a single multi-row INSERT
+-- Used by app/services/login_audit.py with psycopg2.extras.execute_values
+-- Parameters:
+--   VALUES placeholder - (cpf, timestamp_evento, email_usuario, ip_origem, status, mensagem) tuples
+INSERT INTO auditoria_login (
+    cpf, data_hora_login,
+    timestamp_evento, email_usuario, ip_origem, status, mensagem
+)
+SELECT
+    us.cpf, v.timestamp_evento::timestamp,
+    v.timestamp_evento::timestamp, v.email_usuario, v.ip_origem, v.status, v.mensagem
+FROM (VALUES %s) AS v (cpf, timestamp_evento, email_usuario, ip_origem, status, mensagem)
+-- Usuário removido entre o login e a gravação: manter o evento sem CPF
+LEFT JOIN usuario_senha us ON us.cpf = v.cpf;
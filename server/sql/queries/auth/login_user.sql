@@ -3,4 +3,5 @@
 --   %(email_or_cpf)s - Email or CPF of the user
 --   %(password)s - Plain text password
 --   %(ip_origin)s - IP address of the login attempt (optional)
-SELECT authenticate_user(%(email_or_cpf)s, %(password)s, %(ip_origin)s) AS result;
+--   %(write_audit)s - FALSE to return the audit row instead of inserting it
+SELECT authenticate_user(%(email_or_cpf)s, %(password)s, %(ip_origin)s, %(write_audit)s) AS result;
@@ -0,0 +1,9 @@
+-- Query to check the current password of a logged-in user (change password form)
+-- Unlike login_user.sql it does not touch tentativas_login, bloqueado or the audit
+-- Parameters:
+--   %(cpf)s - CPF of the user
+--   %(password)s - Plain password to verify
+-- Returns: valid (TRUE if the password matches)
+SELECT verify_password(%(password)s, senha_hash) AS valid
+FROM usuario_senha
+WHERE cpf = %(cpf)s;
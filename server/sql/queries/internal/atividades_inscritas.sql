@@ -0,0 +1,6 @@
+-- IDs das atividades em que o participante está inscrito
+-- Parameters:
+--   %(cpf_participante)s - CPF of the participant
+SELECT id_atividade
+FROM participacao_atividade
+WHERE cpf_participante = %(cpf_participante)s;
@@ -0,0 +1,5 @@
+-- Equipamentos disponíveis em vários horários numa única chamada.
+-- Parâmetros: %(dates)s, %(starts)s, %(ends)s são listas paralelas (uma posição por horário)
+SELECT
+    *
+FROM get_equipamentos_disponiveis_horarios(%(dates)s::DATE[], %(starts)s::TIME[], %(ends)s::TIME[]);
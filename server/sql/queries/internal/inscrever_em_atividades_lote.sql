@@ -0,0 +1,8 @@
+-- Query to enroll a participant in several activities in one statement
+-- Parameters:
+--   %(cpf_participante)s - CPF of the participant
+--   %(ids_atividades)s - List of activity IDs
+SELECT
+    id_atividade_pedido AS id_atividade,
+    resultado
+FROM inscrever_participante_em_atividades(%(cpf_participante)s, %(ids_atividades)s::INT[]);
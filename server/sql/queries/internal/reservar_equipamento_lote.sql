@@ -0,0 +1,52 @@
+-- Reserva vários horários de um equipamento num único INSERT (sem commit: o
+-- chamador decide entre commit e rollback conforme o modo do lote).
+-- Parameters:
+--   %(id_equipamento)s - Equipment ID (patrimônio)
+--   %(cpf_responsavel)s - CPF of the responsible internal user
+--   %(datas)s, %(inicios)s, %(fins)s - Parallel lists, one position per slot
+-- Nada é inserido se o equipamento não for reservável; eh_reservavel volta em
+-- todas as linhas (NULL se o equipamento não existir). Horários sobrepostos são
+-- ignorados (ON CONFLICT DO NOTHING sobre ex_reserva_equip_sobreposicao).
+WITH slots AS (
+    SELECT s.slot::INT AS slot, s.data, s.inicio, s.fim
+    FROM unnest(%(datas)s::DATE[], %(inicios)s::TIME[], %(fins)s::TIME[])
+        WITH ORDINALITY AS s(data, inicio, fim, slot)
+),
+equip AS (
+    SELECT e.eh_reservavel
+    FROM equipamento e
+    WHERE e.id_patrimonio = %(id_equipamento)s
+),
+inseridas AS (
+    INSERT INTO reserva_equipamento (id_equipamento, cpf_responsavel_interno, data_reserva, horario_inicio, horario_fim)
+    SELECT %(id_equipamento)s, %(cpf_responsavel)s, s.data, s.inicio, s.fim
+    FROM slots s
+    WHERE EXISTS (SELECT 1 FROM equip WHERE equip.eh_reservavel = 'S')
+    ORDER BY s.slot
+    ON CONFLICT DO NOTHING
+    RETURNING id_reserva_equip, data_reserva, horario_inicio, horario_fim
+)
+SELECT
+    s.slot,
+    (SELECT equip.eh_reservavel FROM equip) AS eh_reservavel,
+    i.id_reserva_equip AS id_reserva,
+    c.id_reserva_equip AS conflito_id_reserva,
+    c.horario_inicio AS conflito_horario_inicio,
+    c.horario_fim AS conflito_horario_fim
+FROM slots s
+LEFT JOIN inseridas i
+    ON i.data_reserva = s.data
+   AND i.horario_inicio = s.inicio
+   AND i.horario_fim = s.fim
+LEFT JOIN LATERAL (
+    SELECT re.id_reserva_equip, re.horario_inicio, re.horario_fim
+    FROM reserva_equipamento re
+    WHERE i.id_reserva_equip IS NULL
+      AND re.id_equipamento = %(id_equipamento)s
+      AND re.data_reserva = s.data
+      AND re.horario_inicio < s.fim
+      AND re.horario_fim > s.inicio
+    ORDER BY re.horario_inicio
+    LIMIT 1
+) c ON TRUE
+ORDER BY s.slot;
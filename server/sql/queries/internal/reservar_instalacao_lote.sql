@@ -0,0 +1,44 @@
+-- Reserva vários horários de uma instalação num único INSERT (sem commit: o
+-- chamador decide entre commit e rollback conforme o modo do lote).
+-- Parameters:
+--   %(id_instalacao)s - Installation ID
+--   %(cpf_responsavel)s - CPF of the responsible internal user
+--   %(datas)s, %(inicios)s, %(fins)s - Parallel lists, one position per slot
+-- Horários que se sobrepõem a uma reserva existente ou a outro horário do lote
+-- são ignorados (ON CONFLICT DO NOTHING sobre ex_reserva_sobreposicao) e voltam
+-- com id_reserva NULL; se a reserva conflitante já existia, vem em conflito_*.
+WITH slots AS (
+    SELECT s.slot::INT AS slot, s.data, s.inicio, s.fim
+    FROM unnest(%(datas)s::DATE[], %(inicios)s::TIME[], %(fins)s::TIME[])
+        WITH ORDINALITY AS s(data, inicio, fim, slot)
+),
+inseridas AS (
+    INSERT INTO reserva (id_instalacao, cpf_responsavel_interno, data_reserva, horario_inicio, horario_fim)
+    SELECT %(id_instalacao)s, %(cpf_responsavel)s, s.data, s.inicio, s.fim
+    FROM slots s
+    ORDER BY s.slot
+    ON CONFLICT DO NOTHING
+    RETURNING id_reserva, data_reserva, horario_inicio, horario_fim
+)
+SELECT
+    s.slot,
+    i.id_reserva,
+    c.id_reserva AS conflito_id_reserva,
+    c.horario_inicio AS conflito_horario_inicio,
+    c.horario_fim AS conflito_horario_fim
+FROM slots s
+LEFT JOIN inseridas i
+    ON i.data_reserva = s.data
+   AND i.horario_inicio = s.inicio
+   AND i.horario_fim = s.fim
+LEFT JOIN LATERAL (
+    SELECT r.id_reserva, r.horario_inicio, r.horario_fim
+    FROM reserva r
+    WHERE i.id_reserva IS NULL
+      AND r.id_instalacao = %(id_instalacao)s
+      AND tsrange(r.data_reserva + r.horario_inicio, r.data_reserva + r.horario_fim)
+          && tsrange(s.data + s.inicio, s.data + s.fim)
+    ORDER BY r.horario_inicio
+    LIMIT 1
+) c ON TRUE
+ORDER BY s.slot;
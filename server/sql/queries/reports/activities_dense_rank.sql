@@ -1,8 +1,9 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 SELECT
     a.nome AS activity_name,
-    COUNT(pa.cpf_participante) AS total_participants,
-    DENSE_RANK() OVER (ORDER BY COUNT(pa.cpf_participante) DESC) AS dense_ranking
+    COALESCE(SUM(s.total_participantes), 0) AS total_participants,
+    DENSE_RANK() OVER (ORDER BY COALESCE(SUM(s.total_participantes), 0) DESC) AS dense_ranking
 FROM atividade a
-LEFT JOIN participacao_atividade pa ON pa.id_atividade = a.id_atividade
+LEFT JOIN resumo_inscricoes_diarias s ON s.id_atividade = a.id_atividade
 GROUP BY a.id_atividade, a.nome
 ORDER BY dense_ranking, a.nome;
@@ -1,13 +1,12 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 WITH activity_participants_by_date AS (
     SELECT
         a.id_atividade,
         a.nome AS activity_name,
-        pa.data_inscricao AS enrollment_date,
-        COUNT(pa.cpf_participante) AS daily_participants
+        s.data_inscricao AS enrollment_date,
+        s.total_participantes AS daily_participants
     FROM atividade a
-    LEFT JOIN participacao_atividade pa ON pa.id_atividade = a.id_atividade
-    WHERE pa.data_inscricao IS NOT NULL
-    GROUP BY a.id_atividade, a.nome, pa.data_inscricao
+    JOIN resumo_inscricoes_diarias s ON s.id_atividade = a.id_atividade
 )
 SELECT
     activity_name,
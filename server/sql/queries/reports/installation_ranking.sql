@@ -1,8 +1,9 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 SELECT
     i.nome AS installation_name,
-    COUNT(r.id_reserva) AS total_reservations,
-    RANK() OVER (ORDER BY COUNT(r.id_reserva) DESC) AS ranking
-FROM reserva r
-JOIN instalacao i ON i.id_instalacao = r.id_instalacao
+    SUM(s.total_reservas) AS total_reservations,
+    RANK() OVER (ORDER BY SUM(s.total_reservas) DESC) AS ranking
+FROM resumo_reservas_diarias s
+JOIN instalacao i ON i.id_instalacao = s.id_instalacao
 GROUP BY i.nome
 ORDER BY ranking;
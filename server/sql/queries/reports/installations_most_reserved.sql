@@ -1,10 +1,11 @@
 -- Instalações mais reservadas (apenas reserváveis)
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 SELECT
     i.nome,
     i.tipo,
-    COUNT(r.id_reserva) AS total_reservas
+    COALESCE(SUM(s.total_reservas), 0) AS total_reservas
 FROM instalacao i
-LEFT JOIN reserva r ON i.id_instalacao = r.id_instalacao
+LEFT JOIN resumo_reservas_diarias s ON i.id_instalacao = s.id_instalacao
 WHERE i.eh_reservavel = 'S'
 GROUP BY i.id_instalacao, i.nome, i.tipo
 ORDER BY total_reservas DESC;
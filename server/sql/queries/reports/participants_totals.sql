@@ -1,6 +1,7 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 SELECT
     a.nome AS activity_name,
-    COUNT(pa.cpf_participante) AS total_participants
-FROM participacao_atividade pa
-JOIN atividade a ON a.id_atividade = pa.id_atividade
+    SUM(s.total_participantes) AS total_participants
+FROM resumo_inscricoes_diarias s
+JOIN atividade a ON a.id_atividade = s.id_atividade
 GROUP BY GROUPING SETS ((a.nome), ());
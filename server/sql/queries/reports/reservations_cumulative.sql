@@ -1,9 +1,10 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 WITH daily_reservations AS (
     SELECT
-        r.data_reserva AS reservation_date,
-        COUNT(*) AS daily_count
-    FROM reserva r
-    GROUP BY r.data_reserva
+        s.data_reserva AS reservation_date,
+        SUM(s.total_reservas) AS daily_count
+    FROM resumo_reservas_diarias s
+    GROUP BY s.data_reserva
 )
 SELECT
     reservation_date,
@@ -1,10 +1,11 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 WITH monthly_reservations AS (
     SELECT
-        EXTRACT(YEAR FROM r.data_reserva) AS year,
-        EXTRACT(MONTH FROM r.data_reserva) AS month,
-        COUNT(*) AS reservation_count
-    FROM reserva r
-    GROUP BY EXTRACT(YEAR FROM r.data_reserva), EXTRACT(MONTH FROM r.data_reserva)
+        EXTRACT(YEAR FROM s.data_reserva) AS year,
+        EXTRACT(MONTH FROM s.data_reserva) AS month,
+        SUM(s.total_reservas) AS reservation_count
+    FROM resumo_reservas_diarias s
+    GROUP BY EXTRACT(YEAR FROM s.data_reserva), EXTRACT(MONTH FROM s.data_reserva)
 )
 SELECT
     year,
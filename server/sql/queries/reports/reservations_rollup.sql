@@ -1,8 +1,9 @@
+-- Lê o resumo diário mantido por trigger (functions/report_summaries.sql)
 SELECT
     i.nome AS installation_name,
-    EXTRACT(MONTH FROM r.data_reserva) AS month_number,
-    COUNT(*) AS total_reservations
-FROM reserva r
-JOIN instalacao i ON i.id_instalacao = r.id_instalacao
-GROUP BY ROLLUP (i.nome, EXTRACT(MONTH FROM r.data_reserva))
+    EXTRACT(MONTH FROM s.data_reserva) AS month_number,
+    SUM(s.total_reservas) AS total_reservations
+FROM resumo_reservas_diarias s
+JOIN instalacao i ON i.id_instalacao = s.id_instalacao
+GROUP BY ROLLUP (i.nome, EXTRACT(MONTH FROM s.data_reserva))
 ORDER BY i.nome, month_number;
@@ -0,0 +1,88 @@
+-- Busca unificada por pessoas, atividades e grupos de extensão (/search)
+-- Parameters:
+--   %(q)s - Termo buscado
+--   %(q_like)s - Termo com os curingas de LIKE (%, _ e \) escapados
+--   %(types)s - Tipos pesquisados (array com pessoa, atividade e/ou grupo_extensao)
+--   %(limit)s - Máximo de resultados
+-- Os filtros são atendidos pelos índices GIN de trigramas (sql/indexes.sql,
+-- seção 7): "<%%" (word_similarity) para nomes aproximados e ILIKE para
+-- trechos e prefixos. Prefixos exatos recebem score 1 e ficam no topo.
+WITH candidatos_pessoa AS (
+    SELECT cpf
+    FROM pessoa
+    WHERE 'pessoa' = ANY(%(types)s::text[])
+      AND (
+          %(q)s <%% nome
+          OR nome ILIKE '%%' || %(q_like)s || '%%'
+          OR email ILIKE '%%' || %(q_like)s || '%%'
+      )
+    UNION
+    SELECT cpf_pessoa
+    FROM interno_usp
+    WHERE 'pessoa' = ANY(%(types)s::text[])
+      AND nusp LIKE %(q_like)s || '%%'
+),
+pessoas AS (
+    SELECT
+        'pessoa'::text AS tipo,
+        p.cpf::text AS id,
+        p.nome::text AS titulo,
+        CONCAT_WS(' · ', p.email, 'NUSP ' || i.nusp) AS detalhe,
+        GREATEST(
+            word_similarity(%(q)s, p.nome),
+            similarity(%(q)s, p.email),
+            CASE
+                WHEN p.nome ILIKE %(q_like)s || '%%'
+                  OR p.email ILIKE %(q_like)s || '%%'
+                  OR i.nusp = %(q)s THEN 1
+                ELSE 0
+            END
+        )::float AS score
+    FROM candidatos_pessoa c
+    JOIN pessoa p ON p.cpf = c.cpf
+    LEFT JOIN interno_usp i ON i.cpf_pessoa = p.cpf
+    ORDER BY score DESC, titulo
+    LIMIT %(limit)s
+),
+atividades AS (
+    SELECT
+        'atividade'::text AS tipo,
+        a.id_atividade::text AS id,
+        a.nome::text AS titulo,
+        a.data_inicio_periodo::text AS detalhe,
+        GREATEST(
+            word_similarity(%(q)s, a.nome),
+            CASE WHEN a.nome ILIKE %(q_like)s || '%%' THEN 1 ELSE 0 END
+        )::float AS score
+    FROM atividade a
+    WHERE 'atividade' = ANY(%(types)s::text[])
+      AND (%(q)s <%% a.nome OR a.nome ILIKE '%%' || %(q_like)s || '%%')
+    ORDER BY score DESC, titulo
+    LIMIT %(limit)s
+),
+grupos AS (
+    SELECT
+        'grupo_extensao'::text AS tipo,
+        ge.nome_grupo::text AS id,
+        ge.nome_grupo::text AS titulo,
+        LEFT(ge.descricao, 120) AS detalhe,
+        GREATEST(
+            word_similarity(%(q)s, ge.nome_grupo),
+            CASE WHEN ge.nome_grupo ILIKE %(q_like)s || '%%' THEN 1 ELSE 0 END
+        )::float AS score
+    FROM grupo_extensao ge
+    WHERE 'grupo_extensao' = ANY(%(types)s::text[])
+      AND (%(q)s <%% ge.nome_grupo OR ge.nome_grupo ILIKE '%%' || %(q_like)s || '%%')
+    ORDER BY score DESC, titulo
+    LIMIT %(limit)s
+)
+SELECT tipo, id, titulo, detalhe, ROUND(score::numeric, 3)::float AS score
+FROM (
+    SELECT * FROM pessoas
+    UNION ALL
+    SELECT * FROM atividades
+    UNION ALL
+    SELECT * FROM grupos
+) resultados
+ORDER BY score DESC, tipo, titulo
+LIMIT %(limit)s;
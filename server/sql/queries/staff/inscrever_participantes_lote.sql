@@ -0,0 +1,8 @@
+-- Query to enroll several participants in an activity in one statement
+-- Parameters:
+--   %(id_atividade)s - Activity ID
+--   %(cpfs)s - List of participant CPFs
+SELECT
+    cpf_pedido AS cpf_participante,
+    resultado
+FROM inscrever_participantes_atividade(%(id_atividade)s, %(cpfs)s::VARCHAR[]);
@@ -4,6 +4,9 @@
 --   %(data_fim)s - End date filter
 --   %(id_equipamento)s - Equipment ID filter
 --   %(cpf_responsavel)s - Responsible CPF filter
+-- Keyset pagination:
+--   %(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva_equip)s - Sort key of the last row of the previous page
+--   %(limit)s - Maximum number of rows (NULL returns all)
 SELECT
     re.id_reserva_equip,
     re.id_equipamento,
@@ -21,4 +24,10 @@ WHERE 1=1
     AND (%(data_fim)s IS NULL OR re.data_reserva <= %(data_fim)s)
     AND (%(id_equipamento)s IS NULL OR re.id_equipamento = %(id_equipamento)s)
     AND (%(cpf_responsavel)s IS NULL OR re.cpf_responsavel_interno = %(cpf_responsavel)s)
-ORDER BY re.data_reserva DESC, re.horario_inicio DESC;
+    AND (
+        %(after_data_reserva)s IS NULL
+        OR (re.data_reserva, re.horario_inicio, re.id_reserva_equip)
+            < (%(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva_equip)s)
+    )
+ORDER BY re.data_reserva DESC, re.horario_inicio DESC, re.id_reserva_equip DESC
+LIMIT %(limit)s;
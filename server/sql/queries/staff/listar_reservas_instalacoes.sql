@@ -4,6 +4,9 @@
 --   %(data_fim)s - End date filter
 --   %(id_instalacao)s - Installation ID filter
 --   %(cpf_responsavel)s - Responsible CPF filter
+-- Keyset pagination:
+--   %(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s - Sort key of the last row of the previous page
+--   %(limit)s - Maximum number of rows (NULL returns all)
 SELECT
     r.id_reserva,
     r.id_instalacao,
@@ -22,4 +25,10 @@ WHERE 1=1
     AND (%(data_fim)s IS NULL OR r.data_reserva <= %(data_fim)s)
     AND (%(id_instalacao)s IS NULL OR r.id_instalacao = %(id_instalacao)s)
     AND (%(cpf_responsavel)s IS NULL OR r.cpf_responsavel_interno = %(cpf_responsavel)s)
-ORDER BY r.data_reserva DESC, r.horario_inicio DESC;
+    AND (
+        %(after_data_reserva)s IS NULL
+        OR (r.data_reserva, r.horario_inicio, r.id_reserva)
+            < (%(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s)
+    )
+ORDER BY r.data_reserva DESC, r.horario_inicio DESC, r.id_reserva DESC
+LIMIT %(limit)s;
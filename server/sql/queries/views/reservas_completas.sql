@@ -1,3 +1,10 @@
--- Query para acessar a view de reservas completas
+-- Query para acessar a view de reservas completas (paginação por keyset)
+-- Parâmetros:
+--   %(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s - Chave da última linha da página anterior (NULL na primeira página)
+--   %(limit)s - Máximo de linhas (NULL retorna todas)
 SELECT * FROM vw_reservas_completas
-ORDER BY data_reserva DESC, horario_inicio DESC;
+WHERE %(after_data_reserva)s IS NULL
+    OR (data_reserva, horario_inicio, id_reserva)
+        < (%(after_data_reserva)s, %(after_horario_inicio)s, %(after_id_reserva)s)
+ORDER BY data_reserva DESC, horario_inicio DESC, id_reserva DESC
+LIMIT %(limit)s;
@@ -145,6 +145,7 @@ CREATE TABLE ATIVIDADE (
     ID_ATIVIDADE INT GENERATED BY DEFAULT AS IDENTITY,
     NOME VARCHAR(100) NOT NULL,
     VAGAS_LIMITE INT,
+    VAGAS_OCUPADAS INT NOT NULL DEFAULT 0,
     DATA_INICIO_PERIODO DATE NOT NULL,
     DATA_FIM_PERIODO DATE,
 
@@ -369,6 +370,8 @@ CREATE TABLE USUARIO_SENHA (
     BLOQUEADO BOOLEAN NOT NULL DEFAULT FALSE,
     TENTATIVAS_LOGIN INT NOT NULL DEFAULT 0,
     DATA_ULTIMO_LOGIN TIMESTAMP,
+    -- Bitmap de papéis mantido pelos triggers (1 admin, 2 staff, 4 interno, 8 externo)
+    PAPEIS SMALLINT NOT NULL DEFAULT 0,
 
     CONSTRAINT PK_USUARIO_SENHA PRIMARY KEY (CPF),
     CONSTRAINT FK_USUARIO_SENHA_PESSOA FOREIGN KEY (CPF)
@@ -48,8 +48,9 @@ SELECT
     i.id_instalacao,
     i.nome AS nome_instalacao,
     i.tipo AS tipo_instalacao,
-    COUNT(DISTINCT pa.cpf_participante) AS total_participantes,
-    (a.vagas_limite - COUNT(DISTINCT pa.cpf_participante)) AS vagas_disponiveis
+    -- Contador mantido por trigger; BIGINT preserva o tipo original das colunas
+    a.vagas_ocupadas::BIGINT AS total_participantes,
+    (a.vagas_limite - a.vagas_ocupadas::BIGINT) AS vagas_disponiveis
 FROM atividade a
 LEFT JOIN atividade_grupo_extensao age ON a.id_atividade = age.id_atividade
 LEFT JOIN grupo_extensao ge ON age.nome_grupo = ge.nome_grupo
@@ -58,11 +59,11 @@ LEFT JOIN educador_fisico ef ON ca.cpf_educador_fisico = ef.cpf_funcionario
 LEFT JOIN pessoa p_educador ON ef.cpf_funcionario = p_educador.cpf
 LEFT JOIN ocorrencia_semanal os ON a.id_atividade = os.id_atividade
 LEFT JOIN instalacao i ON os.id_instalacao = i.id_instalacao
-LEFT JOIN participacao_atividade pa ON a.id_atividade = pa.id_atividade
 GROUP BY
     a.id_atividade,
     a.nome,
     a.vagas_limite,
+    a.vagas_ocupadas,
     a.data_inicio_periodo,
     a.data_fim_periodo,
     ge.nome_grupo,
@@ -0,0 +1,100 @@
+"""
+Regressão de planos dos assets SQL sobre uma base populada em escala.
+
+Precisa de um banco descartável: ``TEST_DB_NAME`` (no mesmo servidor de
+``DB_HOST``/``DB_PORT``/``DB_USER``/``DB_PASSWORD``). Sem ele, ou sem servidor
+acessível, o teste é pulado. Na primeira execução o banco recebe o schema e a
+população com semente e escala fixas; as seguintes reaproveitam a base (uma
+população interrompida é retomada).
+
+Uso (de ``server/``): ``TEST_DB_NAME=db_planos python -m pytest tests``.
+"""
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+SERVER_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_ROOT))
+
+from app import create_app  # noqa: E402  (antes de data_generators: import circular)
+from app.database import DBSession  # noqa: E402
+from app.services.database.bootstrap import ensure_schema_populated  # noqa: E402
+from app.services.database.plan_check import PLAN_CHECKS, check_query_plans  # noqa: E402
+from data_generators.data_generator import populate_database  # noqa: E402
+from data_generators.progress import garantir_tabelas  # noqa: E402
+from data_generators.scale import SCALE_ENV  # noqa: E402
+from data_generators.seeding import SEED_ENV  # noqa: E402
+
+TEST_DB_ENV = "TEST_DB_NAME"
+SEED = 20240601
+SCALE = 10
+# Nesta escala estas tabelas passam de DEFAULT_MIN_ROWS: os assets delas
+# nunca podem ser ignorados pela checagem
+TABELAS_GRANDES = {"pessoa", "reserva"}
+
+
+def _populacao_concluida(db):
+    """True se a base já tem a população desta semente e escala; falha se tiver outra."""
+    garantir_tabelas(db)
+    execucao = db.fetch_one("SELECT SEMENTE, ESCALA, CONCLUIDA_EM FROM POPULACAO_EXECUCAO")
+    if execucao is None:
+        pessoas = db.fetch_one("SELECT COUNT(*) AS count FROM pessoa")
+        if pessoas["count"]:
+            pytest.fail(f"{TEST_DB_ENV} já tem dados fora de uma população registrada; use um banco vazio")
+        return False
+    if (execucao["semente"], execucao["escala"]) != (SEED, SCALE):
+        pytest.fail(
+            f"{TEST_DB_ENV} foi populado com semente {execucao['semente']} e escala "
+            f"{execucao['escala']}; use um banco vazio"
+        )
+    return execucao["concluida_em"] is not None
+
+
+@pytest.fixture(scope="module")
+def populated_db():
+    db_name = os.environ.get(TEST_DB_ENV)
+    if not db_name:
+        pytest.skip(f"{TEST_DB_ENV} não configurado")
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Conexões das etapas paralelas e de populate_db leem DB_NAME do ambiente
+        mp.setenv("DB_NAME", db_name)
+        mp.setenv(SEED_ENV, str(SEED))
+        mp.setenv(SCALE_ENV, str(SCALE))
+        # populate_db resolve os arquivos SQL relativos a server/
+        mp.chdir(SERVER_ROOT)
+
+        try:
+            db = DBSession()
+        except psycopg2.OperationalError as exc:
+            pytest.skip(f"Banco de teste inacessível: {exc}")
+
+        app = create_app()
+        try:
+            with app.app_context():
+                # Schema, funções, índices e views (e a população, num banco vazio)
+                ensure_schema_populated(db, force=True)
+                if not _populacao_concluida(db):
+                    populate_database(db, seed=SEED, scale=SCALE)
+                yield db
+        finally:
+            db.close()
+
+
+def test_assets_sem_regressao_de_plano(populated_db):
+    # analyze=True roda ANALYZE nas tabelas antes dos EXPLAIN
+    results = check_query_plans(populated_db, analyze=True)
+
+    falhas = [r for r in results if r["status"] in ("regressao", "erro")]
+    assert not falhas, falhas
+
+    ignorados = {r["asset"] for r in results if r["status"] == "ignorado"}
+    nao_checados = [
+        check.asset
+        for check in PLAN_CHECKS
+        if check.asset in ignorados and TABELAS_GRANDES & set(check.tables)
+    ]
+    assert not nao_checados, nao_checados